@@ -2,17 +2,70 @@
 import os
 
 # === API Settings ===
-GITHUB_API_BASE = "https://api.github.com"
-GITLAB_API_BASE = "https://gitlab.com/api/v4"
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+GITLAB_API_BASE = os.getenv("GITLAB_API_BASE", "https://gitlab.com/api/v4")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 GITLAB_TOKEN = os.getenv("GITLAB_TOKEN", "")
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")  # enables ?profile=1 when sent as X-Profile-Token
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")  # enables GET /api/metrics (Authorization: Bearer <token>)
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")  # enables POST /api/webhook (GitHub push events)
 
 # === Processing Settings ===
-MAX_WORKERS = 8
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", "8"))  # repos processed concurrently per scan
+GITHUB_MAX_INFLIGHT = int(os.getenv("GITHUB_MAX_INFLIGHT", "15"))  # concurrent upstream requests per scan
+GITLAB_MAX_INFLIGHT = int(os.getenv("GITLAB_MAX_INFLIGHT", "10"))  # same, for the GitLab side of a merged card
+TRACKER_DEADLINE = float(os.getenv("TRACKER_DEADLINE", "50"))  # seconds before a scan returns what it has
+PARTIAL_CACHE_TTL = 600  # seconds to cache a scan cut short by the deadline / rate limit
+# Background scans: >0 workers makes cold requests return a placeholder / 202 while a
+# queued scan runs (needs a long-lived server and a cache; 0 = scan inside the request)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "0"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))  # queued scans before requests are turned away
+BULK_MAX_USERS = int(os.getenv("BULK_MAX_USERS", "25"))  # usernames per /api/bulk request
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", "4"))  # users scanned at once per /api/bulk request
+ACTIVITY_DB_PATH = os.getenv("ACTIVITY_DB_PATH", "")  # SQLite commit store for incremental scans ("" = off)
+# Rescans re-list the stored range's last N days: listings filter by commit date, so a
+# commit pushed more than N days after that date is only stored via the push webhook
+ACTIVITY_OVERLAP_DAYS = int(os.getenv("ACTIVITY_OVERLAP_DAYS", "7"))
 MAX_REPOS = 50
 SESSION_GAP_HOURS = 2
 BASE_COMMIT_MINUTES = 30
 CACHE_TTL = 43200  # 12 hours
+XFETCH_BETA = float(os.getenv("XFETCH_BETA", "1.0"))  # >1 refreshes earlier, <1 later
+# 5 compresses a card in ~0.3 ms; 11 is ~7% smaller but ~20 ms, paid by every cold instance
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+# === Statistics-API fast path ===
+# Repos whose commit listing is longer than this (per the page-1 Link header) are
+# estimated from /stats/contributors + /stats/punch_card instead of paginated. 0 disables.
+STATS_COMMIT_THRESHOLD = int(os.getenv("STATS_COMMIT_THRESHOLD", "500"))
+STATS_POLL_ATTEMPTS = 4      # GitHub answers 202 while it computes stats in the background
+STATS_POLL_DELAY = float(os.getenv("STATS_POLL_DELAY", "1.0"))  # seconds, doubled per retry
+STATS_HOURS_PER_COMMIT = 0.5  # used when no exactly-scanned repo is available to calibrate
+
+# === Negative Cache TTLs (seconds) per outcome ===
+NEGATIVE_CACHE_TTL = {
+    "empty": int(os.getenv("NEGATIVE_TTL_EMPTY", "1800")),          # user has no activity in period
+    "not_found": int(os.getenv("NEGATIVE_TTL_NOT_FOUND", "3600")),  # unknown username
+    "error": int(os.getenv("NEGATIVE_TTL_ERROR", "120")),           # upstream / processing failure
+}
+
+# === Rate Limits: endpoint -> (requests, window seconds) ===
+# Override per endpoint with e.g. RATE_LIMIT_SVG="60/60"
+RATE_LIMITS = {
+    "default": (30, 60),
+    "svg": (30, 60),
+    "json": (30, 60),
+    "stream": (10, 60),
+    "code": (30, 60),
+    "batch": (10, 60),
+    "bulk": (5, 60),
+    "org": (2, 60),
+}
+for _name in RATE_LIMITS:
+    _override = os.getenv(f"RATE_LIMIT_{_name.upper()}")
+    if _override:
+        _limit, _, _window = _override.partition("/")
+        RATE_LIMITS[_name] = (int(_limit), int(_window or 60))
 
 # === Language Colors (GitHub official) ===
 LANGUAGE_COLORS = {
@@ -25,6 +78,19 @@ LANGUAGE_COLORS = {
     "Swift": "#F05138", "Dart": "#00B4AB", "SCSS": "#c6538c",
 }
 
+# === Language Extensions (tree byte accounting; unambiguous extensions only) ===
+LANGUAGE_EXTENSIONS = {
+    ".ts": "TypeScript", ".tsx": "TypeScript", ".mts": "TypeScript", ".cts": "TypeScript",
+    ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".py": "Python", ".pyi": "Python", ".html": "HTML", ".htm": "HTML",
+    ".css": "CSS", ".scss": "SCSS", ".php": "PHP", ".kt": "Kotlin", ".kts": "Kotlin",
+    ".java": "Java", ".cpp": "C++", ".cc": "C++", ".cxx": "C++", ".hpp": "C++",
+    ".c": "C", ".cs": "C#", ".vue": "Vue", ".svelte": "Svelte", ".sh": "Shell",
+    ".bash": "Shell", ".go": "Go", ".rb": "Ruby", ".rs": "Rust", ".swift": "Swift",
+    ".dart": "Dart",
+}
+LANGUAGE_CACHE_SIZE = 4096  # trees whose per-language byte split is kept in memory
+
 # === Framework Colors ===
 FRAMEWORK_COLORS = {
     "React": "#61dafb", "React Native": "#61dafb", "Next.js": "#808080",
@@ -41,7 +107,10 @@ FRAMEWORK_COLORS = {
     "Rails": "#cc0000", "Scrapy": "#60a839", "PyTorch": "#ee4c2c",
     "TensorFlow": "#ff6f00", "Pandas": "#150458", "NumPy": "#4d77cf",
     "Astro": "#ff5a03", "SvelteKit": "#ff3e00", "Docker": "#2496ed",
-    "Kubernetes": "#326ce5", "GitHub Actions": "#2088ff", "GraphQL": "#e10098",
+    "Kubernetes": "#326ce5", "GitHub Actions": "#2088ff", "GitLab CI": "#fc6d26", "GraphQL": "#e10098",
+    "Tokio": "#808080", "Actix Web": "#808080", "Axum": "#808080", "Tauri": "#ffc131",
+    "Bevy": "#808080", "Firebase": "#ffca28", "RSpec": "#cc0000", "Jekyll": "#cc0000",
+    "Ktor": "#087cfa", "Quarkus": "#4695eb",
 }
 
 # === Framework detection maps ===
@@ -88,7 +157,29 @@ GO_MOD_FW = {
     "github.com/labstack/echo": "Echo", "gorm.io/gorm": "GORM",
 }
 
-BUILD_FW = {"spring-boot": "Spring Boot", "hibernate": "Hibernate"}
+# Matched against Maven/Gradle group ids, artifact ids (prefix, e.g. spring-boot-starter-web)
+# and Gradle plugin ids
+BUILD_FW = {
+    "spring-boot": "Spring Boot", "org.springframework.boot": "Spring Boot",
+    "hibernate": "Hibernate", "com.android.application": "Android SDK",
+    "com.android.library": "Android SDK", "io.ktor": "Ktor", "io.quarkus": "Quarkus",
+}
+
+CARGO_FW = {
+    "tokio": "Tokio", "actix-web": "Actix Web", "axum": "Axum", "rocket": "Rocket",
+    "warp": "Warp", "diesel": "Diesel", "sqlx": "SQLx", "tauri": "Tauri",
+    "bevy": "Bevy", "leptos": "Leptos", "yew": "Yew",
+}
+
+PUBSPEC_FW = {
+    "flutter": "Flutter", "flutter_bloc": "Bloc", "flutter_riverpod": "Riverpod",
+    "provider": "Provider", "get": "GetX", "firebase_core": "Firebase",
+}
+
+GEMFILE_FW = {
+    "rails": "Rails", "sinatra": "Sinatra", "hanami": "Hanami",
+    "rspec": "RSpec", "rspec-rails": "RSpec", "sidekiq": "Sidekiq", "jekyll": "Jekyll",
+}
 
 # === SVG Themes ===
 THEMES = {
@@ -1,28 +1,65 @@
 """CodeStats API — FastAPI entry point for Vercel serverless deployment."""
+import asyncio
 import hashlib
+import hmac
+import json
 import logging
 import os
 import sys
+import time
+from contextlib import asynccontextmanager
+from typing import List, Literal
 
 # Ensure api/ directory is on the Python path for Vercel
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-import httpx
 from config import (
     BUILD_FW,
+    BULK_MAX_USERS,
+    BULK_WORKERS,
     CACHE_TTL,
+    CARGO_FW,
     COMPOSER_FW,
+    GEMFILE_FW,
     GITHUB_TOKEN,
+    GITLAB_TOKEN,
     GO_MOD_FW,
+    JOB_QUEUE_SIZE,
+    JOB_WORKERS,
+    METRICS_TOKEN,
+    NEGATIVE_CACHE_TTL,
     PACKAGE_JSON_FW,
+    PARTIAL_CACHE_TTL,
+    PROFILE_TOKEN,
+    PUBSPEC_FW,
+    RATE_LIMITS,
     REQUIREMENTS_FW,
+    TRACKER_DEADLINE,
+    WEBHOOK_SECRET,
+    XFETCH_BETA,
 )
 from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from services.activity_store import activity_store
 from services.cache import CacheService
-from services.github_service import GitHubService
-from services.svg_generator import generate_code_block, generate_error_svg, generate_svg
-from services.tracker import run_tracker
+from services.compression import EncodedBodyCache
+from services.identity import Identity
+from services.jobs import JobQueue
+from services.metrics import REGISTRY, RENDER_DURATION, RESPONSES, WEBHOOK_EVENTS
+from services.pool import run_prioritized
+from services.rate_limiter import RateLimiter
+from services.svg_generator import generate_code_block, generate_error_svg, generate_pending_svg, generate_svg
+from services.timing import SamplingProfiler, is_profiling, phase, start_request
+from services.tracker import (
+    commit_rows,
+    fold_commits,
+    is_valid_commit,
+    run_org_tracker,
+    run_tracker,
+    summarize_results,
+)
+from services.webhook import commit_logins, push_commits, verify_signature
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +71,9 @@ app = FastAPI(
 )
 
 cache = CacheService()
+limiter = RateLimiter(RATE_LIMITS, cache.redis)
+encoded_bodies = EncodedBodyCache()
+jobs = JobQueue(JOB_WORKERS, JOB_QUEUE_SIZE) if JOB_WORKERS > 0 else None
 
 # Pre-built framework detection maps
 FW_MAPS = {
@@ -42,12 +82,50 @@ FW_MAPS = {
     "composer": COMPOSER_FW,
     "go_mod": GO_MOD_FW,
     "build": BUILD_FW,
+    "cargo": CARGO_FW,
+    "pubspec": PUBSPEC_FW,
+    "gemfile": GEMFILE_FW,
 }
 
 SVG_HEADERS = {
     "Content-Type": "image/svg+xml",
     "Cache-Control": "public, max-age=7200, s-maxage=7200, stale-while-revalidate=3600",
 }
+PENDING_HEADERS = {"Cache-Control": "no-store", "Retry-After": "5"}
+BUSY_MESSAGE = "Server busy. Please try again shortly."
+
+
+TIMED_PATHS = ("/api", "/api/json", "/api/code")
+
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Attach a Server-Timing breakdown; with ?profile=1 (+ token) return a folded-stack profile."""
+    if request.url.path not in TIMED_PATHS:
+        return await call_next(request)
+
+    timing = start_request()
+    profiling = (
+        PROFILE_TOKEN and request.query_params.get("profile") in ("1", "true")
+        and hmac.compare_digest(request.headers.get("x-profile-token", ""), PROFILE_TOKEN)
+    )
+    if not profiling:
+        response = await call_next(request)
+        response.headers["Server-Timing"] = timing.header()
+        return response
+
+    # Force a real scan so the profile covers run_tracker, not a cache hit (nor,
+    # in job mode, just the enqueue: resolve_or_enqueue scans in place instead)
+    request.scope["query_string"] += b"&no_cache=true"
+    timing.profiling = True
+    profiler = SamplingProfiler()
+    profiler.start()
+    try:
+        await call_next(request)
+    finally:
+        folded = profiler.stop()
+    return Response(content=folded, media_type="text/plain",
+                    headers={"Server-Timing": timing.header(), "Cache-Control": "no-store"})
 
 
 def get_etag(data_str: str) -> str:
@@ -55,6 +133,218 @@ def get_etag(data_str: str) -> str:
     return hashlib.md5(data_str.encode("utf-8")).hexdigest()
 
 
+def etag_header(etag: str) -> str:
+    """Weak validator: identity, gzip and br bodies of one render share it."""
+    return f'W/"{etag}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """If-None-Match check with weak comparison (W/ and quotes ignored)."""
+    header = request.headers.get("if-none-match", "")
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/").strip('"') == etag for tag in header.split(","))
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag_header(etag), "Vary": "Accept-Encoding"})
+
+
+def encoded_response(request: Request, content: str, etag: str,
+                     media_type: str, headers: dict) -> Response:
+    """Send content gzip/brotli-encoded when the client accepts it."""
+    body, encoding = encoded_bodies.encode(content, etag, request.headers.get("accept-encoding", ""))
+    headers = {**headers, "ETag": etag_header(etag), "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def check_rate_limit(request: Request, endpoint: str):
+    """Apply the per-endpoint GCRA limit to the client IP."""
+    client_ip = request.client.host if request.client else "unknown"
+    with phase("ratelimit"):
+        return limiter.check(endpoint, client_ip)
+
+
+def rate_limit_message(rl) -> str:
+    return f"Rate limit exceeded ({rl.rate()})"
+
+
+def rate_limit_error(rl) -> HTTPException:
+    """429 for a denied limiter result, with its X-RateLimit-* / Retry-After headers."""
+    return HTTPException(status_code=429, detail=rate_limit_message(rl), headers=rl.headers())
+
+
+def parse_ignore_langs(ignore_langs: str) -> list:
+    """Normalize ignored languages string for cache and passing."""
+    return [lang.strip().lower() for lang in ignore_langs.split(",") if lang.strip()]
+
+
+def get_data_cache_key(username: str, period: int, max_repos: int, ignored_list: list,
+                       gitlab: str = "") -> str:
+    key = f"codestats_data:{username}:{period}:{max_repos}:{'|'.join(ignored_list)}"
+    return f"{key}:gitlab={gitlab.lower()}" if gitlab else key
+
+
+def get_activity_key(data_cache_key: str) -> str:
+    """Per-repo session state stored next to a data entry, for webhook updates."""
+    return "codestats_activity:" + data_cache_key.partition(":")[2]
+
+
+def get_user_index_key(login: str) -> str:
+    return f"codestats_keys:{login.lower()}"
+
+
+def index_data_key(login: str, data_cache_key: str):
+    """Remember which data entries belong to a user so a push can find them."""
+    index_key = get_user_index_key(login)
+    keys = cache.get(index_key) or []
+    if data_cache_key not in keys:
+        cache.set(index_key, keys + [data_cache_key], CACHE_TTL)
+
+
+@asynccontextmanager
+async def github_service(shared=None):
+    """GitHub client for one scan. httpx and the service are imported here, off the cache-hit path.
+
+    A `shared` service (one per /api/bulk request) is handed back as-is.
+    """
+    if shared is not None:
+        yield shared
+        return
+    import httpx
+    from services.github_service import GitHubService, ssl_context
+
+    async with httpx.AsyncClient(verify=ssl_context()) as client:
+        yield GitHubService(token=GITHUB_TOKEN, client=client)
+
+
+def gitlab_service(client):
+    """GitLab provider sharing a scan's HTTP client (imported only for merged cards)."""
+    from services.gitlab_service import GitLabService
+
+    return GitLabService(token=GITLAB_TOKEN, client=client)
+
+
+def negative_entry(kind: str, message: str, data: dict = None) -> dict:
+    """Cacheable marker for an empty / not-found / failed scan."""
+    entry = {"negative": kind, "message": message}
+    if data is not None:
+        entry["data"] = data
+    return entry
+
+
+def lookup_data(data_cache_key: str, no_cache: bool = False) -> tuple:
+    """(fresh entry or None, stale entry or None) for a data cache key."""
+    if no_cache or not cache.available:
+        return None, None
+    with phase("cache"):
+        data, refresh = cache.get_xfetch(data_cache_key, XFETCH_BETA)
+    if data and not refresh:
+        return data, None
+    if data:
+        logger.info(f"Early refresh of {data_cache_key}")
+    return None, data
+
+
+async def resolve_data(username: str, period: int, max_repos: int, ignored_list: list,
+                       no_cache: bool = False, progress=None, gitlab: str = "") -> dict:
+    """Cached or freshly computed stats. Failures come back as negative entries.
+
+    progress is passed to run_tracker when a scan runs (see /api/stream); gitlab
+    names a GitLab account merged into the same card.
+    """
+    data, stale = lookup_data(get_data_cache_key(username, period, max_repos, ignored_list, gitlab), no_cache)
+    if data:
+        return data
+    return await compute_data(username, period, max_repos, ignored_list, stale, progress, gitlab)
+
+
+async def resolve_or_enqueue(username: str, period: int, max_repos: int, ignored_list: list,
+                             no_cache: bool = False, gitlab: str = "") -> tuple:
+    """(data, job). Like resolve_data, except that in job mode a miss queues the scan.
+
+    A stale entry is served while its refresh is queued. data is None while the
+    scan is pending; job is None too when the queue is full. Profiled requests
+    (?profile=1) always scan in place.
+    """
+    if jobs is None or not cache.available or is_profiling():
+        return await resolve_data(username, period, max_repos, ignored_list, no_cache, gitlab=gitlab), None
+    data_cache_key = get_data_cache_key(username, period, max_repos, ignored_list, gitlab)
+    data, stale = lookup_data(data_cache_key, no_cache)
+    if data:
+        return data, None
+    job = jobs.submit(data_cache_key,
+                      lambda: compute_data(username, period, max_repos, ignored_list, stale, gitlab=gitlab))
+    return stale, job
+
+
+def job_headers(job) -> dict:
+    if job is None:
+        return PENDING_HEADERS
+    return {**PENDING_HEADERS, "X-Job-Id": job.id, "Location": f"/api/jobs/{job.id}"}
+
+
+async def compute_data(username: str, period: int, max_repos: int, ignored_list: list,
+                       stale: dict = None, progress=None, gitlab: str = "", service=None) -> dict:
+    """Scan and cache. A failed or partial rescan returns (and keeps) the stale entry.
+
+    Pass `service` to scan on a GitHubService shared with other users.
+    """
+    data_cache_key = get_data_cache_key(username, period, max_repos, ignored_list, gitlab)
+    logger.info(f"Processing stats for {username} (period={period}d, repos={max_repos})")
+    start = time.perf_counter()
+    try:
+        async with github_service(service) as service:
+            linked = [(gitlab_service(service.client), gitlab)] if gitlab else []
+            with phase("scan"):
+                data = await run_tracker(service, username, period, FW_MAPS, max_repos, ignored_list,
+                                         progress, linked)
+            activity = data.pop("activity", None)
+
+            if data["total_hours"] == 0 and data["repo_count"] == 0:
+                # An empty scan is only "not found" if the profile lookup itself says so
+                if service.rate_limited or any(s.rate_limited for s, _ in linked):
+                    data = negative_entry("error", "Rate limit reached upstream; try again later.")
+                elif await service.get_user(username) is None:
+                    data = negative_entry("not_found", f"GitHub user '{username}' not found.")
+                else:
+                    data = negative_entry(
+                        "empty", f"No coding activity found for '{username}' in the last {period} days.", data
+                    )
+    except Exception as e:
+        logger.error(f"Error processing {username}: {e}")
+        data = negative_entry("error", f"Processing error: {str(e)[:80]}")
+        activity = None
+
+    if stale and (data.get("negative") == "error" or data.get("partial")):
+        return stale  # keep serving the still-valid entry, retry on a later read
+
+    if cache.available:
+        if "negative" in data:
+            ttl = NEGATIVE_CACHE_TTL[data["negative"]]
+        else:
+            ttl = PARTIAL_CACHE_TTL if data.get("partial") else CACHE_TTL
+        cache.set_xfetch(data_cache_key, data, ttl, time.perf_counter() - start)
+        if activity and "negative" not in data:
+            activity["ignore_langs"] = ignored_list
+            cache.set(get_activity_key(data_cache_key), activity, ttl)
+            index_data_key(activity["login"], data_cache_key)
+        elif "negative" in data:
+            cache.delete(get_activity_key(data_cache_key))  # no positive entry left for pushes to update
+        logger.info(f"Cached {data.get('negative', 'results')} for {username} ({ttl}s)")
+
+    return data
+
+
+def negative_headers(data: dict, base: dict) -> dict:
+    """Let browsers/CDNs keep negative responses only as long as we do."""
+    headers = dict(base)
+    headers["Cache-Control"] = f"public, max-age={NEGATIVE_CACHE_TTL[data['negative']]}"
+    return headers
+
+
 @app.get("/api")
 async def get_stats(
     request: Request,
@@ -71,59 +361,44 @@ async def get_stats(
     show_title: bool = Query(True, description="Show title/header"),
     show_footer: bool = Query(True, description="Show footer"),
     no_cache: bool = Query(False, description="Force refresh data"),
+    gitlab: str = Query("", description="GitLab username merged into the card"),
 ):
     """Generate an SVG coding stats card for the given username."""
-    client_ip = request.client.host if request.client else "unknown"
-    if not cache.check_rate_limit(f"req:{client_ip}", limit=30, window=60):
-        svg = generate_error_svg("Rate limit exceeded (30 req/min). Please try again later.", theme)
+    rl = check_rate_limit(request, "svg")
+    if not rl.allowed:
+        svg = generate_error_svg(f"{rate_limit_message(rl)}. Please try again later.", theme)
         return Response(content=svg, media_type="image/svg+xml", headers=SVG_HEADERS)
 
     if not GITHUB_TOKEN:
         svg = generate_error_svg("GITHUB_TOKEN not configured on server.", theme)
         return Response(content=svg, media_type="image/svg+xml", headers=SVG_HEADERS)
 
-    # Normalize ignored languages string for cache and passing
-    ignored_list = [lang.strip().lower() for lang in ignore_langs.split(",") if lang.strip()]
-    data_cache_key = f"codestats_data:{username}:{period}:{max_repos}:{'|'.join(ignored_list)}"
-
-    data = None
-    if not no_cache and cache.available:
-        data = cache.get(data_cache_key)
-
-    if not data:
-        logger.info(f"Processing stats for {username} (period={period}d, repos={max_repos})")
-        try:
-            async with httpx.AsyncClient() as client:
-                service = GitHubService(token=GITHUB_TOKEN, client=client)
-                data = await run_tracker(service, username, period, FW_MAPS, max_repos, ignored_list)
-
-            if data["total_hours"] == 0 and data["repo_count"] == 0:
-                svg = generate_error_svg(f"No coding activity found for '{username}' in the last {period} days.", theme)
-                return Response(content=svg, media_type="image/svg+xml", headers=SVG_HEADERS)
-
-            if cache.available:
-                cache.set(data_cache_key, data, CACHE_TTL)
-                logger.info(f"Cached results for {username}")
-
-        except Exception as e:
-            logger.error(f"Error processing {username}: {e}")
-            svg = generate_error_svg(f"Processing error: {str(e)[:80]}", theme)
-            return Response(content=svg, media_type="image/svg+xml", headers=SVG_HEADERS)
+    data, job = await resolve_or_enqueue(username, period, max_repos, parse_ignore_langs(ignore_langs),
+                                         no_cache, gitlab)
+    if data is None:
+        RESPONSES.inc("svg", "202" if job else "503")
+        svg = generate_pending_svg(theme) if job else generate_error_svg(BUSY_MESSAGE, theme)
+        return Response(content=svg, media_type="image/svg+xml", headers=job_headers(job))
+    if "negative" in data:
+        svg = generate_error_svg(data["message"], theme)
+        return Response(content=svg, media_type="image/svg+xml", headers=negative_headers(data, SVG_HEADERS))
 
     # Re-render SVG without re-fetching API if parameters like theme vary
-    svg = generate_svg(
-        data, theme, langs_count, show_frameworks,
-        layout, width, show_title, show_footer, show_languages,
-    )
+    start = time.perf_counter()
+    with phase("render"):
+        svg = generate_svg(
+            data, theme, langs_count, show_frameworks,
+            layout, width, show_title, show_footer, show_languages,
+        )
+    RENDER_DURATION.observe(time.perf_counter() - start, "svg")
 
     etag = get_etag(svg)
-    if_none_match = request.headers.get("if-none-match")
-    if if_none_match == etag:
-        return Response(status_code=304)
+    if not_modified(request, etag):
+        RESPONSES.inc("svg", "304")
+        return not_modified_response(etag)
+    RESPONSES.inc("svg", "200")
 
-    headers = dict(SVG_HEADERS)
-    headers["ETag"] = etag
-    return Response(content=svg, media_type="image/svg+xml", headers=headers)
+    return encoded_response(request, svg, etag, "image/svg+xml", SVG_HEADERS)
 
 
 @app.get("/api/health")
@@ -136,39 +411,123 @@ def health():
     }
 
 
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    """Status of a background scan queued by /api, /api/json or /api/code (job mode)."""
+    job = jobs.get(job_id) if jobs is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job.to_dict()
+
+
+@app.get("/api/metrics")
+def metrics(request: Request):
+    """Prometheus text exposition of this instance's counters and histograms.
+
+    Off unless METRICS_TOKEN is set; scrapers send it as a bearer token.
+    """
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip(), METRICS_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid metrics token",
+                            headers={"WWW-Authenticate": "Bearer"})
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4",
+                    headers={"Cache-Control": "no-store"})
+
+
 @app.get("/api/json")
 async def get_json(
     request: Request,
+    response: Response,
     username: str = Query(..., description="GitHub username"),
     period: int = Query(365, ge=7, le=3650),
     max_repos: int = Query(200, ge=1, le=500),
     ignore_langs: str = Query(""),
     no_cache: bool = Query(False),
+    gitlab: str = Query("", description="GitLab username merged into the stats"),
 ):
     """Return raw JSON stats (for programmatic use)."""
-    client_ip = request.client.host if request.client else "unknown"
-    if not cache.check_rate_limit(f"req:{client_ip}", limit=30, window=60):
-        raise HTTPException(status_code=429, detail="Rate limit exceeded (30 req/min)")
+    rl = check_rate_limit(request, "json")
+    if not rl.allowed:
+        raise rate_limit_error(rl)
+    response.headers.update(rl.headers())
 
     if not GITHUB_TOKEN:
         return {"error": "GITHUB_TOKEN not configured"}
 
-    ignored_list = [lang.strip().lower() for lang in ignore_langs.split(",") if lang.strip()]
-    data_cache_key = f"codestats_data:{username}:{period}:{max_repos}:{'|'.join(ignored_list)}"
+    data, job = await resolve_or_enqueue(username, period, max_repos, parse_ignore_langs(ignore_langs),
+                                         no_cache, gitlab)
+    if data is None:
+        if job is None:
+            RESPONSES.inc("json", "503")
+            raise HTTPException(status_code=503, detail=BUSY_MESSAGE, headers=PENDING_HEADERS)
+        RESPONSES.inc("json", "202")
+        return JSONResponse(status_code=202, content={"status": job.status, "job": job.id},
+                            headers={**rl.headers(), **job_headers(job)})
+    if "negative" in data:
+        if data["negative"] == "empty":
+            return data["data"]
+        status = 404 if data["negative"] == "not_found" else 502
+        RESPONSES.inc("json", str(status))
+        raise HTTPException(status_code=status, detail=data["message"])
+
+    RESPONSES.inc("json", "200")
+    return data
 
-    if not no_cache and cache.available:
-        data = cache.get(data_cache_key)
-        if data:
-            return data
 
-    async with httpx.AsyncClient() as client:
-        service = GitHubService(token=GITHUB_TOKEN, client=client)
-        data = await run_tracker(service, username, period, FW_MAPS, max_repos, ignored_list)
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
-    if cache.available:
-        cache.set(data_cache_key, data, CACHE_TTL)
 
-    return data
+@app.get("/api/stream")
+async def get_stream(
+    request: Request,
+    username: str = Query(..., description="GitHub username"),
+    period: int = Query(365, ge=7, le=3650),
+    max_repos: int = Query(200, ge=1, le=500),
+    ignore_langs: str = Query(""),
+    no_cache: bool = Query(False),
+    gitlab: str = Query("", description="GitLab username merged into the stats"),
+):
+    """Server-sent events while the stats are computed.
+
+    Events: "repos" (the repo list), "repo" (one per finished repo, with running
+    totals), then "done" with the same payload /api/json returns — or "error".
+    A cache hit goes straight to "done". The result is cached as usual.
+    """
+    rl = check_rate_limit(request, "stream")
+    if not rl.allowed:
+        raise rate_limit_error(rl)
+    if not GITHUB_TOKEN:
+        raise HTTPException(status_code=503, detail="GITHUB_TOKEN not configured")
+
+    queue = asyncio.Queue()
+    # The scan runs as its own task so a client that disconnects doesn't lose the
+    # work: it still finishes and lands in the cache.
+    task = asyncio.create_task(resolve_data(
+        username, period, max_repos, parse_ignore_langs(ignore_langs), no_cache,
+        progress=lambda event, info: queue.put_nowait((event, info)), gitlab=gitlab,
+    ))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    async def events():
+        while (item := await queue.get()) is not None:
+            yield sse_event(*item)
+        data = task.result()
+        if data.get("negative") == "empty":
+            data = data["data"]
+        elif "negative" in data:
+            status = 404 if data["negative"] == "not_found" else 502
+            RESPONSES.inc("stream", str(status))
+            yield sse_event("error", {"status": status, "detail": data["message"]})
+            return
+        RESPONSES.inc("stream", "200")
+        yield sse_event("done", data)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        **rl.headers(), "Cache-Control": "no-store", "X-Accel-Buffering": "no",
+    })
 
 
 @app.get("/api/code")
@@ -181,38 +540,367 @@ async def get_code(
     ignore_langs: str = Query(""),
     show_frameworks: bool = Query(True),
     no_cache: bool = Query(False),
+    gitlab: str = Query("", description="GitLab username merged into the stats"),
 ):
     """Return text-based code block stats (for README markdown)."""
-    client_ip = request.client.host if request.client else "unknown"
-    if not cache.check_rate_limit(f"req:{client_ip}", limit=30, window=60):
-        return Response(content="Error: Rate limit exceeded (30 req/min). Please try again later.", media_type="text/plain")
+    rl = check_rate_limit(request, "code")
+    if not rl.allowed:
+        return Response(content=f"Error: {rate_limit_message(rl)}. Please try again later.",
+                        media_type="text/plain")
 
     if not GITHUB_TOKEN:
         return Response(content="Error: GITHUB_TOKEN not configured", media_type="text/plain")
 
-    ignored_list = [lang.strip().lower() for lang in ignore_langs.split(",") if lang.strip()]
-    data_cache_key = f"codestats_data:{username}:{period}:{max_repos}:{'|'.join(ignored_list)}"
-    data = None
-
-    if not no_cache and cache.available:
-        data = cache.get(data_cache_key)
-
-    if not data:
-        async with httpx.AsyncClient() as client:
-            service = GitHubService(token=GITHUB_TOKEN, client=client)
-            data = await run_tracker(service, username, period, FW_MAPS, max_repos, ignored_list)
-        if cache.available:
-            cache.set(data_cache_key, data, CACHE_TTL)
+    data, job = await resolve_or_enqueue(username, period, max_repos, parse_ignore_langs(ignore_langs),
+                                         no_cache, gitlab)
+    if data is None:
+        RESPONSES.inc("code", "202" if job else "503")
+        message = "Computing your coding stats… refresh in a few seconds." if job else f"Error: {BUSY_MESSAGE}"
+        return Response(content=message, media_type="text/plain", headers=job_headers(job))
+    if "negative" in data:
+        if data["negative"] != "empty":
+            return Response(content=f"Error: {data['message']}", media_type="text/plain",
+                            headers=negative_headers(data, {}))
+        data = data["data"]
+
+    start = time.perf_counter()
+    with phase("render"):
+        code = generate_code_block(data, langs_count, show_frameworks)
+    RENDER_DURATION.observe(time.perf_counter() - start, "code")
 
-    code = generate_code_block(data, langs_count, show_frameworks)
-    
     etag = get_etag(code)
-    if_none_match = request.headers.get("if-none-match")
-    if if_none_match == etag:
-        return Response(status_code=304)
+    if not_modified(request, etag):
+        RESPONSES.inc("code", "304")
+        return not_modified_response(etag)
+    RESPONSES.inc("code", "200")
+
+    return encoded_response(request, code, etag, "text/plain", {"Cache-Control": "public, max-age=7200"})
+
+
+class RenderSpec(BaseModel):
+    """One output variant of a batch request."""
+    type: Literal["svg", "code", "json"] = "svg"
+    theme: str = "dark"
+    layout: str = "landscape"
+    width: int = Field(0, ge=0, le=1200)
+    langs_count: int = Field(8, ge=1, le=20)
+    show_frameworks: bool = True
+    show_languages: bool = True
+    show_title: bool = True
+    show_footer: bool = True
+
+
+class BatchRequest(BaseModel):
+    username: str
+    period: int = Field(365, ge=7, le=3650)
+    max_repos: int = Field(200, ge=1, le=500)
+    ignore_langs: str = ""
+    no_cache: bool = False
+    gitlab: str = ""
+    specs: List[RenderSpec] = Field(..., min_length=1, max_length=20)
+
+
+def render_spec(data: dict, spec: RenderSpec) -> tuple:
+    """Render one variant. Returns (media_type, body)."""
+    if "negative" in data:
+        if spec.type == "svg":
+            return "image/svg+xml", generate_error_svg(data["message"], spec.theme)
+        if spec.type == "code":
+            return "text/plain", f"Error: {data['message']}"
+        return "application/json", json.dumps({"error": data["negative"], "detail": data["message"]})
+    if spec.type == "svg":
+        return "image/svg+xml", generate_svg(
+            data, spec.theme, spec.langs_count, spec.show_frameworks, spec.layout,
+            spec.width, spec.show_title, spec.show_footer, spec.show_languages,
+        )
+    if spec.type == "code":
+        return "text/plain", generate_code_block(data, spec.langs_count, spec.show_frameworks)
+    return "application/json", json.dumps(data, default=str)
+
+
+@app.post("/api/batch")
+async def get_batch(request: Request, body: BatchRequest):
+    """Render several variants (themes, layouts, code block, JSON) from one data fetch.
+
+    Returns JSON by default, or multipart/mixed when the Accept header asks for it.
+    """
+    rl = check_rate_limit(request, "batch")
+    if not rl.allowed:
+        raise rate_limit_error(rl)
 
+    if not GITHUB_TOKEN:
+        raise HTTPException(status_code=503, detail="GITHUB_TOKEN not configured")
+
+    data = await resolve_data(body.username, body.period, body.max_repos,
+                              parse_ignore_langs(body.ignore_langs), body.no_cache, gitlab=body.gitlab)
+    if data.get("negative") == "empty":
+        data = data["data"]
+
+    rendered = await asyncio.gather(*[asyncio.to_thread(render_spec, data, spec) for spec in body.specs])
+
+    if "multipart/mixed" in request.headers.get("accept", ""):
+        boundary = os.urandom(16).hex()
+        chunks = []
+        for i, (media_type, content) in enumerate(rendered):
+            chunks.append(
+                f"--{boundary}\r\nContent-Type: {media_type}; charset=utf-8\r\n"
+                f"Content-ID: <variant-{i}>\r\nETag: {etag_header(get_etag(content))}\r\n\r\n{content}\r\n"
+            )
+        chunks.append(f"--{boundary}--\r\n")
+        return Response(content="".join(chunks), media_type=f"multipart/mixed; boundary={boundary}",
+                        headers=rl.headers())
+
+    variants = [
+        {"spec": spec.model_dump(), "content_type": media_type,
+         "etag": etag_header(get_etag(content)), "body": content}
+        for spec, (media_type, content) in zip(body.specs, rendered)
+    ]
     return Response(
-        content=code, 
-        media_type="text/plain",
-        headers={"Cache-Control": "public, max-age=7200", "ETag": etag}
+        content=json.dumps({"username": body.username, "variants": variants}),
+        media_type="application/json", headers=rl.headers(),
     )
+
+
+class BulkRequest(BaseModel):
+    usernames: List[str] = Field(..., min_length=1, max_length=BULK_MAX_USERS)
+    period: int = Field(365, ge=7, le=3650)
+    max_repos: int = Field(200, ge=1, le=500)
+    ignore_langs: str = ""
+    no_cache: bool = False
+
+
+def bulk_line(username: str, data: dict, cached: bool) -> str:
+    """One NDJSON line of a bulk response, with the status /api/json would give."""
+    entry = {"username": username, "status": 200, "cached": cached}
+    if data.get("negative") == "empty":
+        entry["data"] = data["data"]
+    elif "negative" in data:
+        entry["status"] = 404 if data["negative"] == "not_found" else 502
+        entry["error"] = data["message"]
+    else:
+        entry["data"] = data
+    RESPONSES.inc("bulk", str(entry["status"]))
+    return json.dumps(entry, default=str) + "\n"
+
+
+@app.post("/api/bulk")
+async def get_bulk(request: Request, body: BulkRequest):
+    """JSON stats for several users, streamed as NDJSON, one line per user as each completes.
+
+    Cache hits are written first. Misses are scanned BULK_WORKERS users at a time
+    on one GitHubService: they share its in-flight request limit and rate-limit
+    stop, and repos several users committed to (or forks at the same commit) have
+    their languages, tree and frameworks fetched once. Users not scanned before
+    the deadline or the rate limit come back with status 503 — retrying serves
+    the finished ones from the cache.
+    """
+    rl = check_rate_limit(request, "bulk")
+    if not rl.allowed:
+        raise rate_limit_error(rl)
+    if not GITHUB_TOKEN:
+        raise HTTPException(status_code=503, detail="GITHUB_TOKEN not configured")
+
+    ignored_list = parse_ignore_langs(body.ignore_langs)
+    usernames, seen = [], set()
+    for username in (u.strip() for u in body.usernames):
+        if username and username.lower() not in seen:
+            seen.add(username.lower())
+            usernames.append(username)
+
+    queue = asyncio.Queue()
+    misses = []
+    for username in usernames:
+        data, stale = lookup_data(get_data_cache_key(username, body.period, body.max_repos, ignored_list),
+                                  body.no_cache)
+        if data:
+            queue.put_nowait(bulk_line(username, data, cached=True))
+        else:
+            misses.append((username, stale))
+
+    async def scan_misses():
+        if not misses:
+            return
+        done = set()
+        async with github_service() as service:
+            async def scan(miss: tuple):
+                username, stale = miss
+                data = await compute_data(username, body.period, body.max_repos, ignored_list, stale,
+                                          service=service)
+                done.add(username)
+                queue.put_nowait(bulk_line(username, data, cached=False))
+
+            await run_prioritized(misses, scan, lambda miss: 0, BULK_WORKERS, deadline=TRACKER_DEADLINE,
+                                  should_stop=lambda: service.rate_limited)
+        reason = "GitHub rate limit reached" if service.rate_limited else "Not scanned before the deadline"
+        for username, _ in misses:
+            if username not in done:
+                RESPONSES.inc("bulk", "503")
+                queue.put_nowait(json.dumps({"username": username, "status": 503, "cached": False,
+                                             "error": f"{reason}; retry later."}) + "\n")
+
+    # As in /api/stream, the scans run as their own task so a client that
+    # disconnects doesn't lose them: they still finish and land in the cache.
+    task = asyncio.create_task(scan_misses())
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    async def lines():
+        while (line := await queue.get()) is not None:
+            yield line
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers={
+        **rl.headers(), "Cache-Control": "no-store", "X-Accel-Buffering": "no",
+    })
+
+
+@app.get("/api/org")
+async def get_org(
+    request: Request,
+    org: str = Query(..., description="GitHub organization"),
+    period: int = Query(365, ge=7, le=3650),
+    max_repos: int = Query(200, ge=1, le=500),
+    ignore_langs: str = Query(""),
+):
+    """Scan an organization once and cache every active member's stats.
+
+    Each member's payload is written under their normal data cache key, so
+    subsequent /api, /api/json and /api/code calls for them are cache hits.
+    """
+    rl = check_rate_limit(request, "org")
+    if not rl.allowed:
+        raise rate_limit_error(rl)
+
+    if not GITHUB_TOKEN:
+        raise HTTPException(status_code=503, detail="GITHUB_TOKEN not configured")
+
+    ignored_list = parse_ignore_langs(ignore_langs)
+    start = time.perf_counter()
+    negative = None
+    try:
+        async with github_service() as service:
+            results = await run_org_tracker(service, org, period, FW_MAPS, max_repos, ignored_list)
+            if not results:
+                if service.rate_limited:
+                    negative = negative_entry("error", "Rate limit reached upstream; try again later.")
+                elif await service.get_user(org) is None:
+                    negative = negative_entry("not_found", f"GitHub organization '{org}' not found.")
+    except Exception as e:
+        logger.error(f"Error processing org {org}: {e}")
+        negative = negative_entry("error", f"Processing error: {str(e)[:80]}")
+    if negative is not None:
+        status = 404 if negative["negative"] == "not_found" else 502
+        RESPONSES.inc("org", str(status))
+        raise HTTPException(status_code=status, detail=negative["message"],
+                            headers=negative_headers(negative, rl.headers()))
+    elapsed = time.perf_counter() - start
+
+    if cache.available:
+        for login, data in results.items():
+            data_cache_key = get_data_cache_key(login, period, max_repos, ignored_list)
+            ttl = PARTIAL_CACHE_TTL if data.get("partial") else CACHE_TTL
+            cache.set_xfetch(data_cache_key, data, ttl, elapsed)
+            index_data_key(login, data_cache_key)
+        logger.info(f"Cached {len(results)} member results for org {org}")
+    RESPONSES.inc("org", "200")
+
+    return {
+        "org": org,
+        "period_days": period,
+        "partial": any(d.get("partial") for d in results.values()),
+        "members": {
+            login: {"total_hours": d["total_hours"], "repo_count": d["repo_count"]}
+            for login, d in sorted(results.items(), key=lambda x: x[1]["total_hours"], reverse=True)
+        },
+    }
+
+
+def apply_push(commits: list, repository: dict) -> dict:
+    """Fold a push's commits into every cached entry of their authors.
+
+    Entries with stored activity are re-summarized in place and keep their
+    remaining TTL; entries without it (org scans) and negative entries are
+    dropped so the next read rescans. Rendered bodies are keyed by ETag, so they need no invalidation.
+    """
+    full_name = (repository.get("full_name") or "").lower()
+    counts = {"updated": 0, "invalidated": 0, "commits": 0}
+    for login in commit_logins(commits):
+        index_key = get_user_index_key(login)
+        keys = cache.get(index_key) or []
+        live = []
+        for data_cache_key in keys:
+            entry = cache.get(data_cache_key)
+            if not entry:
+                continue  # expired — drop it from the index
+            old = entry.get("value", entry) if "xfetch" in entry else entry
+            activity = None if "negative" in old else cache.get(get_activity_key(data_cache_key))
+            if not activity:
+                # Org scans and negative entries ("empty" / "not_found") have nothing to fold into
+                cache.delete(data_cache_key)
+                cache.delete(get_activity_key(data_cache_key))
+                counts["invalidated"] += 1
+                continue
+            live.append(data_cache_key)
+
+            identity = Identity(activity["login"], frozenset(activity["logins"]), frozenset(activity["emails"]))
+            mine = [c for c in commits if identity.matches(c) and is_valid_commit(c)]
+            repo_state = activity["repos"].get(full_name)
+            if repo_state is None:
+                lang = repository.get("language")
+                if not lang or lang.lower() in activity.get("ignore_langs", []):
+                    continue
+                repo_state = activity["repos"][full_name] = {
+                    "langs": {lang: 1}, "frameworks": [], "hours": 0.0,
+                    "hours_dist": {"night": 0, "morning": 0, "daytime": 0, "evening": 0}, "last": None,
+                }
+            if activity_store is not None:
+                activity_store.append(activity_store.repo_id(identity.login, full_name), commit_rows(identity, mine))
+            folded = fold_commits(repo_state, mine)
+            if not folded:
+                continue
+
+            data = summarize_results(old["username"], old["period_days"], list(activity["repos"].values()),
+                                     old.get("prs", 0), old.get("issues", 0), time.time())
+            for flag in ("partial", "unattributed"):
+                if flag in old:
+                    data[flag] = old[flag]
+            ttl = max(int(entry["expiry"] - time.time()), 1) if "xfetch" in entry else CACHE_TTL
+            cache.set_xfetch(data_cache_key, data, ttl, entry.get("delta", 0.0))
+            cache.set(get_activity_key(data_cache_key), activity, ttl)
+            counts["updated"] += 1
+            counts["commits"] += folded
+        if live != keys:
+            cache.set(index_key, live, CACHE_TTL)
+    return counts
+
+
+@app.post("/api/webhook")
+async def github_webhook(request: Request):
+    """GitHub webhook receiver (push events), verified with WEBHOOK_SECRET.
+
+    Install it on repos or orgs with content type application/json. Pushes to a
+    repo's default branch update the cached stats of the commits' authors
+    without rescanning their accounts.
+    """
+    if not WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="WEBHOOK_SECRET not configured")
+
+    body = await request.body()
+    event = request.headers.get("x-github-event", "")
+    if not verify_signature(WEBHOOK_SECRET, body, request.headers.get("x-hub-signature-256", "")):
+        WEBHOOK_EVENTS.inc(event or "unknown", "bad_signature")
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    if event != "push":
+        WEBHOOK_EVENTS.inc(event or "unknown", "ignored")
+        return {"event": event, "ignored": True}
+
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError:
+        WEBHOOK_EVENTS.inc(event, "bad_payload")
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+    commits = push_commits(payload)
+    counts = apply_push(commits, payload.get("repository") or {}) if commits and cache.available else {}
+    WEBHOOK_EVENTS.inc(event, "applied" if counts.get("updated") or counts.get("invalidated") else "noop")
+    logger.info(f"Push to {(payload.get('repository') or {}).get('full_name')}: {counts or 'nothing to apply'}")
+    return {"event": event, **counts}
@@ -0,0 +1,129 @@
+"""Durable commit activity: one compact SQLite row per commit, aggregated per period.
+
+Each (user, repo) pair records the time range its rows are complete for, so a
+scan only lists commits outside that range and any period inside it is answered
+with an indexed range query. Hours use the same session rule as
+tracker.calculate_coding_time, computed in SQL with LAG() over the commit times.
+"""
+import logging
+import threading
+from typing import Optional
+
+from config import ACTIVITY_DB_PATH, ACTIVITY_OVERLAP_DAYS
+
+logger = logging.getLogger(__name__)
+
+VALID = 1  # flags bit: counted for hours (not a merge / bot / chore commit)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    id INTEGER PRIMARY KEY,
+    login TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    covered_since INTEGER,
+    covered_until INTEGER,
+    UNIQUE (login, full_name)
+);
+CREATE TABLE IF NOT EXISTS commits (
+    repo_id INTEGER NOT NULL,
+    epoch INTEGER NOT NULL,
+    sha INTEGER NOT NULL,   -- first 60 bits of the SHA, for dedupe
+    flags INTEGER NOT NULL,
+    PRIMARY KEY (repo_id, epoch, sha)
+) WITHOUT ROWID;
+"""
+
+_HOURS = """
+SELECT COUNT(*),
+       COALESCE(SUM(CASE WHEN gap IS NULL OR gap >= :gap THEN :min_session ELSE gap END), 0),
+       COALESCE(SUM(hour < 6), 0), COALESCE(SUM(hour >= 6 AND hour < 12), 0),
+       COALESCE(SUM(hour >= 12 AND hour < 18), 0), COALESCE(SUM(hour >= 18), 0),
+       MAX(epoch)
+FROM (SELECT epoch, epoch - LAG(epoch) OVER (ORDER BY epoch) AS gap, (epoch / 3600) % 24 AS hour
+      FROM commits
+      WHERE repo_id = :repo AND epoch BETWEEN :since AND :until AND flags & 1)
+"""
+
+
+def sha_key(sha: str) -> int:
+    try:
+        return int(sha[:15], 16)
+    except (TypeError, ValueError):
+        return 0
+
+
+class ActivityStore:
+    """SQLite-backed commit rows per (login, repo) with a covered time range."""
+
+    def __init__(self, path: str):
+        import sqlite3  # only loaded when the store is configured
+
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    def repo_id(self, login: str, full_name: str) -> int:
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO repos (login, full_name) VALUES (?, ?)",
+                             (login.lower(), full_name.lower()))
+            return self._db.execute("SELECT id FROM repos WHERE login = ? AND full_name = ?",
+                                    (login.lower(), full_name.lower())).fetchone()[0]
+
+    def missing(self, repo_id: int, since: int, until: int,
+                overlap: int = ACTIVITY_OVERLAP_DAYS * 86400) -> list:
+        """[(since, until)] ranges still to be listed from GitHub for this period.
+
+        The tail is re-listed from `overlap` seconds before the covered end, to
+        pick up commits pushed late (rebases, cherry-picks, long-lived branches)
+        with older dates. Listings filter by commit date, so a commit pushed more
+        than `overlap` after that date is missed here; the push webhook, which
+        stores commits as they arrive, is what catches those.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT covered_since, covered_until FROM repos WHERE id = ?",
+                                   (repo_id,)).fetchone()
+        covered_since, covered_until = row if row else (None, None)
+        if covered_since is None or since > covered_until or until < covered_since:
+            return [(since, until)]
+        ranges = []
+        if since < covered_since:
+            ranges.append((since, covered_since))
+        if until > covered_until:
+            ranges.append((max(covered_until - overlap, since), until))
+        return ranges
+
+    def append(self, repo_id: int, rows: list, covered: Optional[tuple] = None):
+        """Insert (epoch, sha_key, flags) rows; extend the covered range when given."""
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR IGNORE INTO commits (repo_id, epoch, sha, flags) "
+                                 "VALUES (?, ?, ?, ?)", [(repo_id, *r) for r in rows])
+            if covered is not None:
+                since, until = covered
+                row = self._db.execute("SELECT covered_since, covered_until FROM repos WHERE id = ?",
+                                       (repo_id,)).fetchone()
+                if row[0] is not None and since <= row[1] and until >= row[0]:
+                    since, until = min(since, row[0]), max(until, row[1])
+                self._db.execute("UPDATE repos SET covered_since = ?, covered_until = ? WHERE id = ?",
+                                 (since, until, repo_id))
+
+    def aggregate(self, repo_id: int, since: int, until: int, session_gap: int, min_session: int) -> dict:
+        """Commit counts, session hours and hour buckets for one repo and period."""
+        with self._lock:
+            total = self._db.execute(
+                "SELECT COUNT(*) FROM commits WHERE repo_id = ? AND epoch BETWEEN ? AND ?",
+                (repo_id, since, until)).fetchone()[0]
+            valid, secs, night, morning, daytime, evening, last = self._db.execute(_HOURS, {
+                "repo": repo_id, "since": since, "until": until,
+                "gap": session_gap, "min_session": min_session,
+            }).fetchone()
+        return {
+            "commits": total, "valid_commits": valid, "hours": secs / 3600, "last": last,
+            "hours_dist": {"night": night, "morning": morning, "daytime": daytime, "evening": evening},
+        }
+
+
+activity_store = ActivityStore(ACTIVITY_DB_PATH) if ACTIVITY_DB_PATH else None
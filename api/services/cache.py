@@ -1,23 +1,59 @@
 """Upstash Redis cache service (serverless-compatible)."""
 import json
 import logging
+import math
 import os
+import random
+import time
 from typing import Any, Optional
 
+from services.metrics import CACHE_LOOKUPS
+
 logger = logging.getLogger(__name__)
 
 
+class MemoryStore:
+    """Process-local stand-in for the Redis commands CacheService uses (dev / benchmarks)."""
+
+    def __init__(self):
+        self._data = {}
+
+    def get(self, key: str):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires = item
+        if expires <= time.time():
+            del self._data[key]
+            return None
+        return value
+
+    def setex(self, key: str, seconds: int, value: str):
+        self._data[key] = (value, time.time() + seconds)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+
 class CacheService:
-    """Handles caching via Upstash Redis REST API."""
+    """Handles caching via Upstash Redis REST API (or in memory with CACHE_BACKEND=memory)."""
 
     def __init__(self):
         self._redis = None
+        self._remote = False
+        self.tier = "none"
         url = os.getenv("UPSTASH_REDIS_REST_URL")
         token = os.getenv("UPSTASH_REDIS_REST_TOKEN")
-        if url and token:
+        if os.getenv("CACHE_BACKEND") == "memory":
+            self._redis = MemoryStore()
+            self.tier = "memory"
+            logger.info("Using in-memory cache")
+        elif url and token:
             try:
                 from upstash_redis import Redis
                 self._redis = Redis(url=url, token=token)
+                self._remote = True
+                self.tier = "redis"
                 logger.info("Upstash Redis connected")
             except Exception as e:
                 logger.warning(f"Redis init failed: {e}")
@@ -26,15 +62,24 @@ class CacheService:
     def available(self) -> bool:
         return self._redis is not None
 
+    @property
+    def redis(self):
+        """Underlying Upstash client (None when not configured or in memory)."""
+        return self._redis if self._remote else None
+
     def get(self, key: str) -> Optional[dict]:
         if not self._redis:
             return None
         try:
             data = self._redis.get(key)
             if data:
+                CACHE_LOOKUPS.inc(self.tier, "hit")
                 return json.loads(data) if isinstance(data, str) else data
         except Exception as e:
             logger.warning(f"Cache GET error: {e}")
+            CACHE_LOOKUPS.inc(self.tier, "error")
+            return None
+        CACHE_LOOKUPS.inc(self.tier, "miss")
         return None
 
     def set(self, key: str, value: Any, ttl: int = 43200):
@@ -45,6 +90,25 @@ class CacheService:
         except Exception as e:
             logger.warning(f"Cache SET error: {e}")
 
+    def set_xfetch(self, key: str, value: Any, ttl: int, delta: float):
+        """Store value with its recompute cost (delta, seconds) and absolute expiry."""
+        self.set(key, {"xfetch": 1, "value": value, "delta": delta, "expiry": time.time() + ttl}, ttl)
+
+    def get_xfetch(self, key: str, beta: float = 1.0) -> tuple:
+        """XFetch read (probabilistic early expiration). Returns (value, refresh).
+
+        refresh is True on a miss, or — with probability rising as expiry nears and
+        scaled by how long the value took to compute — when this caller should
+        recompute ahead of the TTL while the old value is still servable.
+        """
+        entry = self.get(key)
+        if not entry:
+            return None, True
+        if not isinstance(entry, dict) or "xfetch" not in entry:
+            return entry, False  # plain entry written by set()
+        gap = -entry["delta"] * beta * math.log(random.random() or 1e-12)
+        return entry["value"], time.time() + gap >= entry["expiry"]
+
     def delete(self, key: str):
         if not self._redis:
             return
@@ -52,17 +116,3 @@ class CacheService:
             self._redis.delete(key)
         except Exception as e:
             logger.warning(f"Cache DELETE error: {e}")
-
-    def check_rate_limit(self, identifier: str, limit: int = 30, window: int = 60) -> bool:
-        """Simple fixed-window rate limiter utilizing Redis INCR."""
-        if not self._redis:
-            return True  # If cache is unavailable, fallback to allow
-        key = f"rl:{identifier}"
-        try:
-            current = self._redis.incr(key)
-            if current == 1:
-                self._redis.expire(key, window)
-            return current <= limit
-        except Exception as e:
-            logger.warning(f"Rate limit error: {e}")
-            return True
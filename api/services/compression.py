@@ -0,0 +1,77 @@
+"""Accept-Encoding negotiation with a small LRU of already-compressed bodies."""
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from config import BROTLI_QUALITY
+from services.metrics import CACHE_LOOKUPS
+
+try:
+    import brotli
+except ImportError:  # optional — gzip only
+    brotli = None
+
+SUPPORTED = ("br", "gzip") if brotli else ("gzip",)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header (br > gzip)."""
+    if not accept_encoding:
+        return None
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip()] = q
+    for enc in SUPPORTED:
+        if offered.get(enc, offered.get("*", 0.0)) > 0:
+            return enc
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+class EncodedBodyCache:
+    """LRU keyed by (etag, encoding) — each distinct card is compressed once."""
+
+    def __init__(self, max_entries: int = 512):
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._max = max_entries
+
+    def encode(self, body: str, etag: str, accept_encoding: str) -> tuple:
+        """Returns (bytes, encoding) — encoding is None when sent as identity."""
+        raw = body.encode("utf-8")
+        encoding = negotiate(accept_encoding)
+        if encoding is None:
+            return raw, None
+
+        key = (etag, encoding)
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is not None:
+                self._items.move_to_end(key)
+                CACHE_LOOKUPS.inc("encoded", "hit")
+                return cached, encoding
+        CACHE_LOOKUPS.inc("encoded", "miss")
+
+        compressed = _compress(raw, encoding)
+        if len(compressed) >= len(raw):
+            return raw, None
+
+        with self._lock:
+            self._items[key] = compressed
+            if len(self._items) > self._max:
+                self._items.popitem(last=False)
+        return compressed, encoding
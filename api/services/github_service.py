@@ -1,26 +1,115 @@
 """GitHub API service for fetching repository, commit, and framework data."""
 import asyncio
 import base64
-import json
 import logging
+import re
+import ssl
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 import httpx
+from config import GITHUB_API_BASE, GITHUB_MAX_INFLIGHT, STATS_POLL_ATTEMPTS, STATS_POLL_DELAY
+from services.identity import NOREPLY_DOMAIN
+from services.manifests import compile_fw_maps
+from services.metrics import GITHUB_LATENCY, GITHUB_RATE_REMAINING, GITHUB_REQUESTS
+from services.provider import ListingIncomplete, LookupFailed, RepoProvider, marker_frameworks
+from services.timing import count_upstream
 
 logger = logging.getLogger(__name__)
 
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
 
-class GitHubService:
+
+def _endpoint_class(path: str) -> str:
+    """Low-cardinality metric label for an API path (/repos/o/r/commits -> commits)."""
+    parts = path.strip("/").split("/")
+    if parts[0] == "repos" and len(parts) > 3:
+        return parts[3]
+    if parts[0] in ("users", "orgs") and len(parts) > 2:
+        return f"{parts[0]}_{parts[2]}"
+    return "_".join(parts[:2]) if parts[0] in ("user", "search") else parts[0]
+
+
+# contributionsCollection spans at most one year and lists at most 100 repos per query
+_CONTRIBUTIONS_WINDOW = timedelta(days=365)
+_CONTRIBUTIONS_MAX_REPOS = 100
+_CONTRIBUTIONS_QUERY = """
+query($login: String!, $from: DateTime!, $to: DateTime!) {
+  user(login: $login) {
+    contributionsCollection(from: $from, to: $to) {
+      commitContributionsByRepository(maxRepositories: 100) {
+        contributions { totalCount }
+        repository {
+          name nameWithOwner isFork isPrivate pushedAt diskUsage
+          owner { login }
+          defaultBranchRef { name }
+          primaryLanguage { name }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+@lru_cache(maxsize=1)
+def ssl_context() -> ssl.SSLContext:
+    """TLS context shared by every client; loading the CA bundle costs ~25 ms per client otherwise."""
+    return httpx.create_ssl_context()
+
+
+def _last_page(resp: httpx.Response) -> int:
+    """Last page number from a Link header (0 if there is none)."""
+    match = _LAST_PAGE_RE.search(resp.headers.get("link", ""))
+    return int(match.group(1)) if match else 0
+
+
+class GitHubService(RepoProvider):
     """Handles all GitHub API interactions (Async)."""
 
-    def __init__(self, token: str, client: httpx.AsyncClient):
+    host = "github"
+
+    def __init__(self, token: str, client: httpx.AsyncClient, base_url: str = GITHUB_API_BASE):
+        # GitHub's secondary rate limit triggers on too many simultaneous calls
+        super().__init__(GITHUB_MAX_INFLIGHT)
         self.token = token
         self.client = client
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    async def _get(self, url: str, params: dict = None, timeout: float = 12.0) -> httpx.Response:
+        """Single choke point for upstream GETs — records request metrics."""
+        return await self._send("GET", url, params=params, timeout=timeout)
+
+    async def _send(self, method: str, url: str, timeout: float = 12.0, **kwargs) -> httpx.Response:
+        endpoint = _endpoint_class(url[len(self.base_url):])
+        count_upstream()
+        async with self._inflight:
+            start = time.perf_counter()
+            try:
+                resp = await self.client.request(method, url, headers=self.headers, timeout=timeout, **kwargs)
+            except Exception:
+                GITHUB_REQUESTS.inc(endpoint, "error")
+                raise
+        GITHUB_LATENCY.observe(time.perf_counter() - start, endpoint)
+        GITHUB_REQUESTS.inc(endpoint, str(resp.status_code))
+        remaining = resp.headers.get("x-ratelimit-remaining")
+        if remaining is not None:
+            GITHUB_RATE_REMAINING.set(int(remaining), resp.headers.get("x-ratelimit-resource", "core"))
+        if resp.status_code in (403, 429) and (remaining == "0" or "retry-after" in resp.headers):
+            if not self.rate_limited:
+                logger.warning(f"GitHub rate limit hit on {endpoint}")
+            self.rate_limited = True
+        return resp
 
     async def _request(self, url: str, params: dict = None) -> Optional[any]:
         """Make an authenticated GitHub API request."""
         try:
-            resp = await self.client.get(url, params=params, timeout=12.0)
+            resp = await self._get(url, params)
             if resp.status_code == 200:
                 return resp.json()
             elif resp.status_code != 404:
@@ -30,27 +119,62 @@ class GitHubService:
             logger.error(f"Request error for {url}: {e}")
             return None
 
-    async def _paginate(self, url: str, params: dict, max_items: int = 0) -> list:
-        """Paginate through all pages of a GitHub API endpoint concurrently."""
+    async def _graphql(self, query: str, variables: dict) -> Optional[dict]:
+        """Run a GraphQL query (needs a token); None on any HTTP or GraphQL error."""
+        if not self.token:
+            return None
+        try:
+            resp = await self._send("POST", f"{self.base_url}/graphql", timeout=20.0,
+                                    json={"query": query, "variables": variables})
+            body = resp.json() if resp.status_code == 200 else {}
+        except Exception as e:
+            logger.error(f"GraphQL request error: {e}")
+            return None
+        if not isinstance(body, dict) or body.get("errors") or not body.get("data"):
+            logger.error(f"GraphQL error (HTTP {resp.status_code}): {body.get('errors') if isinstance(body, dict) else body}")
+            return None
+        return body["data"]
+
+    async def _paginate(self, url: str, params: dict, max_items: int = 0,
+                        max_total: int = 0, strict: bool = False) -> Optional[list]:
+        """Paginate through all pages of a GitHub API endpoint concurrently.
+
+        With max_total set, returns None after page one if the Link header shows the
+        listing is longer than that (callers switch to an aggregate endpoint instead).
+        With strict, a failed page or a listing past the 10-page cap raises
+        ListingIncomplete rather than returning the pages that were read.
+        """
         items = []
         # First request to get total pages and first page items
         p = {**(params or {}), "page": 1, "per_page": 100}
-        resp = await self.client.get(url, params=p, timeout=15.0)
+        resp = await self._get(url, p, timeout=15.0)
         
         if resp.status_code != 200:
+            if strict:
+                raise ListingIncomplete(f"HTTP {resp.status_code}: {url}")
             return items
             
         data = resp.json()
         if not isinstance(data, list):
+            if strict:
+                raise ListingIncomplete(f"Unexpected payload: {url}")
             return items
             
         items.extend(data)
         if len(data) < 100:
             return items if max_items == 0 else items[:max_items]
-            
-        # Parallel pagination if more than 1 page (we limit to max 10 pages for safety)
+
+        last = _last_page(resp)
+        if max_total and last * 100 > max_total:
+            return None
+
+        # Parallel pagination up to the last page (we limit to max 10 pages for safety)
+        if strict and last > 10:
+            raise ListingIncomplete(f"More than 10 pages: {url}")
+        known = last > 0
+        last = min(last, 10) if last else 10
         tasks = []
-        for page in range(2, 11):
+        for page in range(2, last + 1):
             tasks.append(self._request(url, {**(params or {}), "page": page, "per_page": 100}))
             
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -59,14 +183,19 @@ class GitHubService:
                 items.extend(res)
                 if len(res) < 100:
                     break # Stop looking at further pages if this one is short
-                    
+            elif strict:
+                raise ListingIncomplete(f"Page failed: {url}")
+        else:
+            if strict and not known:  # every page full, and no Link header to say it ends here
+                raise ListingIncomplete(f"More than 10 pages: {url}")
+
         return items if max_items == 0 else items[:max_items]
 
     async def get_repos(self, username: str, max_repos: int = 200,
                   include_forks: bool = False) -> list:
         """Fetch ALL repos (public + private if token has access)."""
         repos = await self._paginate(
-            "https://api.github.com/user/repos",
+            f"{self.base_url}/user/repos",
             {"sort": "pushed", "direction": "desc",
              "affiliation": "owner", "visibility": "all"},
             max_items=max_repos,
@@ -78,7 +207,7 @@ class GitHubService:
 
         if not repos:
             repos = await self._paginate(
-                f"https://api.github.com/users/{username}/repos",
+                f"{self.base_url}/users/{username}/repos",
                 {"sort": "pushed", "direction": "desc"},
                 max_items=max_repos,
             )
@@ -89,47 +218,271 @@ class GitHubService:
         logger.info(f"Fetched {len(repos)} repos for {username}")
         return repos[:max_repos]
 
+    async def _contribution_window(self, username: str, since: datetime, until: datetime,
+                                   depth: int = 0) -> Optional[tuple]:
+        """(items, complete) for one window, split in half while it hits the 100-repo cap."""
+        data = await self._graphql(_CONTRIBUTIONS_QUERY, {
+            "login": username, "from": since.isoformat(), "to": until.isoformat(),
+        })
+        if data is None:
+            return None
+        collection = (data.get("user") or {}).get("contributionsCollection") or {}
+        items = collection.get("commitContributionsByRepository") or []
+        if len(items) < _CONTRIBUTIONS_MAX_REPOS:
+            return items, True
+        if depth >= 3 or until - since < timedelta(days=14):
+            return items, False
+        middle = since + (until - since) / 2
+        halves = await asyncio.gather(
+            self._contribution_window(username, since, middle, depth + 1),
+            self._contribution_window(username, middle, until, depth + 1),
+        )
+        if any(h is None for h in halves):
+            return items, False
+        return halves[0][0] + halves[1][0], halves[0][1] and halves[1][1]
+
+    async def get_contributed_repos(self, username: str, since: datetime,
+                                    until: datetime) -> Optional[tuple]:
+        """(repos, complete): repos the user committed to in the period, most commits first.
+
+        Uses the GraphQL contributions collection (at most one year and 100 repos per
+        query, so the period is split into windows and counts are summed). Entries are
+        shaped like REST repo objects plus a "contributions" commit count. It covers
+        any owner, not just the user's own repos, but only default-branch commits
+        linked to the account. complete is False when a window still hit the 100-repo
+        cap after splitting. Returns None when GraphQL is unavailable so callers can
+        fall back to get_repos().
+        """
+        windows = []
+        start = since
+        while start < until:
+            end = min(start + _CONTRIBUTIONS_WINDOW, until)
+            windows.append((start, end))
+            start = end
+
+        results = await asyncio.gather(*[self._contribution_window(username, a, b) for a, b in windows])
+        if any(r is None for r in results):
+            return None
+
+        repos = {}
+        for items, _ in results:
+            for item in items:
+                node = item.get("repository") or {}
+                count = (item.get("contributions") or {}).get("totalCount", 0)
+                key = node.get("nameWithOwner", "").lower()
+                if not key:
+                    continue
+                if key in repos:
+                    repos[key]["contributions"] += count
+                    continue
+                repos[key] = {
+                    "name": node.get("name", ""),
+                    "full_name": node.get("nameWithOwner", ""),
+                    "owner": {"login": (node.get("owner") or {}).get("login", "")},
+                    "fork": bool(node.get("isFork")),
+                    "private": bool(node.get("isPrivate")),
+                    "language": (node.get("primaryLanguage") or {}).get("name", ""),
+                    "pushed_at": node.get("pushedAt") or "",
+                    "size": node.get("diskUsage") or 1,
+                    "default_branch": (node.get("defaultBranchRef") or {}).get("name", ""),
+                    "contributions": count,
+                }
+
+        ordered = sorted(repos.values(), key=lambda r: r["contributions"], reverse=True)
+        complete = all(done for _, done in results)
+        logger.info(f"Discovered {len(ordered)} contributed repos for {username}"
+                    f"{'' if complete else ' (capped)'}")
+        return ordered, complete
+
+    async def get_org_repos(self, org: str, max_repos: int = 200) -> list:
+        """Fetch an organization's repos, most recently pushed first."""
+        repos = await self._paginate(
+            f"{self.base_url}/orgs/{org}/repos",
+            {"sort": "pushed", "direction": "desc", "type": "all"},
+            max_items=max_repos,
+        )
+        logger.info(f"Fetched {len(repos)} repos for org {org}")
+        return repos
+
+    async def get_org_members(self, org: str) -> list:
+        """Fetch organization members (public ones unless the token can see private)."""
+        return await self._paginate(f"{self.base_url}/orgs/{org}/members", {})
+
+    async def get_org_search_counts(self, org: str, kind: str, since_date: str) -> dict:
+        """Count PRs or issues per author inside an org, created since a date.
+
+        One search listing (max 1000 results) replaces a search call per member.
+        """
+        counts = {}
+        q = f"org:{org} type:{kind} created:>={since_date}"
+        for page in range(1, 11):
+            data = await self._request(f"{self.base_url}/search/issues",
+                                       {"q": q, "per_page": 100, "page": page})
+            items = data.get("items", []) if isinstance(data, dict) else []
+            for item in items:
+                login = (item.get("user") or {}).get("login", "").lower()
+                if login:
+                    counts[login] = counts.get(login, 0) + 1
+            if len(items) < 100:
+                break
+        return counts
+
+    async def get_user(self, username: str) -> Optional[dict]:
+        """Get a user's public profile (None if the user does not exist).
+
+        Any answer other than 200 / 404 raises LookupFailed, so a rate-limited or
+        failing lookup is never mistaken for an unknown username.
+        """
+        resp = await self._get(f"{self.base_url}/users/{username}")
+        if resp.status_code == 404:
+            return None
+        data = resp.json() if resp.status_code == 200 else None
+        if not isinstance(data, dict):
+            raise LookupFailed(f"GitHub user lookup answered HTTP {resp.status_code}")
+        return data
+
+    async def get_viewer(self) -> Optional[dict]:
+        """Profile of the token's owner (None without a token or on error)."""
+        if not self.token:
+            return None
+        data = await self._request(f"{self.base_url}/user")
+        return data if isinstance(data, dict) else None
+
+    async def get_verified_emails(self) -> list:
+        """Lowercased verified emails of the token's owner (needs the user:email scope)."""
+        data = await self._request(f"{self.base_url}/user/emails")
+        if not isinstance(data, list):
+            return []
+        return [e["email"].lower() for e in data if isinstance(e, dict) and e.get("verified") and e.get("email")]
+
+    def profile_emails(self, profile: dict) -> set:
+        """noreply addresses GitHub issues for the account (old and id-prefixed forms)."""
+        login = profile["login"].lower()
+        emails = {f"{login}{NOREPLY_DOMAIN}"}
+        if profile.get("id"):
+            emails.add(f"{profile['id']}+{login}{NOREPLY_DOMAIN}")
+        return emails
+
     async def get_languages(self, owner: str, repo: str) -> dict:
         """Get language byte-count breakdown for a repo."""
-        data = await self._request(f"https://api.github.com/repos/{owner}/{repo}/languages")
+        data = await self._request(f"{self.base_url}/repos/{owner}/{repo}/languages")
         return data if isinstance(data, dict) else {}
 
-    async def get_commits(self, owner: str, repo: str, author: str,
-                    since: str, until: str) -> list:
-        """Fetch all commits for a repo within a date range."""
+    async def get_commits(self, owner: str, repo: str, author: Optional[str],
+                    since: str, until: str, max_total: int = 0, strict: bool = False) -> Optional[list]:
+        """Fetch all commits for a repo within a date range (all authors if author is None).
+
+        Returns None when max_total is set and the range holds more commits than that.
+        """
+        params = {"since": since, "until": until}
+        if author:
+            params["author"] = author
         return await self._paginate(
-            f"https://api.github.com/repos/{owner}/{repo}/commits",
-            {"author": author, "since": since, "until": until},
+            f"{self.base_url}/repos/{owner}/{repo}/commits", params, max_total=max_total, strict=strict,
         )
 
+    async def get_repo_stats(self, owner: str, repo: str, kind: str) -> Optional[list]:
+        """Fetch /stats/contributors or /stats/punch_card (None if unavailable).
+
+        GitHub answers 202 while it computes the statistics in the background, so
+        poll with exponential backoff for a bounded number of attempts.
+        """
+        url = f"{self.base_url}/repos/{owner}/{repo}/stats/{kind}"
+        delay = STATS_POLL_DELAY
+        try:
+            for attempt in range(STATS_POLL_ATTEMPTS):
+                resp = await self._get(url)
+                if resp.status_code == 200:
+                    data = resp.json()
+                    return data if isinstance(data, list) else None
+                if resp.status_code != 202:
+                    return None
+                if attempt < STATS_POLL_ATTEMPTS - 1:
+                    await asyncio.sleep(delay)
+                    delay *= 2
+        except Exception as e:
+            logger.error(f"Stats error for {owner}/{repo}/{kind}: {e}")
+            return None
+        logger.info(f"Stats for {owner}/{repo}/{kind} still computing after {STATS_POLL_ATTEMPTS} polls")
+        return None
+
+    async def _detect_frameworks_partial(self, owner: str, repo: str, primary_lang: str,
+                                         fw_maps: dict, tree: Optional[dict]) -> set:
+        return await self._detect_frameworks_root(owner, repo, primary_lang, fw_maps)
+
+    async def _detect_frameworks_root(self, owner: str, repo: str,
+                          primary_lang: str, fw_maps: dict) -> set:
+        """Detect frameworks based on root config files relevant to primary language."""
+        lang = (primary_lang or "").lower()
+
+        checks = []
+        if lang in ("javascript", "typescript", "vue", "svelte", "html", "css", ""):
+            checks.append("package.json")
+        if lang in ("python", "jupyter notebook", ""):
+            checks.append("requirements.txt")
+            checks.append("pyproject.toml")
+        if lang in ("php", ""):
+            checks.append("composer.json")
+        if lang in ("go", ""):
+            checks.append("go.mod")
+        if lang in ("java", "kotlin", ""):
+            checks.append("build.gradle")
+            checks.append("pom.xml")
+        if lang in ("rust", ""):
+            checks.append("Cargo.toml")
+        if lang in ("dart", ""):
+            checks.append("pubspec.yaml")
+        if lang in ("ruby", ""):
+            checks.append("Gemfile")
+
+        if not checks:
+            checks.append("package.json")
+
+        root_files = await self.get_repo_root_files(owner, repo)
+        frameworks = marker_frameworks(set(root_files))
+
+        if ".github" in root_files and await self.has_github_actions(owner, repo):
+            frameworks.add("GitHub Actions")
+
+        # Fetch all config files concurrently
+        fetch_tasks = [self.get_file_content(owner, repo, name) for name in checks]
+        contents = await asyncio.gather(*fetch_tasks, return_exceptions=True)
+
+        matcher = compile_fw_maps(fw_maps)
+        for name, content in zip(checks, contents):
+            if content and not isinstance(content, Exception):
+                frameworks |= matcher.detect(name, content)
+
+        return frameworks
+
     async def get_repo_root_files(self, owner: str, repo: str) -> list:
         """Get names of all files in the root of the repository to detect tools quickly."""
-        data = await self._request(f"https://api.github.com/repos/{owner}/{repo}/contents")
+        data = await self._request(f"{self.base_url}/repos/{owner}/{repo}/contents")
         if isinstance(data, list):
             return [str(item.get("name", "")).lower() for item in data]
         return []
 
     async def has_github_actions(self, owner: str, repo: str) -> bool:
         """Check if .github/workflows exists."""
-        data = await self._request(f"https://api.github.com/repos/{owner}/{repo}/contents/.github")
+        data = await self._request(f"{self.base_url}/repos/{owner}/{repo}/contents/.github")
         if isinstance(data, list):
             return any(item.get("name") == "workflows" for item in data)
         return False
 
     async def get_user_prs(self, username: str) -> int:
         """Fetch total merged/created PRs by the user."""
-        data = await self._request("https://api.github.com/search/issues", {"q": f"author:{username} type:pr"})
+        data = await self._request(f"{self.base_url}/search/issues", {"q": f"author:{username} type:pr"})
         return data.get("total_count", 0) if isinstance(data, dict) else 0
 
     async def get_user_issues(self, username: str) -> int:
         """Fetch total issues created by the user."""
-        data = await self._request("https://api.github.com/search/issues", {"q": f"author:{username} type:issue"})
+        data = await self._request(f"{self.base_url}/search/issues", {"q": f"author:{username} type:issue"})
         return data.get("total_count", 0) if isinstance(data, dict) else 0
 
     async def get_file_content(self, owner: str, repo: str, path: str) -> Optional[str]:
         """Get decoded file content from a repository."""
         data = await self._request(
-            f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
+            f"{self.base_url}/repos/{owner}/{repo}/contents/{path}"
         )
         if data and isinstance(data, dict) and "content" in data:
             try:
@@ -138,89 +491,17 @@ class GitHubService:
                 pass
         return None
 
-    async def detect_frameworks(self, owner: str, repo: str,
-                          primary_lang: str, fw_maps: dict) -> set:
-        """Detect frameworks based on config files relevant to primary language."""
-        frameworks = set()
-        lang = (primary_lang or "").lower()
-
-        checks = []
-        if lang in ("javascript", "typescript", "vue", "svelte", "html", "css", ""):
-            checks.append(("package.json", "json", fw_maps.get("package_json", {})))
-        if lang in ("python", "jupyter notebook", ""):
-            checks.append(("requirements.txt", "text", fw_maps.get("requirements", {})))
-        if lang in ("php", ""):
-            checks.append(("composer.json", "json_composer", fw_maps.get("composer", {})))
-        if lang in ("go", ""):
-            checks.append(("go.mod", "text", fw_maps.get("go_mod", {})))
-        if lang in ("java", "kotlin", ""):
-            checks.append(("build.gradle", "text", fw_maps.get("build", {})))
-            checks.append(("pom.xml", "text", fw_maps.get("build", {})))
-        if lang in ("dart", ""):
-            checks.append(("pubspec.yaml", "text", {"flutter": "Flutter"}))
-        if lang in ("ruby", ""):
-            checks.append(("Gemfile", "text", {"rails": "Rails", "sinatra": "Sinatra"}))
-
-        if not checks:
-            checks.append(("package.json", "json", fw_maps.get("package_json", {})))
-
-        root_files = await self.get_repo_root_files(owner, repo)
-        if "dockerfile" in root_files or "docker-compose.yml" in root_files or "docker-compose.yaml" in root_files:
-            frameworks.add("Docker")
-        if "tailwind.config.js" in root_files or "tailwind.config.ts" in root_files:
-            frameworks.add("Tailwind CSS")
-        if "next.config.js" in root_files or "next.config.ts" in root_files or "next.config.mjs" in root_files:
-            frameworks.add("Next.js")
-        if "svelte.config.js" in root_files:
-            frameworks.add("SvelteKit")
-        if "astro.config.mjs" in root_files or "astro.config.js" in root_files:
-            frameworks.add("Astro")
-        if "prisma" in root_files: 
-            frameworks.add("Prisma")
-        if any(f.endswith(".k8s.yaml") or f.endswith("deployment.yaml") for f in root_files):
-            frameworks.add("Kubernetes")
-
-        if ".github" in root_files and await self.has_github_actions(owner, repo):
-            frameworks.add("GitHub Actions")
-
-        # Fetch all config files concurrently
-        fetch_tasks = [self.get_file_content(owner, repo, ch[0]) for ch in checks]
-        contents = await asyncio.gather(*fetch_tasks, return_exceptions=True)
-
-        for i, (file_path, parse_mode, mapping) in enumerate(checks):
-            content = contents[i]
-            if not content or isinstance(content, Exception):
-                continue
-
-            if parse_mode == "json":
-                try:
-                    pkg = json.loads(content)
-                    deps = {**pkg.get("dependencies", {}),
-                            **pkg.get("devDependencies", {})}
-                    for key, name in mapping.items():
-                        if key in deps:
-                            frameworks.add(name)
-                except (json.JSONDecodeError, AttributeError):
-                    pass
-
-            elif parse_mode == "json_composer":
-                try:
-                    pkg = json.loads(content)
-                    deps = {**pkg.get("require", {}),
-                            **pkg.get("require-dev", {})}
-                    for key, name in mapping.items():
-                        if key in deps:
-                            frameworks.add(name)
-                except (json.JSONDecodeError, AttributeError):
-                    pass
-
-            elif parse_mode == "text":
-                lower = content.lower()
-                for key, name in mapping.items():
-                    if key in lower:
-                        frameworks.add(name)
-                if file_path == "build.gradle":
-                    if "com.android.application" in lower:
-                        frameworks.add("Android SDK")
+    async def get_tree(self, owner: str, repo: str, ref: str = "HEAD") -> Optional[dict]:
+        """Recursive Git tree of a ref: {"sha", "tree": [{"path", "type", "sha", "size"}], "truncated"}."""
+        data = await self._request(f"{self.base_url}/repos/{owner}/{repo}/git/trees/{ref}",
+                                   {"recursive": "1"})
+        return data if isinstance(data, dict) and isinstance(data.get("tree"), list) else None
 
-        return frameworks
+    async def _fetch_blob(self, owner: str, repo: str, sha: str) -> Optional[str]:
+        data = await self._request(f"{self.base_url}/repos/{owner}/{repo}/git/blobs/{sha}")
+        if data and isinstance(data, dict) and "content" in data:
+            try:
+                return base64.b64decode(data["content"]).decode("utf-8")
+            except Exception:
+                pass
+        return None
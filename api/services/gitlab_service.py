@@ -0,0 +1,324 @@
+"""GitLab REST API v4 provider, answering in the GitHub shapes the tracker reads.
+
+Projects are addressed by their URL-encoded full path, so the tracker's
+owner/name pair is (namespace full path, project path). GitLab has no
+statistics API and no login on commits: long histories are paginated up to
+the page cap, and commits are attributed by the identity's emails, then by
+author name (profile name or username).
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from urllib.parse import quote
+
+import httpx
+from config import GITLAB_API_BASE, GITLAB_MAX_INFLIGHT
+from services.metrics import GITLAB_LATENCY, GITLAB_RATE_REMAINING, GITLAB_REQUESTS
+from services.provider import ListingIncomplete, LookupFailed, RepoProvider
+from services.timing import count_upstream
+
+logger = logging.getLogger(__name__)
+
+NOREPLY_DOMAIN = "@users.noreply.gitlab.com"
+MAX_PAGES = 10        # 1000 items per listing, as on GitHub
+MAX_EVENT_PAGES = 20  # push events scanned to discover contributed projects
+MAX_TREE_PAGES = 10   # larger trees are reported truncated (frameworks come from the listed part)
+
+
+def _endpoint_class(path: str) -> str:
+    """Low-cardinality metric label (/projects/a%2Fb/repository/tree -> tree)."""
+    parts = path.strip("/").split("?")[0].split("/")
+    if parts[0] == "projects" and len(parts) > 2:
+        return parts[3] if parts[2] == "repository" and len(parts) > 3 else parts[2]
+    if parts[0] in ("users", "user") and len(parts) > 1:
+        return f"{parts[0]}_{parts[-1]}"
+    return parts[0]
+
+
+def _utc(timestamp: Optional[str]) -> str:
+    """GitLab timestamps carry milliseconds and offsets; the tracker parses GitHub's UTC form."""
+    try:
+        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return ""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _repo(project: dict) -> dict:
+    """A project as a GitHub REST repo object."""
+    namespace = project.get("namespace") or {}
+    return {
+        "id": project.get("id"),
+        "name": project.get("path", ""),
+        "full_name": project.get("path_with_namespace", ""),
+        "owner": {"login": namespace.get("full_path", "")},
+        "fork": "forked_from_project" in project,
+        "private": project.get("visibility", "public") != "public",
+        "language": "",
+        "pushed_at": _utc(project.get("last_activity_at")),
+        "size": 0 if project.get("empty_repo") else 1,
+        "default_branch": project.get("default_branch") or "",
+    }
+
+
+def _commit(commit: dict) -> dict:
+    """A commit as a GitHub REST commit object (GitLab commits carry no account login)."""
+    return {
+        "sha": commit.get("id", ""),
+        "commit": {"message": commit.get("message") or commit.get("title") or "",
+                   "author": {"name": commit.get("author_name"), "email": commit.get("author_email"),
+                              "date": _utc(commit.get("authored_date"))}},
+        "author": None,
+    }
+
+
+class GitLabService(RepoProvider):
+    """Handles all GitLab API interactions (Async)."""
+
+    host = "gitlab"
+    key_prefix = "gitlab:"
+    commit_logins = False
+
+    def __init__(self, token: str, client: httpx.AsyncClient, base_url: str = GITLAB_API_BASE):
+        super().__init__(GITLAB_MAX_INFLIGHT)
+        self.token = token
+        self.client = client
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"PRIVATE-TOKEN": token} if token else {}
+
+    def _project(self, owner: str, repo: str) -> str:
+        return f"{self.base_url}/projects/{quote(f'{owner}/{repo}', safe='')}"
+
+    async def _get(self, url: str, params: dict = None, timeout: float = 12.0) -> httpx.Response:
+        """Single choke point for upstream GETs — records request metrics."""
+        endpoint = _endpoint_class(url[len(self.base_url):])
+        count_upstream()
+        async with self._inflight:
+            start = time.perf_counter()
+            try:
+                resp = await self.client.get(url, params=params, headers=self.headers, timeout=timeout)
+            except Exception:
+                GITLAB_REQUESTS.inc(endpoint, "error")
+                raise
+        GITLAB_LATENCY.observe(time.perf_counter() - start, endpoint)
+        GITLAB_REQUESTS.inc(endpoint, str(resp.status_code))
+        remaining = resp.headers.get("ratelimit-remaining")
+        if remaining is not None:
+            GITLAB_RATE_REMAINING.set(int(remaining))
+        if resp.status_code == 429 or (resp.status_code == 403 and remaining == "0"):
+            if not self.rate_limited:
+                logger.warning(f"GitLab rate limit hit on {endpoint}")
+            self.rate_limited = True
+        return resp
+
+    async def _request(self, url: str, params: dict = None) -> Optional[any]:
+        """Make a GitLab API request; None on any error."""
+        try:
+            resp = await self._get(url, params)
+            if resp.status_code == 200:
+                return resp.json()
+            elif resp.status_code != 404:
+                logger.error(f"HTTP {resp.status_code}: {url}")
+            return None
+        except Exception as e:
+            logger.error(f"Request error for {url}: {e}")
+            return None
+
+    async def _paginate(self, url: str, params: dict, max_items: int = 0,
+                        max_pages: int = MAX_PAGES) -> tuple:
+        """(items, complete) following rel="next" links.
+
+        Keyset listings hand out the next cursor with each page, so pages are read
+        in sequence; concurrency comes from scanning repos side by side.
+        complete is False when max_pages or max_items cut the listing short, or a
+        page failed (anything but 200 / 404).
+        """
+        items = []
+        params = {**(params or {}), "per_page": 100}
+        for _ in range(max_pages):
+            resp = await self._get(url, params, timeout=15.0)
+            data = resp.json() if resp.status_code == 200 else None
+            if not isinstance(data, list):
+                if resp.status_code not in (200, 404):
+                    logger.error(f"HTTP {resp.status_code}: {url}")
+                    return items, False
+                return items, True
+            items.extend(data)
+            if max_items and len(items) >= max_items:
+                return items[:max_items], False
+            url = resp.links.get("next", {}).get("url")
+            if not url or len(data) < 100:
+                return items, True
+            params = None  # the next link carries the query and cursor
+        return items, False
+
+    async def _count(self, url: str, params: dict) -> int:
+        """Size of a listing from its X-Total header (one single-item page)."""
+        try:
+            resp = await self._get(url, {**params, "per_page": 1})
+            return int(resp.headers.get("x-total", 0)) if resp.status_code == 200 else 0
+        except Exception as e:
+            logger.error(f"Count error for {url}: {e}")
+            return 0
+
+    # ── Identity ────────────────────────────────────────────────────
+    async def get_user(self, username: str) -> Optional[dict]:
+        resp = await self._get(f"{self.base_url}/users", {"username": username})
+        data = resp.json() if resp.status_code == 200 else None
+        if not isinstance(data, list):
+            raise LookupFailed(f"GitLab user lookup answered HTTP {resp.status_code}")
+        if not data:
+            return None
+        user = data[0]
+        return {**user, "login": user.get("username", username)}
+
+    async def get_viewer(self) -> Optional[dict]:
+        if not self.token:
+            return None
+        data = await self._request(f"{self.base_url}/user")
+        return {**data, "login": data.get("username", "")} if isinstance(data, dict) else None
+
+    async def get_verified_emails(self) -> list:
+        """Confirmed secondary emails plus the primary / commit email (needs read_user)."""
+        viewer, listed = await asyncio.gather(self._request(f"{self.base_url}/user"),
+                                              self._request(f"{self.base_url}/user/emails"))
+        emails = set()
+        if isinstance(viewer, dict):
+            emails.update(viewer.get(k) for k in ("email", "commit_email", "public_email"))
+        if isinstance(listed, list):
+            emails.update(e.get("email") for e in listed if isinstance(e, dict) and e.get("confirmed_at"))
+        return sorted(e.lower() for e in emails if e)
+
+    def profile_emails(self, profile: dict) -> set:
+        """GitLab's noreply address for the account, and its public email if set."""
+        emails = set()
+        if profile.get("id"):
+            emails.add(f"{profile['id']}-{profile['login'].lower()}{NOREPLY_DOMAIN}")
+        if profile.get("public_email"):
+            emails.add(profile["public_email"].lower())
+        return emails
+
+    # ── Projects ────────────────────────────────────────────────────
+    async def get_contributed_repos(self, username: str, since: datetime,
+                                    until: datetime) -> Optional[tuple]:
+        """(repos, complete) from the user's push events, most pushed commits first.
+
+        The push-event feed is GitLab's counterpart of GitHub's contributions
+        collection: each branch push names its project and commit count. complete
+        is False when the feed was longer than MAX_EVENT_PAGES. None when the feed
+        is empty or hidden, so callers list the user's projects instead.
+        """
+        events, complete = await self._paginate(
+            f"{self.base_url}/users/{quote(username, safe='')}/events",
+            {"action": "pushed", "after": (since - timedelta(days=1)).date().isoformat(),
+             "before": (until + timedelta(days=1)).date().isoformat(), "sort": "desc"},
+            max_pages=MAX_EVENT_PAGES,
+        )
+        lo, hi = _utc(since.isoformat()), _utc(until.isoformat())
+        counts = {}
+        for event in events:
+            push = event.get("push_data") or {}
+            if push.get("ref_type") != "branch" or not lo <= _utc(event.get("created_at")) <= hi:
+                continue
+            counts[event.get("project_id")] = counts.get(event.get("project_id"), 0) + push.get("commit_count", 0)
+        counts.pop(None, None)
+        if not counts:
+            return None
+
+        ids = list(counts)
+        projects = await asyncio.gather(*[self._request(f"{self.base_url}/projects/{pid}") for pid in ids])
+        repos = []
+        for pid, project in zip(ids, projects):
+            if isinstance(project, dict) and not project.get("archived"):
+                repos.append({**_repo(project), "contributions": counts[pid]})
+        repos.sort(key=lambda r: r["contributions"], reverse=True)
+        logger.info(f"Discovered {len(repos)} contributed GitLab projects for {username}"
+                    f"{'' if complete else ' (capped)'}")
+        return repos, complete
+
+    async def get_repos(self, username: str, max_repos: int = 200,
+                        include_forks: bool = False) -> list:
+        """The user's own and contributed-to projects, most recently active first."""
+        user = quote(username, safe="")
+        params = {"order_by": "last_activity_at", "sort": "desc"}
+        (owned, _), (contributed, _) = await asyncio.gather(
+            self._paginate(f"{self.base_url}/users/{user}/projects", params, max_items=max_repos),
+            self._paginate(f"{self.base_url}/users/{user}/contributed_projects", params, max_items=max_repos),
+        )
+        seen = set()
+        repos = []
+        for project in owned + contributed:
+            if project.get("id") in seen or project.get("archived"):
+                continue
+            seen.add(project.get("id"))
+            repos.append(_repo(project))
+        if not include_forks:
+            repos = [r for r in repos if not r["fork"]]
+        repos.sort(key=lambda r: r["pushed_at"], reverse=True)
+        logger.info(f"Fetched {len(repos)} GitLab projects for {username}")
+        return repos[:max_repos]
+
+    async def get_languages(self, owner: str, repo: str) -> dict:
+        """Language percentages (GitLab reports shares rather than bytes)."""
+        data = await self._request(f"{self._project(owner, repo)}/languages")
+        return data if isinstance(data, dict) else {}
+
+    async def get_commits(self, owner: str, repo: str, author: Optional[str],
+                          since: str, until: str, max_total: int = 0, strict: bool = False) -> Optional[list]:
+        """Default-branch commits in a date range, all authors (filter with Identity.matches).
+
+        GitLab's author filter is a loose name/email search, so it isn't used.
+        max_total is ignored: with no statistics API to estimate from, a long
+        history is paginated up to MAX_PAGES instead.
+        """
+        commits, complete = await self._paginate(f"{self._project(owner, repo)}/repository/commits",
+                                                 {"since": since, "until": until})
+        if strict and not complete:
+            raise ListingIncomplete(f"Commit listing of {owner}/{repo} failed or hit the page cap")
+        return [_commit(c) for c in commits]
+
+    async def get_repo_stats(self, owner: str, repo: str, kind: str) -> Optional[list]:
+        return None
+
+    # ── Files ───────────────────────────────────────────────────────
+    async def get_tree(self, owner: str, repo: str, ref: str = "HEAD") -> Optional[dict]:
+        """Recursive tree of a ref via keyset pagination, as {"tree": [...], "truncated"}.
+
+        Entries carry no sizes, so language accounting leaves GitLab shares as-is.
+        """
+        try:
+            entries, complete = await self._paginate(
+                f"{self._project(owner, repo)}/repository/tree",
+                {"recursive": "true", "ref": ref, "pagination": "keyset"}, max_pages=MAX_TREE_PAGES,
+            )
+        except Exception as e:
+            logger.error(f"Tree error for {owner}/{repo}: {e}")
+            return None
+        if not entries:
+            return None
+        tree = [{"path": e.get("path", ""), "type": e.get("type"), "sha": e.get("id")} for e in entries]
+        return {"tree": tree, "truncated": not complete}
+
+    async def _raw(self, url: str, params: dict = None) -> Optional[str]:
+        try:
+            resp = await self._get(url, params)
+        except Exception as e:
+            logger.error(f"Request error for {url}: {e}")
+            return None
+        return resp.text if resp.status_code == 200 else None
+
+    async def _fetch_blob(self, owner: str, repo: str, sha: str) -> Optional[str]:
+        return await self._raw(f"{self._project(owner, repo)}/repository/blobs/{sha}/raw")
+
+    # ── Activity counts ─────────────────────────────────────────────
+    async def get_user_prs(self, username: str) -> int:
+        """Merge requests opened by the user (needs a token)."""
+        return await self._count(f"{self.base_url}/merge_requests",
+                                 {"author_username": username, "scope": "all"})
+
+    async def get_user_issues(self, username: str) -> int:
+        return await self._count(f"{self.base_url}/issues", {"author_username": username, "scope": "all"})
@@ -0,0 +1,92 @@
+"""Author identity resolution: a user's logins and verified commit emails."""
+import logging
+from collections import OrderedDict
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+NOREPLY_DOMAIN = "@users.noreply.github.com"
+
+
+class Identity(NamedTuple):
+    login: str             # canonical login (GitHub's casing), used for author= queries
+    logins: frozenset      # lowercased
+    emails: frozenset      # lowercased, verified / host-issued only
+    names: frozenset = frozenset()  # lowercased author names, for hosts without commit logins
+
+    def matches(self, commit: dict) -> bool:
+        """True if a commit (REST shape) was authored by this identity.
+
+        Linked commits match by login; unlinked ones by email, then by author name.
+        """
+        author = commit.get("author") or {}
+        if author.get("login"):
+            return author["login"].lower() in self.logins
+        try:
+            git_author = commit["commit"]["author"] or {}
+        except (KeyError, TypeError):
+            return False
+        if (git_author.get("email") or "").lower() in self.emails:
+            return True
+        return (git_author.get("name") or "").strip().lower() in self.names
+
+
+def noreply_login(email: str) -> str:
+    """Login behind a GitHub noreply address ("123+octocat@users..." -> "octocat"), else ""."""
+    email = (email or "").lower()
+    if not email.endswith(NOREPLY_DOMAIN):
+        return ""
+    return email[:-len(NOREPLY_DOMAIN)].rpartition("+")[2]
+
+
+class IdentityResolver:
+    """Resolves and memoizes identities (profiles rarely change within a process)."""
+
+    def __init__(self, max_entries: int = 1024):
+        self._items = OrderedDict()
+        self._max = max_entries
+        self._viewers = {}  # host -> token owner's login, looked up once
+
+    async def resolve(self, service, username: str) -> Identity:
+        key = f"{service.host}:{username.lower()}"
+        cached = self._items.get(key)
+        if cached is not None:
+            self._items.move_to_end(key)
+            return cached
+
+        logins = {username.lower()}
+        emails = set()
+        names = set()
+        login = username
+        try:
+            profile = await service.get_user(username)
+        except Exception as e:
+            logger.warning(f"Profile lookup for {username} on {service.host} failed: {e}")
+            profile = None
+        if profile:
+            login = profile.get("login") or username
+            logins.add(login.lower())
+            emails.update(service.profile_emails({**profile, "login": login}))
+            if not service.commit_logins:
+                # Most users commit with a private address the profile doesn't show;
+                # the git author name (display name or username) is the fallback.
+                names.update(n.strip().lower() for n in (profile.get("name"), login) if n and n.strip())
+            # Verified addresses are only visible to the account's own token
+            if service.host not in self._viewers:
+                viewer = await service.get_viewer()
+                if viewer is not None:
+                    self._viewers[service.host] = viewer.get("login", "").lower()
+            if self._viewers.get(service.host) == login.lower():
+                emails.update(await service.get_verified_emails())
+
+        identity = Identity(login, frozenset(logins), frozenset(emails), frozenset(names))
+        logger.info(f"Identity {login}: {len(identity.logins)} logins, {len(identity.emails)} emails, "
+                    f"{len(identity.names)} names")
+        if profile:  # don't pin a lookup that failed
+            self._items[key] = identity
+            if len(self._items) > self._max:
+                self._items.popitem(last=False)
+        return identity
+
+
+resolver = IdentityResolver()
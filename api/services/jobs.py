@@ -0,0 +1,108 @@
+"""Background scan jobs: a bounded queue, deduplicated by key, drained by a fixed worker pool."""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from services.metrics import JOB_EVENTS
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    __slots__ = ("id", "key", "status", "created", "started", "finished", "error")
+
+    def __init__(self, key: str):
+        self.id = os.urandom(16).hex()
+        self.key = key
+        self.status = "queued"  # -> running -> done | failed
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "status": self.status, "created": self.created,
+                "started": self.started, "finished": self.finished, "error": self.error}
+
+
+class JobQueue:
+    """At most one queued/running job per key; submit() returns None when the queue is full.
+
+    Workers are started on first use in the running event loop. Finished jobs
+    stay visible to get() for `retention` seconds.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retention: int = 600, max_jobs: int = 10000):
+        self._workers = workers
+        self._max_pending = max_pending
+        self._retention = retention
+        self._max_jobs = max_jobs
+        self._active = {}           # key -> queued / running Job
+        self._jobs = OrderedDict()  # id -> Job, oldest first
+        self._queue = None
+        self._loop = None
+        self._tasks = []
+
+    def _start(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # First use, or a new loop (tests): jobs queued on the old one are gone
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._active.clear()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self._workers)]
+
+    def submit(self, key: str, factory: Callable[[], Awaitable]) -> Optional[Job]:
+        """Queue factory() under key, or return the job already queued / running for it."""
+        self._start()
+        job = self._active.get(key)
+        if job is not None:
+            JOB_EVENTS.inc("deduped")
+            return job
+        if self._queue.qsize() >= self._max_pending:
+            JOB_EVENTS.inc("rejected")
+            return None
+        job = Job(key)
+        self._active[key] = job
+        self._jobs[job.id] = job
+        self._queue.put_nowait((job, factory))
+        JOB_EVENTS.inc("queued")
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _prune(self):
+        cutoff = time.time() - self._retention
+        while self._jobs:
+            oldest = next(iter(self._jobs.values()))
+            expired = oldest.finished is not None and oldest.finished < cutoff
+            if not expired and len(self._jobs) <= self._max_jobs:
+                break
+            self._jobs.popitem(last=False)
+
+    async def _worker(self):
+        while True:
+            job, factory = await self._queue.get()
+            job.status = "running"
+            job.started = time.time()
+            try:
+                await factory()
+                job.status = "done"
+            except Exception as e:
+                logger.error(f"Job {job.id} ({job.key}) failed: {e}")
+                job.status = "failed"
+                job.error = str(e)[:200]
+            finally:
+                job.finished = time.time()
+                self._active.pop(job.key, None)
+                JOB_EVENTS.inc(job.status)
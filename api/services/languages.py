@@ -0,0 +1,91 @@
+"""Language byte accounting from the tree listing: discount vendored and generated files.
+
+GitHub's /languages counts committed build output (dist/, .next/, minified
+bundles) as if it were written by hand. The recursive tree listing carries
+every blob's path and size, so one pass over it tells how many of a
+language's bytes sit in such paths. Trees are content-addressed, so the
+split is cached by tree SHA and a repo is only classified again when it
+changes.
+"""
+import re
+from collections import OrderedDict
+from typing import Optional
+
+from config import LANGUAGE_CACHE_SIZE, LANGUAGE_EXTENSIONS
+
+# Directories anywhere in the path, then lock files, minified / bundled and generated files
+_EXCLUDED_PATH = re.compile(
+    r"(?:^|/)(?:node_modules|bower_components|vendor|third_party|dist|build|out|\.next|\.nuxt"
+    r"|\.output|\.svelte-kit|coverage|target|__pycache__|\.venv|venv|Pods)/"
+    r"|(?:^|/)(?:package-lock\.json|npm-shrinkwrap\.json|yarn\.lock|pnpm-lock\.yaml|bun\.lockb"
+    r"|composer\.lock|Gemfile\.lock|Cargo\.lock|poetry\.lock|Pipfile\.lock|go\.sum|pubspec\.lock)$"
+    r"|[.-]min\.(?:js|css)$|\.bundle\.js$|\.chunk\.js$|\.map$"
+    r"|\.pb\.go$|_pb2(?:_grpc)?\.py$|\.g\.dart$|\.freezed\.dart$|\.generated\.\w+$"
+)
+
+
+def is_excluded_path(path: str) -> bool:
+    return _EXCLUDED_PATH.search(path) is not None
+
+
+def tree_language_bytes(tree: dict) -> dict:
+    """{language: (kept bytes, excluded bytes)} for the blobs of a full tree listing."""
+    split = {}
+    for entry in tree.get("tree", ()):
+        if entry.get("type") != "blob":
+            continue
+        path = entry.get("path", "")
+        dot = path.rfind(".")
+        lang = LANGUAGE_EXTENSIONS.get(path[dot:].lower()) if dot > path.rfind("/") else None
+        if lang is None:
+            continue
+        kept, excluded = split.get(lang, (0, 0))
+        if is_excluded_path(path):
+            excluded += entry.get("size", 0)
+        else:
+            kept += entry.get("size", 0)
+        split[lang] = (kept, excluded)
+    return split
+
+
+class LanguageAccounting:
+    """Per-tree byte splits, memoized by tree SHA (LRU)."""
+
+    def __init__(self, max_entries: int = LANGUAGE_CACHE_SIZE):
+        self._items = OrderedDict()
+        self._max = max_entries
+
+    def split(self, tree: dict) -> dict:
+        sha = tree.get("sha")
+        cached = self._items.get(sha) if sha else None
+        if cached is not None:
+            self._items.move_to_end(sha)
+            return cached
+        split = tree_language_bytes(tree)
+        if sha:
+            self._items[sha] = split
+            if len(self._items) > self._max:
+                self._items.popitem(last=False)
+        return split
+
+    def correct(self, langs: dict, tree: Optional[dict]) -> dict:
+        """GitHub's byte counts minus what lives in vendored / generated paths.
+
+        GitHub may or may not have counted those files already, so a language
+        is reduced by its excluded bytes but never below the bytes the tree
+        shows outside them. Truncated or missing trees leave langs untouched.
+        """
+        if not langs or tree is None or tree.get("truncated"):
+            return langs
+        split = self.split(tree)
+        corrected = {}
+        for lang, count in langs.items():
+            kept, excluded = split.get(lang, (0, 0))
+            if excluded:
+                count = max(count - excluded, min(count, kept))
+            if count > 0:
+                corrected[lang] = count
+        return corrected
+
+
+accounting = LanguageAccounting()
@@ -0,0 +1,234 @@
+"""Compiled manifest matching: parse each manifest once, look dependencies up by exact name.
+
+Detection maps from config.py are compiled into one exact-name index per map plus,
+for ecosystems whose coordinates nest (Go module paths, Maven/Gradle artifacts),
+one combined prefix regex. Parsers yield dependency names in a single pass.
+"""
+import json
+import re
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11 — fall back to a line scanner for the TOML we read
+    tomllib = None
+
+_PEP503 = re.compile(r"[-_.]+")
+_REQ_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+_GEM = re.compile(r"""^\s*gem\s+['"]([^'"]+)['"]""", re.M)
+_GO_REQUIRE = re.compile(r"^\s*(?:require\s+)?([^\s()]+)\s+v\d", re.M)
+_GRADLE_COORD = re.compile(r"""['"]([\w.-]+):([\w.-]+)(?::[^'"]*)?['"]""")
+# plugins { id 'x' } / id("x"), and legacy apply plugin: 'x' / apply(plugin = "x")
+_GRADLE_PLUGIN = re.compile(r"""\b(?:id\s*\(?|apply\s*\(?\s*plugin\s*[:=])\s*['"]([\w.-]+)['"]""")
+_POM_ID = re.compile(r"<(?:groupId|artifactId)>\s*([\w.-]+)\s*</")
+_TOML_SECTION = re.compile(r"^\s*\[([^\]]+)\]\s*$")
+_TOML_KEY = re.compile(r"""^\s*["']?([A-Za-z0-9_.-]+)["']?\s*=""")
+
+
+def pypi_name(name: str) -> str:
+    return _PEP503.sub("-", name).lower()
+
+
+class CompiledMap:
+    """Exact-name index, plus an optional combined prefix regex for nested coordinates."""
+
+    def __init__(self, mapping: dict, normalize=str.lower, boundary: str = ""):
+        self.normalize = normalize
+        self.exact = {normalize(k): v for k, v in mapping.items()}
+        self.prefix = None
+        if boundary:
+            keys = sorted(self.exact, key=len, reverse=True)
+            self.prefix = re.compile("^(?:%s)(?=[%s]|$)" % ("|".join(map(re.escape, keys)), re.escape(boundary)))
+
+    def match(self, names) -> set:
+        found = set()
+        for name in names:
+            name = self.normalize(name)
+            hit = self.exact.get(name)
+            if hit is None and self.prefix is not None:
+                m = self.prefix.match(name)
+                hit = self.exact[m.group(0)] if m else None
+            if hit is not None:
+                found.add(hit)
+        return found
+
+
+# ─── PARSERS (content -> dependency names) ──────────────────────
+def _json_keys(content: str, *sections) -> list:
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        return []
+    if not isinstance(data, dict):
+        return []
+    names = []
+    for section in sections:
+        deps = data.get(section)
+        if isinstance(deps, dict):
+            names.extend(deps)
+    return names
+
+
+def parse_package_json(content: str) -> list:
+    return _json_keys(content, "dependencies", "devDependencies", "peerDependencies")
+
+
+def parse_composer(content: str) -> list:
+    return _json_keys(content, "require", "require-dev")
+
+
+def parse_requirements(content: str) -> list:
+    names = []
+    for line in content.splitlines():
+        line = line.split("#", 1)[0]
+        if line.lstrip().startswith("-"):  # -r other.txt, -e ., --index-url ...
+            continue
+        m = _REQ_NAME.match(line)
+        if m:
+            names.append(m.group(1))
+    return names
+
+
+def _toml(content: str) -> dict:
+    """Parsed TOML; without tomllib only {section: {key: True}} (enough to list dependency keys)."""
+    if tomllib is not None:
+        try:
+            return tomllib.loads(content)
+        except tomllib.TOMLDecodeError:
+            return {}
+    data = {}
+    section = data
+    for line in content.splitlines():
+        m = _TOML_SECTION.match(line)
+        if m:
+            section = data
+            for part in m.group(1).strip().split("."):
+                section = section.setdefault(part.strip().strip('"'), {})
+            continue
+        m = _TOML_KEY.match(line)
+        if m and isinstance(section, dict):
+            section.setdefault(m.group(1), True)
+    return data
+
+
+def _dig(data: dict, *path):
+    for key in path:
+        data = data.get(key) if isinstance(data, dict) else None
+    return data
+
+
+def parse_pyproject(content: str) -> list:
+    data = _toml(content)
+    names = []
+    for spec in _dig(data, "project", "dependencies") or []:
+        if isinstance(spec, str):
+            names.extend(parse_requirements(spec))
+    for specs in (_dig(data, "project", "optional-dependencies") or {}).values():
+        for spec in specs if isinstance(specs, list) else []:
+            if isinstance(spec, str):
+                names.extend(parse_requirements(spec))
+    poetry = _dig(data, "tool", "poetry") or {}
+    names.extend(k for k in (poetry.get("dependencies") or {}) if k != "python")
+    names.extend(poetry.get("dev-dependencies") or {})
+    for group in (poetry.get("group") or {}).values():
+        names.extend(_dig(group, "dependencies") or {})
+    return names
+
+
+def parse_pipfile(content: str) -> list:
+    data = _toml(content)
+    return [*(data.get("packages") or {}), *(data.get("dev-packages") or {})]
+
+
+def parse_cargo(content: str) -> list:
+    data = _toml(content)
+    names = []
+    for section in ("dependencies", "dev-dependencies", "build-dependencies"):
+        names.extend(data.get(section) or {})
+    names.extend(_dig(data, "workspace", "dependencies") or {})
+    return names
+
+
+def parse_go_mod(content: str) -> list:
+    return _GO_REQUIRE.findall(content)
+
+
+def parse_gemfile(content: str) -> list:
+    return _GEM.findall(content)
+
+
+def parse_gradle(content: str) -> list:
+    names = _GRADLE_PLUGIN.findall(content)
+    for group, artifact in _GRADLE_COORD.findall(content):
+        names += [group, artifact]
+    return names
+
+
+def parse_pom(content: str) -> list:
+    return _POM_ID.findall(content)
+
+
+def parse_pubspec(content: str) -> list:
+    """Keys of the top-level dependency blocks (no YAML dependency needed)."""
+    names, in_deps = [], False
+    for line in content.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line[0].isspace():
+            in_deps = line.split(":", 1)[0].strip() in ("dependencies", "dev_dependencies")
+            continue
+        indent = len(line) - len(line.lstrip())
+        if in_deps and indent == 2 and ":" in line:
+            names.append(line.split(":", 1)[0].strip())
+    return names
+
+
+# Manifest file name -> (parser, fw_maps key)
+PARSERS = {
+    "package.json": (parse_package_json, "package_json"),
+    "requirements.txt": (parse_requirements, "requirements"),
+    "pyproject.toml": (parse_pyproject, "requirements"),
+    "Pipfile": (parse_pipfile, "requirements"),
+    "composer.json": (parse_composer, "composer"),
+    "go.mod": (parse_go_mod, "go_mod"),
+    "build.gradle": (parse_gradle, "build"),
+    "build.gradle.kts": (parse_gradle, "build"),
+    "pom.xml": (parse_pom, "build"),
+    "Cargo.toml": (parse_cargo, "cargo"),
+    "pubspec.yaml": (parse_pubspec, "pubspec"),
+    "Gemfile": (parse_gemfile, "gemfile"),
+}
+
+# fw_maps key -> (name normalizer, prefix boundary characters or "" for exact only)
+_MAP_RULES = {
+    "requirements": (pypi_name, ""),
+    "go_mod": (str.lower, "/"),
+    "build": (str.lower, "-."),
+}
+
+
+class ManifestMatcher:
+    """All detection maps compiled once; detect() parses a manifest and looks it up."""
+
+    def __init__(self, fw_maps: dict):
+        self.maps = {}
+        for key, mapping in fw_maps.items():
+            normalize, boundary = _MAP_RULES.get(key, (str.lower, ""))
+            self.maps[key] = CompiledMap(mapping, normalize, boundary)
+
+    def detect(self, file_name: str, content: str) -> set:
+        parser, key = PARSERS[file_name]
+        compiled = self.maps.get(key)
+        if compiled is None:
+            return set()
+        return compiled.match(parser(content))
+
+
+_compiled = {}
+
+
+def compile_fw_maps(fw_maps: dict) -> ManifestMatcher:
+    """Compiled matcher for a detection-map dict (built on first use, then reused)."""
+    entry = _compiled.get(id(fw_maps))
+    if entry is None or entry[0] is not fw_maps:
+        entry = _compiled[id(fw_maps)] = (fw_maps, ManifestMatcher(fw_maps))
+    return entry[1]
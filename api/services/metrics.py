@@ -0,0 +1,133 @@
+"""Minimal in-process Prometheus metrics (counters, gauges, histograms + text exposition)."""
+import bisect
+import threading
+
+_DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _esc(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _fmt_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_esc(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: tuple = ()):
+        self.name = name
+        self.doc = doc
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def render(self) -> list:
+        return self.header() + [f"{self.name}{_fmt_labels(self.labels, k)} {v:g}"
+                                for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *label_values):
+        self._values[label_values] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: tuple = (), buckets: tuple = _DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [[0] * len(self.buckets), 0, 0.0]
+            i = bisect.bisect_left(self.buckets, value)
+            if i < len(self.buckets):
+                state[0][i] += 1
+            state[1] += 1
+            state[2] += value
+
+    def render(self) -> list:
+        lines = self.header()
+        for k, (counts, total, sum_) in sorted(self._values.items()):
+            running = 0
+            for bound, c in zip(self.buckets, counts):
+                running += c
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, k, le)} {running}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, k, le)} {total}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, k)} {sum_:g}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, k)} {total}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+GITHUB_REQUESTS = REGISTRY.register(Counter(
+    "codestats_github_requests_total", "GitHub API requests by endpoint class and status.", ("endpoint", "status")))
+GITHUB_LATENCY = REGISTRY.register(Histogram(
+    "codestats_github_request_seconds", "GitHub API request latency.", ("endpoint",)))
+GITHUB_RATE_REMAINING = REGISTRY.register(Gauge(
+    "codestats_github_rate_limit_remaining", "Last X-RateLimit-Remaining seen, by resource.", ("resource",)))
+GITLAB_REQUESTS = REGISTRY.register(Counter(
+    "codestats_gitlab_requests_total", "GitLab API requests by endpoint class and status.", ("endpoint", "status")))
+GITLAB_LATENCY = REGISTRY.register(Histogram(
+    "codestats_gitlab_request_seconds", "GitLab API request latency.", ("endpoint",)))
+GITLAB_RATE_REMAINING = REGISTRY.register(Gauge(
+    "codestats_gitlab_rate_limit_remaining", "Last RateLimit-Remaining seen from GitLab.", ()))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "codestats_cache_lookups_total", "Cache lookups by tier and result.", ("tier", "result")))
+TRACKER_DURATION = REGISTRY.register(Histogram(
+    "codestats_tracker_seconds", "run_tracker wall time.", (),
+    (1, 2.5, 5, 10, 20, 30, 60, 120, 300)))
+TRACKER_REPOS = REGISTRY.register(Histogram(
+    "codestats_tracker_repos", "Repos scanned / with activity per run_tracker call.", ("kind",),
+    (1, 5, 10, 25, 50, 100, 200, 500)))
+RENDER_DURATION = REGISTRY.register(Histogram(
+    "codestats_render_seconds", "Card render time.", ("kind",),
+    (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025)))
+RESPONSES = REGISTRY.register(Counter(
+    "codestats_responses_total", "Responses by endpoint and status (200 vs 304 ratio).", ("endpoint", "status")))
+WEBHOOK_EVENTS = REGISTRY.register(Counter(
+    "codestats_webhook_events_total", "Webhook deliveries by event and outcome.", ("event", "result")))
+JOB_EVENTS = REGISTRY.register(Counter(
+    "codestats_jobs_total", "Background scan jobs by outcome (queued, deduped, rejected, done, failed).", ("result",)))
@@ -0,0 +1,50 @@
+"""Bounded worker pool with a priority queue, deadline and early stop."""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+async def run_prioritized(items: Iterable, handler: Callable[..., Awaitable], priority: Callable,
+                          workers: int, deadline: Optional[float] = None,
+                          should_stop: Callable[[], bool] = None) -> tuple:
+    """Run handler(item) on `workers` tasks, lowest priority(item) first.
+
+    Returns (results, skipped). Like gather(return_exceptions=True), a handler's
+    exception is returned in results instead of aborting the pool. Workers stop
+    taking items once should_stop() is true; after `deadline` seconds in-flight
+    handlers are cancelled. Either way the finished results are kept and the rest
+    counted in skipped. Cancelling the caller cancels every worker.
+    """
+    queue = asyncio.PriorityQueue()
+    for seq, item in enumerate(items):
+        queue.put_nowait((priority(item), seq, item))
+    total = queue.qsize()
+    results = []
+
+    async def worker():
+        while not queue.empty():
+            if should_stop is not None and should_stop():
+                return
+            _, _, item = queue.get_nowait()
+            try:
+                results.append(await handler(item))
+            except Exception as e:
+                results.append(e)
+
+    tasks = [asyncio.create_task(worker()) for _ in range(min(workers, total))]
+    if not tasks:
+        return results, 0
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        if pending:
+            logger.warning(f"Worker pool deadline ({deadline:.1f}s) hit, cancelling {len(pending)} workers")
+    finally:
+        for t in tasks:
+            t.cancel()
+        for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(outcome, Exception):
+                logger.error(f"Worker failed: {outcome}")
+
+    return results, total - len(results)
@@ -0,0 +1,201 @@
+"""Code-host providers: the interface the tracker drives, and what GitHub and GitLab share.
+
+A provider returns GitHub REST shapes (repo, commit, git tree and profile
+objects), so the tracker, identity matching and framework detection run
+unchanged on either host. The base class owns the per-scan request budget,
+the rate-limit stop flag, blob deduplication and framework detection; a
+subclass missing one of the abstract fetches fails when it is created.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from services.manifests import PARSERS, compile_fw_maps
+
+MAX_MANIFESTS_PER_KIND = 25  # bounds blob fetches in very large monorepos
+VENDORED_DIRS = {"node_modules", "vendor", "third_party", "bower_components", ".git"}
+
+
+class LookupFailed(Exception):
+    """A profile lookup that failed upstream (rate limit, 5xx, network) — not a missing user."""
+
+
+class ListingIncomplete(Exception):
+    """A strict listing that failed upstream or was cut short by the page cap."""
+
+
+class RepoProvider(ABC):
+    """Base for GitHubService / GitLabService. Subclasses implement the fetch methods below."""
+
+    host = ""        # "github" / "gitlab"
+    key_prefix = ""  # keeps repo keys (activity state, commit store) apart across hosts
+    commit_logins = True  # commits link to accounts; if not, identities also match author names
+
+    def __init__(self, max_inflight: int):
+        # Backpressure for every fan-out (repos x pages x manifests)
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self.rate_limited = False
+        self._blobs = {}  # blob sha -> fetch task
+        self._shared = {}  # once() key -> task
+
+    def repo_key(self, owner: str, repo: str) -> str:
+        return f"{self.key_prefix}{owner}/{repo}".lower()
+
+    # ── Fetches each host implements ────────────────────────────────
+    @abstractmethod
+    async def get_user(self, username: str) -> Optional[dict]:
+        """{"login", "id", ...} profile, or None if the user does not exist.
+
+        Raises LookupFailed (or the client's network error) when the host could not answer.
+        """
+
+    @abstractmethod
+    async def get_viewer(self) -> Optional[dict]:
+        """Profile of the token's owner (None without a token or on error)."""
+
+    @abstractmethod
+    async def get_verified_emails(self) -> list:
+        """Lowercased verified emails of the token's owner."""
+
+    @abstractmethod
+    def profile_emails(self, profile: dict) -> set:
+        """Lowercased commit emails the host issues or publishes for a profile."""
+
+    @abstractmethod
+    async def get_contributed_repos(self, username: str, since, until) -> Optional[tuple]:
+        """(repos, complete) the user committed to in the period, with a "contributions"
+        count each; None when the host can't tell (callers fall back to get_repos)."""
+
+    @abstractmethod
+    async def get_repos(self, username: str, max_repos: int = 200, include_forks: bool = False) -> list:
+        """The user's own repos, most recently pushed first (when get_contributed_repos can't tell)."""
+
+    @abstractmethod
+    async def get_languages(self, owner: str, repo: str) -> dict:
+        """{language: weight}; only the ratios between languages are used."""
+
+    @abstractmethod
+    async def get_commits(self, owner: str, repo: str, author: Optional[str],
+                          since: str, until: str, max_total: int = 0, strict: bool = False) -> Optional[list]:
+        """Commits in a date range (all authors if author is None); None when max_total
+        is set, the host can estimate instead, and the range holds more commits.
+
+        With strict, a failed or truncated listing raises ListingIncomplete instead
+        of returning what was read (callers that record the range as complete).
+        """
+
+    @abstractmethod
+    async def get_repo_stats(self, owner: str, repo: str, kind: str) -> Optional[list]:
+        """GitHub-style /stats/{kind} data, or None where the host has no equivalent."""
+
+    @abstractmethod
+    async def get_tree(self, owner: str, repo: str, ref: str = "HEAD") -> Optional[dict]:
+        """{"tree": [{"path", "type", "sha", "size"?}], "truncated", "sha"?} of a ref."""
+
+    @abstractmethod
+    async def _fetch_blob(self, owner: str, repo: str, sha: str) -> Optional[str]:
+        """Decoded blob content; callers go through get_blob(), which deduplicates."""
+
+    @abstractmethod
+    async def get_user_prs(self, username: str) -> int:
+        """Pull / merge requests the user opened."""
+
+    @abstractmethod
+    async def get_user_issues(self, username: str) -> int:
+        """Issues the user opened."""
+
+    # ── Shared ──────────────────────────────────────────────────────
+    async def once(self, key: tuple, factory):
+        """await factory() at most once per key for this service instance, in-flight included.
+
+        One service can serve several users (see /api/bulk), so per-repo work
+        keyed here is done once for every user who committed to the repo.
+        """
+        task = self._shared.get(key)
+        if task is None:
+            task = self._shared[key] = asyncio.ensure_future(factory())
+        return await task
+
+    async def get_blob(self, owner: str, repo: str, sha: str) -> Optional[str]:
+        """Decoded blob content. Identical blobs (same manifest in several repos or
+        directories) are fetched once per service instance, in-flight included."""
+        task = self._blobs.get(sha)
+        if task is None:
+            task = self._blobs[sha] = asyncio.ensure_future(self._fetch_blob(owner, repo, sha))
+        return await task
+
+    async def detect_frameworks(self, owner: str, repo: str, primary_lang: str,
+                                fw_maps: dict, ref: str = "HEAD", tree: Optional[dict] = None) -> set:
+        """Detect frameworks from manifests, workflows and config files at any depth.
+
+        One recursive tree listing finds every relevant path (monorepos included);
+        only the manifest blobs are fetched, deduplicated by blob SHA. Repos whose
+        tree can't be listed in full go to _detect_frameworks_partial(). Pass
+        `tree` when the caller already listed it.
+        """
+        if tree is None:
+            tree = await self.get_tree(owner, repo, ref)
+        if tree is None or tree.get("truncated"):
+            return await self._detect_frameworks_partial(owner, repo, primary_lang, fw_maps, tree)
+        return await self._detect_frameworks_tree(owner, repo, fw_maps, tree)
+
+    async def _detect_frameworks_partial(self, owner: str, repo: str, primary_lang: str,
+                                         fw_maps: dict, tree: Optional[dict]) -> set:
+        """Frameworks of a repo whose tree couldn't be listed in full: whatever the
+        listed part shows. GitHubService probes the root directory instead."""
+        return await self._detect_frameworks_tree(owner, repo, fw_maps, tree) if tree else set()
+
+    async def _detect_frameworks_tree(self, owner: str, repo: str, fw_maps: dict, tree: dict) -> set:
+        names = set()
+        manifests = {}  # blob sha -> manifest file name
+        per_kind = {}
+        actions = False
+        for entry in tree["tree"]:
+            path = entry.get("path", "")
+            parts = path.split("/")
+            if any(p in VENDORED_DIRS for p in parts[:-1]):
+                continue
+            names.update(p.lower() for p in parts)
+            if entry.get("type") != "blob":
+                continue
+            if path.startswith(".github/workflows/") and path.endswith((".yml", ".yaml")):
+                actions = True
+            base = parts[-1]
+            if base in PARSERS and per_kind.get(base, 0) < MAX_MANIFESTS_PER_KIND:
+                per_kind[base] = per_kind.get(base, 0) + 1
+                manifests.setdefault(entry["sha"], base)
+
+        frameworks = marker_frameworks(names)
+        if actions:
+            frameworks.add("GitHub Actions")
+
+        matcher = compile_fw_maps(fw_maps)
+        shas = list(manifests)
+        contents = await asyncio.gather(*[self.get_blob(owner, repo, sha) for sha in shas],
+                                        return_exceptions=True)
+        for sha, content in zip(shas, contents):
+            if content and not isinstance(content, Exception):
+                frameworks |= matcher.detect(manifests[sha], content)
+        return frameworks
+
+
+def marker_frameworks(names: set) -> set:
+    """Tools recognised from file/dir names alone (lowercased, any depth)."""
+    frameworks = set()
+    if "dockerfile" in names or "docker-compose.yml" in names or "docker-compose.yaml" in names:
+        frameworks.add("Docker")
+    if "tailwind.config.js" in names or "tailwind.config.ts" in names:
+        frameworks.add("Tailwind CSS")
+    if "next.config.js" in names or "next.config.ts" in names or "next.config.mjs" in names:
+        frameworks.add("Next.js")
+    if "svelte.config.js" in names:
+        frameworks.add("SvelteKit")
+    if "astro.config.mjs" in names or "astro.config.js" in names:
+        frameworks.add("Astro")
+    if "prisma" in names or "schema.prisma" in names:
+        frameworks.add("Prisma")
+    if ".gitlab-ci.yml" in names:
+        frameworks.add("GitLab CI")
+    if any(f.endswith(".k8s.yaml") or f.endswith("deployment.yaml") for f in names):
+        frameworks.add("Kubernetes")
+    return frameworks
@@ -0,0 +1,126 @@
+"""GCRA rate limiting — in-memory for single process, atomic Lua script for Redis."""
+import logging
+import math
+import threading
+import time
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until the next request would be allowed (0 if allowed)
+    reset_after: float  # seconds until the bucket is completely full again
+    window: int = 60    # seconds the limit applies to
+
+    def rate(self) -> str:
+        """Human-readable limit, e.g. "30 req/min" or "5 req/300s"."""
+        return f"{self.limit} req/{'min' if self.window == 60 else f'{self.window}s'}"
+
+    def headers(self) -> dict:
+        """Standard X-RateLimit-* headers (+ Retry-After when denied)."""
+        h = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            h["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return h
+
+
+def _gcra(tat: float, now: float, limit: int, window: int) -> tuple:
+    """One GCRA step. Returns (result, new_tat or None if denied)."""
+    interval = window / limit
+    new_tat = max(tat, now) + interval
+    allow_at = new_tat - window
+    if now < allow_at:
+        reset = max(tat - now, 0.0)
+        return RateLimitResult(False, limit, 0, allow_at - now, reset, window), None
+    remaining = min(limit - 1, int((now - allow_at) / interval))
+    return RateLimitResult(True, limit, remaining, 0.0, new_tat - now, window), new_tat
+
+
+class LocalRateLimiter:
+    """In-memory GCRA limiter (one theoretical-arrival-time float per key)."""
+
+    def __init__(self, max_keys: int = 10000):
+        self._tats = {}
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+
+    def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        now = time.monotonic()
+        with self._lock:
+            result, new_tat = _gcra(self._tats.get(key, now), now, limit, window)
+            if new_tat is not None:
+                self._tats[key] = new_tat
+                if len(self._tats) > self._max_keys:
+                    self._evict(now)
+        return result
+
+    def _evict(self, now: float):
+        """Drop keys whose TAT is in the past — their bucket is full anyway."""
+        self._tats = {k: v for k, v in self._tats.items() if v > now}
+
+
+# KEYS[1] = bucket key; ARGV = now_ms, limit, window_ms.
+# Returns {allowed, remaining, retry_after_ms, reset_after_ms}.
+GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local interval = window / limit
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if now < allow_at then
+  return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+local remaining = math.floor((now - allow_at) / interval)
+if remaining > limit - 1 then remaining = limit - 1 end
+return {1, remaining, 0, math.ceil(new_tat - now)}
+"""
+
+
+class RedisRateLimiter:
+    """GCRA evaluated atomically in Redis — one EVAL round trip, TTL always set."""
+
+    def __init__(self, redis):
+        self._redis = redis
+
+    def hit(self, key: str, limit: int, window: int) -> Optional[RateLimitResult]:
+        now_ms = int(time.time() * 1000)
+        try:
+            allowed, remaining, retry_ms, reset_ms = self._redis.eval(
+                GCRA_LUA, keys=[key], args=[str(now_ms), str(limit), str(window * 1000)]
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit script error: {e}")
+            return None
+        return RateLimitResult(bool(allowed), limit, int(remaining),
+                               int(retry_ms) / 1000, int(reset_ms) / 1000, window)
+
+
+class RateLimiter:
+    """Per-endpoint limiter: Redis GCRA when available, local GCRA otherwise."""
+
+    def __init__(self, limits: dict, redis=None):
+        self.limits = limits
+        self._local = LocalRateLimiter()
+        self._remote = RedisRateLimiter(redis) if redis is not None else None
+
+    def check(self, endpoint: str, identifier: str) -> RateLimitResult:
+        limit, window = self.limits.get(endpoint, self.limits["default"])
+        key = f"rl:{endpoint}:{identifier}"
+        if self._remote:
+            result = self._remote.hit(key, limit, window)
+            if result is not None:
+                return result
+        # No Redis (or Redis failed) — still protect this process
+        return self._local.hit(key, limit, window)
@@ -1,6 +1,8 @@
 """Premium SVG & Code block generator — informative, clean, responsive."""
 import os
 import sys
+import zlib
+from functools import lru_cache
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import FRAMEWORK_COLORS, LANGUAGE_COLORS, THEMES
@@ -17,6 +19,15 @@ def _fms(h: float) -> str:
     return f"{hrs}h {mins}m" if hrs > 0 else f"{mins}m"
 
 
+def _n(v: float) -> str:
+    """Shortest SVG number: one decimal, no trailing zero, no leading zero."""
+    s = "%.1f" % v
+    if s[-1] == "0":
+        s = s[:-2]
+    return s[1:] if s[0] == "0" and len(s) > 1 else s
+
+
+@lru_cache(maxsize=512)
 def _lum(c: str) -> float:
     c = c.lstrip("#")
     if len(c) < 6:
@@ -25,10 +36,12 @@ def _lum(c: str) -> float:
     return 0.2126 * r + 0.7152 * g + 0.0722 * b
 
 
+@lru_cache(maxsize=512)
 def _tc(bg: str) -> str:
     return "#ffffff" if _lum(bg) < 0.5 else "#1a1a2e"
 
 
+@lru_cache(maxsize=1024)
 def _e(t: str) -> str:
     return t.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
@@ -93,54 +106,121 @@ def generate_code_block(data: dict, langs_count: int = 10,
 #  SVG - PREMIUM DESIGN
 # ═══════════════════════════════════════════════════════════════════
 
-_clip_counter = 0
+# Precompiled fragments: theme colors and row geometry are baked into format
+# templates once, so a render only fills in per-row values.
+_LANG_ROW = {
+    "landscape": (
+        '<g transform="translate(0,{{0}})"><circle cx="{cx}" cy="-3" r="4" fill="{{1}}"/>'
+        '<text x="{name_col}" y="0" class="l">{{2}}</text>'
+        '<text x="{time_col}" y="0" class="tm">{{3}}</text>'
+        '<rect x="{bar_x}" y="-8" width="{bar_w}" height="12" rx="6" fill="{bar_bg}"/>'
+        '<rect x="{bar_x}" y="-8" width="{{4}}" height="12" rx="6" fill="{{1}}">'
+        '<animate attributeName="width" from="0" to="{{4}}" dur=".8s" fill="freeze" begin=".15s"/></rect>'
+        '<text x="{pct_x}" y="0" class="p">{{5}}%</text></g>'
+    ),
+    "portrait": (
+        '<g transform="translate(0,{{0}})"><circle cx="{cx}" cy="-3" r="4.5" fill="{{1}}"/>'
+        '<text x="{name_col}" y="0" class="l">{{2}}</text>'
+        '<rect x="{bar_x}" y="-8" width="{bar_w}" height="12" rx="6" fill="{bar_bg}"/>'
+        '<rect x="{bar_x}" y="-8" width="{{4}}" height="12" rx="6" fill="{{1}}">'
+        '<animate attributeName="width" from="0" to="{{4}}" dur=".8s" fill="freeze" begin=".15s"/></rect>'
+        '<text x="{pct_x}" y="-5" class="p">{{5}}%</text>'
+        '<text x="{pct_x}" y="8" class="tm">{{3}}</text></g>'
+    ),
+}
+
+_BADGE = (
+    '<rect x="{0}" y="{1}" width="{2}" height="26" rx="13" fill="{3}" opacity=".9" class="fw-badge"/>'
+    '<text x="{4}" y="{5}" text-anchor="middle" class="b" fill="{6}">{7}</text>'
+)
+
+_STRIPE_SEG = '<rect x="{0}" y="{1}" width="{2}" height="10" fill="{3}" clip-path="url(#{4})"/>'
+
+_FOOTER = '<text x="{0}" y="{1}" text-anchor="middle" class="f">CodeStats · github.com/volumeee</text>'
+
+
+@lru_cache(maxsize=None)
+def _theme_fragments(theme_name: str) -> dict:
+    """Per-theme templates for the pills, accent line and divider."""
+    theme = THEMES[theme_name]
+    return {
+        "pill": (
+            '<g class="stat-pill"><rect x="{0}" y="{1}" width="{2}" height="26" rx="13" '
+            f'fill="{theme["bar_bg"]}" opacity=".9" class="pill-bg"/>'
+            '<text x="{3}" y="{4}" class="pill">{5} {6}: <tspan class="pv">{7}</tspan></text></g>'
+        ),
+        "accent": (
+            '<defs><linearGradient id="g1" x1="0" y1="0" x2="1" y2="0">'
+            f'<stop offset="0%" stop-color="{theme["title"]}"/>'
+            f'<stop offset="100%" stop-color="{theme["title"]}" stop-opacity="0.1"/>'
+            '</linearGradient></defs>'
+            '<rect x="{0}" y="{1}" width="{2}" height="2" rx="1" fill="url(#g1)"/>'
+        ),
+        "divider": (
+            '<line x1="{0}" y1="{1}" x2="{0}" y2="{2}" '
+            f'stroke="{theme["border"]}" stroke-width="1" opacity=".3"/>'
+        ),
+    }
+
+
+@lru_cache(maxsize=256)
+def _lang_row_template(theme_name: str, layout: str, vw: int) -> tuple:
+    """Language row template with geometry for this width baked in. Returns (template, bar_w)."""
+    pad = 24
+    if layout == "portrait":
+        bar_x = pad + 90
+        # Reserve space for "31.8% 57h 37m" = ~100px
+        bar_w = max(60, vw - pad - bar_x - 100 - 8)
+        pct_x = bar_x + bar_w + 8
+    else:
+        bar_x = pad + 155
+        bar_w = max(60, int(vw * 0.62) - bar_x - 60)
+        pct_x = bar_x + bar_w + 10
+    tpl = _LANG_ROW[layout].format(
+        cx=pad + 5, name_col=pad + 14, time_col=pad + 95, bar_x=bar_x, bar_w=bar_w,
+        pct_x=pct_x, bar_bg=THEMES[theme_name]["bar_bg"],
+    )
+    return tpl, bar_w
+
+
+@lru_cache(maxsize=512)
+def _lang_label(lang: str) -> tuple:
+    """(color, escaped name) for a language."""
+    return LANGUAGE_COLORS.get(lang, "#8b8b8b"), _e(lang)
+
+
+@lru_cache(maxsize=512)
+def _badge(fw: str, extra: int) -> tuple:
+    """(width, width text, bg color, text color, escaped label) for a framework badge."""
+    bc = FRAMEWORK_COLORS.get(fw, "#555555")
+    tw = len(fw) * 7.5 + extra
+    return tw, f"{tw:.0f}", bc, _tc(bc), _e(fw)
+
 
-def _lang_stripe(langs: dict, total: float, vw: int, y: int, pad: int) -> str:
+def _lang_stripe(out: list, langs: dict, total: float, vw: int, y: int, pad: int):
     """Combined GitHub-style language proportion bar with proper unified rounding."""
-    global _clip_counter
-    _clip_counter += 1
     bar_w = vw - pad * 2
-    bar_h = 10
-    radius = 5
     x = pad
-    parts = []
     items = list(langs.items())
 
-    # Use clipPath for clean unified rounded bar (unique ID per invocation)
-    clip_id = f"sc{_clip_counter}"
-    parts.append(
+    # Use clipPath for clean unified rounded bar. The ID is derived from the content so
+    # identical cards render byte-identical (stable ETag) while different cards inlined
+    # in one page still get distinct IDs.
+    clip_id = f"sc{zlib.crc32(repr((items, vw, y)).encode()):x}"
+    out.append(
         f'<defs><clipPath id="{clip_id}">'
-        f'<rect x="{pad}" y="{y}" width="{bar_w}" height="{bar_h}" rx="{radius}"/>'
+        f'<rect x="{pad}" y="{y}" width="{bar_w}" height="10" rx="5"/>'
         f'</clipPath></defs>'
     )
 
-    for i, (lang, hrs) in enumerate(items):
+    for lang, hrs in items:
         w = max(2, hrs / total * bar_w)
-        col = LANGUAGE_COLORS.get(lang, "#8b8b8b")
-        parts.append(
-            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{bar_h}" '
-            f'fill="{col}" clip-path="url(#{clip_id})"/>'
-        )
+        out.append(_STRIPE_SEG.format(_n(x), y, _n(w), _lang_label(lang)[0], clip_id))
         x += w
-    return "\n  ".join(parts)
 
 
-def _stat_pill(x: int, y: int, icon: str, label: str, value: str, theme: dict) -> str:
-    """Rounded stat indicator pill with consistent sizing."""
-    text = f"{label}: {value}"
-    w = max(len(text) * 7 + 28, 90)
-    return (
-        f'<g class="stat-pill">'
-        f'<rect x="{x}" y="{y}" width="{w:.0f}" height="26" rx="13" '
-        f'fill="{theme["bar_bg"]}" opacity="0.9" class="pill-bg"/>'
-        f'<text x="{x + 14}" y="{y + 17}" class="pill">'
-        f'{icon} {_e(label)}: <tspan class="pv">{_e(value)}</tspan></text>'
-        f'</g>'
-    )
-
-
-def _build_pills_row(data: dict, theme: dict, pad: int, y: int, vw: int) -> tuple:
-    """Build stat pills that adapt to available width. Returns (svg_parts, new_y)."""
+def _build_pills_row(out: list, data: dict, frags: dict, pad: int, y: int, vw: int) -> int:
+    """Build stat pills that adapt to available width. Returns new y."""
     total_hours = data.get("total_hours", 0)
     repo_count = data.get("repo_count", 0)
     period = data.get("period_days", 365)
@@ -166,45 +246,30 @@ def _build_pills_row(data: dict, theme: dict, pad: int, y: int, vw: int) -> tupl
         (m_icon, "Mode", busiest),
     ]
 
-    # Calculate pill widths
-    pill_data = []
-    for icon, label, value in pills:
-        text = f"{label}: {value}"
-        w = max(len(text) * 7 + 28, 90)
-        pill_data.append((icon, label, value, w))
-
-    available_w = vw - pad * 2
-    parts = []
+    tpl = frags["pill"]
+    right = vw - pad
     cx = pad
     cy = y
     gap = 8
 
-    for icon, label, value, w in pill_data:
-        if cx + w > pad + available_w and cx > pad:
+    for icon, label, value in pills:
+        w = max((len(label) + len(value) + 2) * 7 + 28, 90)
+        if cx + w > right and cx > pad:
             # Wrap to next row
             cx = pad
             cy += 32
-        parts.append(_stat_pill(int(cx), cy, icon, label, value, theme))
+        x = int(cx)
+        out.append(tpl.format(x, cy, w, x + 14, cy + 17, icon, _e(label), _e(value)))
         cx += w + gap
 
-    return parts, cy + 32
+    return cy + 32
 
 
-def _gradient_accent(theme: dict, pad: int, y: int, vw: int) -> str:
-    """Gradient accent separator line."""
-    return (
-        f'<defs><linearGradient id="g1" x1="0" y1="0" x2="1" y2="0">'
-        f'<stop offset="0%" stop-color="{theme["title"]}"/>'
-        f'<stop offset="100%" stop-color="{theme["title"]}" stop-opacity="0.1"/>'
-        f'</linearGradient></defs>'
-        f'<rect x="{pad}" y="{y}" width="{vw - pad * 2}" height="2" rx="1" fill="url(#g1)"/>'
-    )
-
-
-def _build_portrait(data: dict, theme: dict, opts: dict) -> str:
+def _build_portrait(out: list, data: dict, theme_name: str, opts: dict) -> tuple:
     username = data.get("username", "user")
     langs = data.get("langs", {})
     frameworks = data.get("frameworks", {})
+    frags = _theme_fragments(theme_name)
 
     vw = opts.get("width", 480)
     lc = opts.get("langs_count", 8)
@@ -219,98 +284,64 @@ def _build_portrait(data: dict, theme: dict, opts: dict) -> str:
 
     pad = 24
     y = pad
-    parts = []
 
     # ── Header ──
     if s_title:
-        parts.append(f'<text x="{pad}" y="{y + 18}" class="t">📊 {_e(username)}\'s Coding Stats</text>')
+        out.append(f'<text x="{pad}" y="{y + 18}" class="t">📊 {_e(username)}\'s Coding Stats</text>')
         y += 34
 
-        pill_parts, y = _build_pills_row(data, theme, pad, y, vw)
-        parts.extend(pill_parts)
+        y = _build_pills_row(out, data, frags, pad, y, vw)
         y += 6
 
-        parts.append(_gradient_accent(theme, pad, y, vw))
+        out.append(frags["accent"].format(pad, y, vw - pad * 2))
         y += 14
 
     # ── Combined language bar ──
     if s_lang and top:
-        parts.append(_lang_stripe(top, tl, vw, y, pad))
+        _lang_stripe(out, top, tl, vw, y, pad)
         y += 20
 
         # Language section header
-        parts.append(f'<text x="{pad}" y="{y + 14}" class="sec">💻 Languages</text>')
+        out.append(f'<text x="{pad}" y="{y + 14}" class="sec">💻 Languages</text>')
         y += 28
 
-        # Calculate column positions for portrait — compact layout
-        name_col = pad + 14  # After color dot
-        bar_x = pad + 90    # Bar start
-        right_edge = vw - pad
-        # Reserve space for "31.8% 57h 37m" = ~100px
-        info_width = 100
-        bar_w = right_edge - bar_x - info_width - 8
-        if bar_w < 60:
-            bar_w = 60
-        pct_x = bar_x + bar_w + 8
-
-        bar_h = 12
-        row_h = 30
-
+        row, bar_w = _lang_row_template(theme_name, "portrait", vw)
         for lang, hrs in top.items():
             pct = hrs / tl * 100
-            bw = max(3, pct / 100 * bar_w)
-            col = LANGUAGE_COLORS.get(lang, "#8b8b8b")
-            parts.append(
-                f'<g transform="translate(0,{y})">'
-                f'<circle cx="{pad + 5}" cy="-3" r="4.5" fill="{col}"/>'
-                f'<text x="{name_col}" y="0" class="l">{_e(lang)}</text>'
-                f'<rect x="{bar_x}" y="-8" width="{bar_w}" height="{bar_h}" rx="{bar_h // 2}" fill="{theme["bar_bg"]}"/>'
-                f'<rect x="{bar_x}" y="-8" width="{bw:.1f}" height="{bar_h}" rx="{bar_h // 2}" fill="{col}">'
-                f'<animate attributeName="width" from="0" to="{bw:.1f}" dur="0.8s" fill="freeze" begin="0.15s"/></rect>'
-                f'<text x="{pct_x}" y="-5" class="p">{pct:.1f}%</text>'
-                f'<text x="{pct_x}" y="8" class="tm">{_fms(hrs)}</text>'
-                f'</g>'
-            )
-            y += row_h
+            bw = _n(max(3, pct / 100 * bar_w))
+            col, label = _lang_label(lang)
+            out.append(row.format(y, col, label, _fms(hrs), bw, f"{pct:.1f}"))
+            y += 30
 
     # ── Frameworks ──
     if s_fw and fws:
         y += 14
-        parts.append(f'<text x="{pad}" y="{y + 14}" class="sec">⚡ Frameworks &amp; Tools</text>')
+        out.append(f'<text x="{pad}" y="{y + 14}" class="sec">⚡ Frameworks &amp; Tools</text>')
         y += 30
         fx = pad
         for fw in fws:
-            bc = FRAMEWORK_COLORS.get(fw, "#555555")
-            tc = _tc(bc)
-            tw = len(fw) * 7.5 + 22
+            tw, tw_s, bc, tc, label = _badge(fw, 22)
             if fx + tw > vw - pad:
                 fx = pad
                 y += 30
-            parts.append(
-                f'<rect x="{fx}" y="{y - 16}" width="{tw:.0f}" height="26" rx="13" '
-                f'fill="{bc}" opacity="0.9" class="fw-badge"/>'
-                f'<text x="{fx + tw / 2:.0f}" y="{y + 1}" text-anchor="middle" '
-                f'class="b" fill="{tc}">{_e(fw)}</text>'
-            )
+            out.append(_BADGE.format(fx, y - 16, tw_s, bc, f"{fx + tw / 2:.0f}", y + 1, tc, label))
             fx += tw + 8
         y += 18
 
     # ── Footer ──
     if s_footer:
         y += 16
-        parts.append(
-            f'<text x="{vw // 2}" y="{y}" text-anchor="middle" class="f">'
-            f'CodeStats · github.com/volumeee</text>'
-        )
+        out.append(_FOOTER.format(vw // 2, y))
         y += 10
 
-    return _svg(vw, y + 12, theme, "\n  ".join(parts))
+    return vw, y + 12
 
 
-def _build_landscape(data: dict, theme: dict, opts: dict) -> str:
+def _build_landscape(out: list, data: dict, theme_name: str, opts: dict) -> tuple:
     username = data.get("username", "user")
     langs = data.get("langs", {})
     frameworks = data.get("frameworks", {})
+    frags = _theme_fragments(theme_name)
 
     vw = opts.get("width", 720)
     lc = opts.get("langs_count", 8)
@@ -324,95 +355,60 @@ def _build_landscape(data: dict, theme: dict, opts: dict) -> str:
     fws = list(frameworks.keys()) if s_fw else []
 
     pad = 24
-    row_h = 28
-    header_h = 0
 
     # ── Layout math ──
     # Left side: languages | Right side: frameworks
     # Divider at ~62% of width
     divider_x = int(vw * 0.62)
 
-    # Column positions for language rows (left side)
-    name_col = pad + 14  # After color dot
-    time_col = pad + 95  # Time column
-    bar_x = pad + 155    # Bar start
-    bar_w = divider_x - bar_x - 60  # Bar width (leave room for %)
-    if bar_w < 60:
-        bar_w = 60
-    pct_x = bar_x + bar_w + 10  # Percentage text
-
-    bar_h = 12
-
-    parts = []
-
     # ── Header ──
     if s_title:
-        parts.append(f'<text x="{pad}" y="24" class="t">📊 {_e(username)}\'s Coding Stats</text>')
+        out.append(f'<text x="{pad}" y="24" class="t">📊 {_e(username)}\'s Coding Stats</text>')
 
-        pill_parts, pill_end_y = _build_pills_row(data, theme, pad, 36, vw)
-        parts.extend(pill_parts)
+        pill_end_y = _build_pills_row(out, data, frags, pad, 36, vw)
 
         accent_y = pill_end_y + 4
-        parts.append(_gradient_accent(theme, pad, accent_y, vw))
+        out.append(frags["accent"].format(pad, accent_y, vw - pad * 2))
         header_h = accent_y + 10
     else:
         header_h = 10
 
     # ── Combined language stripe ──
     if s_lang and top:
-        parts.append(_lang_stripe(top, tl, vw, header_h + 4, pad))
+        _lang_stripe(out, top, tl, vw, header_h + 4, pad)
         header_h += 20
 
     # ── Languages (left) ──
     y = header_h + 16
     if s_lang and top:
-        parts.append(f'<text x="{pad}" y="{y}" class="sec">💻 Languages</text>')
+        out.append(f'<text x="{pad}" y="{y}" class="sec">💻 Languages</text>')
         y += 20
+        row, bar_w = _lang_row_template(theme_name, "landscape", vw)
         for lang, hrs in top.items():
             pct = hrs / tl * 100
-            bw = max(3, pct / 100 * bar_w)
-            col = LANGUAGE_COLORS.get(lang, "#8b8b8b")
-            parts.append(
-                f'<g transform="translate(0,{y})">'
-                f'<circle cx="{pad + 5}" cy="-3" r="4" fill="{col}"/>'
-                f'<text x="{name_col}" y="0" class="l">{_e(lang)}</text>'
-                f'<text x="{time_col}" y="0" class="tm">{_fms(hrs)}</text>'
-                f'<rect x="{bar_x}" y="-8" width="{bar_w}" height="{bar_h}" rx="{bar_h // 2}" fill="{theme["bar_bg"]}"/>'
-                f'<rect x="{bar_x}" y="-8" width="{bw:.1f}" height="{bar_h}" rx="{bar_h // 2}" fill="{col}">'
-                f'<animate attributeName="width" from="0" to="{bw:.1f}" dur="0.8s" fill="freeze" begin="0.15s"/></rect>'
-                f'<text x="{pct_x}" y="0" class="p">{pct:.1f}%</text>'
-                f'</g>'
-            )
-            y += row_h
+            bw = _n(max(3, pct / 100 * bar_w))
+            col, label = _lang_label(lang)
+            out.append(row.format(y, col, label, _fms(hrs), bw, f"{pct:.1f}"))
+            y += 28
     max_y = y
 
     # ── Divider ──
-    parts.append(
-        f'<line x1="{divider_x}" y1="{header_h + 6}" x2="{divider_x}" y2="{max_y - 8}" '
-        f'stroke="{theme["border"]}" stroke-width="1" opacity="0.3"/>'
-    )
+    out.append(frags["divider"].format(divider_x, header_h + 6, max_y - 8))
 
     # ── Frameworks (right) ──
     rx = divider_x + 18
     if s_fw and fws:
         fy = header_h + 16
-        parts.append(f'<text x="{rx}" y="{fy}" class="sec">⚡ Frameworks &amp; Tools</text>')
+        out.append(f'<text x="{rx}" y="{fy}" class="sec">⚡ Frameworks &amp; Tools</text>')
         fy += 24
         fx = rx
         max_fw_x = vw - pad
         for fw in fws:
-            bc = FRAMEWORK_COLORS.get(fw, "#555555")
-            tc = _tc(bc)
-            tw = len(fw) * 7.5 + 20
+            tw, tw_s, bc, tc, label = _badge(fw, 20)
             if fx + tw > max_fw_x:
                 fx = rx
                 fy += 30
-            parts.append(
-                f'<rect x="{fx}" y="{fy - 15}" width="{tw:.0f}" height="26" rx="13" '
-                f'fill="{bc}" opacity="0.9" class="fw-badge"/>'
-                f'<text x="{fx + tw / 2:.0f}" y="{fy + 2}" text-anchor="middle" '
-                f'class="b" fill="{tc}">{_e(fw)}</text>'
-            )
+            out.append(_BADGE.format(fx, fy - 15, tw_s, bc, f"{fx + tw / 2:.0f}", fy + 2, tc, label))
             fx += tw + 8
         max_y = max(max_y, fy + 22)
 
@@ -420,77 +416,67 @@ def _build_landscape(data: dict, theme: dict, opts: dict) -> str:
     fy = max_y + 10
     if s_footer:
         fy += 4
-        parts.append(
-            f'<text x="{vw // 2}" y="{fy}" text-anchor="middle" class="f">'
-            f'CodeStats · github.com/volumeee</text>'
-        )
+        out.append(_FOOTER.format(vw // 2, fy))
         fy += 12
 
-    return _svg(vw, fy + 6, theme, "\n  ".join(parts))
+    return vw, fy + 6
 
 
 # ─── SVG WRAPPER ─────────────────────────────────────────────────
-def _svg(vw: int, vh: int, theme: dict, body: str) -> str:
-    return f"""<svg xmlns="http://www.w3.org/2000/svg" width="100%" viewBox="0 0 {vw} {vh}"
-     preserveAspectRatio="xMidYMin meet">
-  <defs><style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&amp;display=swap');
-    
-    @keyframes pulseGlow {{
-      0% {{ filter: drop-shadow(0 0 2px {theme['title']}); opacity: 0.9; }}
-      50% {{ filter: drop-shadow(0 0 8px {theme['title']}); opacity: 1; }}
-      100% {{ filter: drop-shadow(0 0 2px {theme['title']}); opacity: 0.9; }}
-    }}
-    
-    @keyframes slideUp {{
-      from {{ transform: translateY(12px); opacity: 0; }}
-      to {{ transform: translateY(0); opacity: 1; }}
-    }}
-    
-    .card-bg {{
-      fill: {theme['bg']};
-      stroke: {theme['border']};
-      stroke-width: 1.5;
-    }}
-    
-    .t {{ font: 700 16px 'Inter', 'Segoe UI', Ubuntu, sans-serif; fill: {theme['title']}; animation: pulseGlow 3s infinite; }}
-    .s {{ font: 400 11px 'Inter', 'Segoe UI', Ubuntu, sans-serif; fill: {theme['muted']}; }}
-    .sec {{ font: 600 11.5px 'Inter', 'Segoe UI', Ubuntu, sans-serif; fill: {theme['title']}; letter-spacing: 0.3px; }}
-    .l {{ font: 500 11px 'Inter', 'Segoe UI', Ubuntu, sans-serif; fill: {theme['text']}; }}
-    .tm {{ font: 400 10.5px 'Inter', 'Segoe UI', monospace; fill: {theme['muted']}; }}
-    .p {{ font: 600 10px 'Inter', 'Segoe UI', sans-serif; fill: {theme['muted']}; }}
-    .b {{ font: 600 10px 'Inter', 'Segoe UI', sans-serif; }}
-    .f {{ font: 400 9.5px 'Inter', 'Segoe UI', sans-serif; fill: {theme['muted']}; opacity: 0.5; }}
-    .pill {{ font: 500 9.5px 'Inter', 'Segoe UI', sans-serif; fill: {theme['muted']}; cursor: pointer; }}
-    .pv {{ fill: {theme['text']}; font-weight: 700; }}
-    
-    .stat-pill {{ transition: all 0.3s ease; transform-origin: center; }}
-    .stat-pill:hover {{ transform: translateY(-2px); filter: drop-shadow(0 4px 6px rgba(0,0,0,0.3)); }}
-    .pill-bg {{ transition: fill 0.3s ease; }}
-    .stat-pill:hover .pill-bg {{ filter: brightness(1.2); }}
-    
-    g {{ animation: slideUp 0.8s cubic-bezier(0.25, 1, 0.5, 1) both; }}
-    g:nth-child(1) {{ animation-delay: 0.05s; }}
-    g:nth-child(2) {{ animation-delay: 0.1s; }}
-    g:nth-child(3) {{ animation-delay: 0.15s; }}
-    g:nth-child(4) {{ animation-delay: 0.2s; }}
-    g:nth-child(5) {{ animation-delay: 0.25s; }}
-    g:nth-child(6) {{ animation-delay: 0.3s; }}
-    g:nth-child(7) {{ animation-delay: 0.35s; }}
-    g:nth-child(8) {{ animation-delay: 0.4s; }}
-    g:nth-child(n+9) {{ animation-delay: 0.45s; }}
-    
-    rect.fw-badge {{
-       transition: all 0.3s ease;
-    }}
-    rect.fw-badge:hover {{
-       filter: brightness(1.2);
-       transform: scale(1.05);
-    }}
-  </style></defs>
-  <rect width="{vw}" height="{vh}" rx="12" class="card-bg"/>
-  {body}
-</svg>"""
+_FONT = "'Inter','Segoe UI',Ubuntu,sans-serif"
+_FONT_MONO = "'Inter','Segoe UI',monospace"
+_FONT_UI = "'Inter','Segoe UI',sans-serif"
+
+
+def _build_style(theme: dict) -> str:
+    """Minified per-theme <defs><style> prelude (fonts, keyframes, classes)."""
+    t, m, x = theme["title"], theme["muted"], theme["text"]
+    delays = "".join(f"g:nth-child({i}){{animation-delay:{f'{i * 0.05:g}'[1:]}s}}" for i in range(1, 9))
+    return (
+        "<defs><style>"
+        "@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&amp;display=swap');"
+        f"@keyframes pulseGlow{{0%{{filter:drop-shadow(0 0 2px {t});opacity:.9}}"
+        f"50%{{filter:drop-shadow(0 0 8px {t});opacity:1}}"
+        f"100%{{filter:drop-shadow(0 0 2px {t});opacity:.9}}}}"
+        "@keyframes slideUp{from{transform:translateY(12px);opacity:0}to{transform:translateY(0);opacity:1}}"
+        f".card-bg{{fill:{theme['bg']};stroke:{theme['border']};stroke-width:1.5}}"
+        f".t{{font:700 16px {_FONT};fill:{t};animation:pulseGlow 3s infinite}}"
+        f".s{{font:400 11px {_FONT};fill:{m}}}"
+        f".sec{{font:600 11.5px {_FONT};fill:{t};letter-spacing:.3px}}"
+        f".l{{font:500 11px {_FONT};fill:{x}}}"
+        f".tm{{font:400 10.5px {_FONT_MONO};fill:{m}}}"
+        f".p{{font:600 10px {_FONT_UI};fill:{m}}}"
+        f".b{{font:600 10px {_FONT_UI}}}"
+        f".f{{font:400 9.5px {_FONT_UI};fill:{m};opacity:.5}}"
+        f".pill{{font:500 9.5px {_FONT_UI};fill:{m};cursor:pointer}}"
+        f".pv{{fill:{x};font-weight:700}}"
+        ".stat-pill{transition:all .3s ease;transform-origin:center}"
+        ".stat-pill:hover{transform:translateY(-2px);filter:drop-shadow(0 4px 6px rgba(0,0,0,.3))}"
+        ".pill-bg{transition:fill .3s ease}"
+        ".stat-pill:hover .pill-bg{filter:brightness(1.2)}"
+        "g{animation:slideUp .8s cubic-bezier(.25,1,.5,1) both}"
+        f"{delays}g:nth-child(n+9){{animation-delay:.45s}}"
+        "rect.fw-badge{transition:all .3s ease}"
+        "rect.fw-badge:hover{filter:brightness(1.2);transform:scale(1.05)}"
+        "</style></defs>"
+    )
+
+
+@lru_cache(maxsize=None)
+def _style(theme_name: str) -> str:
+    """Prelude for a theme, built on its first render and reused after."""
+    return _build_style(THEMES[theme_name])
+
+
+def _svg(out: list, vw: int, vh: int, style: str) -> str:
+    """Fill the reserved head slot of the buffer and join it once."""
+    out[0] = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="100%" viewBox="0 0 {vw} {vh}" '
+        f'preserveAspectRatio="xMidYMin meet">{style}'
+        f'<rect width="{vw}" height="{vh}" rx="12" class="card-bg"/>'
+    )
+    out.append("</svg>")
+    return "".join(out)
 
 
 # ─── PUBLIC API ──────────────────────────────────────────────────
@@ -499,16 +485,19 @@ def generate_svg(data: dict, theme_name: str = "dark",
                  layout: str = "landscape", width: int = 0,
                  show_title: bool = True, show_footer: bool = True,
                  show_languages: bool = True) -> str:
-    theme = THEMES.get(theme_name, THEMES["dark"])
+    if theme_name not in THEMES:
+        theme_name = "dark"
     opts = {"langs_count": langs_count, "show_fw": show_frameworks,
             "show_title": show_title, "show_footer": show_footer,
             "show_langs": show_languages}
+    out = [""]  # slot 0 is the <svg> head, filled once the height is known
     if layout == "portrait":
         opts["width"] = width if width > 0 else 480
-        return _build_portrait(data, theme, opts)
+        vw, vh = _build_portrait(out, data, theme_name, opts)
     else:
         opts["width"] = width if width > 0 else 720
-        return _build_landscape(data, theme, opts)
+        vw, vh = _build_landscape(out, data, theme_name, opts)
+    return _svg(out, vw, vh, _style(theme_name))
 
 
 def generate_error_svg(message: str, theme_name: str = "dark") -> str:
@@ -519,3 +508,14 @@ def generate_error_svg(message: str, theme_name: str = "dark") -> str:
   <text x="247" y="35" text-anchor="middle" style="font:600 14px 'Inter','Segoe UI',sans-serif;fill:{theme['title']}">⚠️ CodeStats Error</text>
   <text x="247" y="58" text-anchor="middle" style="font:400 11px 'Inter','Segoe UI',sans-serif;fill:{theme['muted']}">{_e(message)}</text>
 </svg>"""
+
+
+def generate_pending_svg(theme_name: str = "dark") -> str:
+    """Placeholder served while a background scan computes the real card."""
+    theme = THEMES.get(theme_name, THEMES["dark"])
+    return f"""<svg xmlns="http://www.w3.org/2000/svg" width="100%" viewBox="0 0 495 80"
+     preserveAspectRatio="xMidYMin meet">
+  <rect width="495" height="80" rx="12" fill="{theme['bg']}" stroke="{theme['border']}" stroke-width="1"/>
+  <text x="247" y="35" text-anchor="middle" style="font:600 14px 'Inter','Segoe UI',sans-serif;fill:{theme['title']}">⏳ Computing your coding stats…</text>
+  <text x="247" y="58" text-anchor="middle" style="font:400 11px 'Inter','Segoe UI',sans-serif;fill:{theme['muted']}">Refresh in a few seconds.</text>
+</svg>"""
@@ -0,0 +1,111 @@
+"""Per-request phase timing (Server-Timing header) and an opt-in sampling profiler."""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+_current: ContextVar[Optional["RequestTiming"]] = ContextVar("request_timing", default=None)
+
+_SERVICES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class RequestTiming:
+    """Accumulates phase durations for one request.
+
+    Tasks spawned by the request inherit the same object, so phases that run
+    concurrently (e.g. commit pagination across repos) add up their durations.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}
+        self.upstream = 0
+        self.profiling = False  # ?profile=1: scans run inside the request, even in job mode
+
+    def add(self, name: str, seconds: float):
+        dur, count = self.phases.get(name, (0.0, 0))
+        self.phases[name] = (dur + seconds, count + 1)
+
+    def header(self) -> str:
+        parts = [f'{name};dur={dur * 1000:.1f};desc="x{count}"' for name, (dur, count) in self.phases.items()]
+        parts.append(f'upstream;desc="{self.upstream} calls"')
+        parts.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def start_request() -> RequestTiming:
+    timing = RequestTiming()
+    _current.set(timing)
+    return timing
+
+
+def current() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+def is_profiling() -> bool:
+    """True inside a ?profile=1 request."""
+    timing = _current.get()
+    return timing is not None and timing.profiling
+
+
+@contextmanager
+def phase(name: str):
+    """Time a block into the current request's Server-Timing (no-op outside a request)."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start)
+
+
+def count_upstream():
+    timing = _current.get()
+    if timing is not None:
+        timing.upstream += 1
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval into folded stacks.
+
+    Output is the "frame;frame;frame count" format read by flamegraph.pl,
+    speedscope and inferno. Stacks without any frame from api/services are
+    folded into "(idle)" — on the event loop thread that is time spent
+    waiting on the network.
+    """
+
+    def __init__(self, thread_id: int = None, interval: float = 0.002):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            ours = False
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                ours = ours or code.co_filename.startswith(_SERVICES_DIR)
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack)) if ours else "(idle)"] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="codestats-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return "\n".join(f"{stack} {n}" for stack, n in self.samples.most_common()) + "\n"
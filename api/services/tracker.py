@@ -1,9 +1,20 @@
 """Core tracker: orchestrates repo processing, time calc & framework detection."""
 import asyncio
 import logging
+import math
 import time as time_mod
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from config import MAX_WORKERS, STATS_COMMIT_THRESHOLD, STATS_HOURS_PER_COMMIT, TRACKER_DEADLINE
+from services.activity_store import VALID, activity_store, sha_key
+from services.identity import Identity, noreply_login, resolver
+from services.languages import accounting
+from services.metrics import TRACKER_DURATION, TRACKER_REPOS
+from services.pool import run_prioritized
+from services.provider import ListingIncomplete
+from services.timing import phase
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +22,27 @@ logger = logging.getLogger(__name__)
 SESSION_GAP = timedelta(hours=2)
 MIN_SESSION = 15  # minutes — base time for isolated commits
 MAX_SESSION = 4   # hours — cap per single session to avoid unrealistic gaps
+WEEK = timedelta(days=7)
+DEFAULT_ACTIVE_HOURS = 56  # hours/week someone commits in, when no punch card is available
+
+
+def _hour_bucket(h: int) -> str:
+    if 0 <= h < 6:
+        return "night"
+    if 6 <= h < 12:
+        return "morning"
+    if 12 <= h < 18:
+        return "daytime"
+    return "evening"
+
+
+def commit_time(commit: dict) -> Optional[datetime]:
+    try:
+        return datetime.strptime(
+            commit["commit"]["author"]["date"], "%Y-%m-%dT%H:%M:%SZ"
+        ).replace(tzinfo=timezone.utc)
+    except (KeyError, ValueError, TypeError):
+        return None
 
 
 def calculate_coding_time(commits: list) -> float:
@@ -18,30 +50,14 @@ def calculate_coding_time(commits: list) -> float:
     if not commits:
         return 0.0, {"night": 0, "morning": 0, "daytime": 0, "evening": 0}
 
-    times = []
-    for c in commits:
-        try:
-            dt = datetime.strptime(
-                c["commit"]["author"]["date"], "%Y-%m-%dT%H:%M:%SZ"
-            ).replace(tzinfo=timezone.utc)
-            times.append(dt)
-        except (KeyError, ValueError, TypeError):
-            continue
+    times = [t for t in map(commit_time, commits) if t is not None]
 
     if not times:
         return 0.0, {"night": 0, "morning": 0, "daytime": 0, "evening": 0}
 
     if len(times) == 1:
         hours_dist = {"night": 0, "morning": 0, "daytime": 0, "evening": 0}
-        h = times[0].hour
-        if 0 <= h < 6:
-            hours_dist["night"] = 1
-        elif 6 <= h < 12:
-            hours_dist["morning"] = 1
-        elif 12 <= h < 18:
-            hours_dist["daytime"] = 1
-        else:
-            hours_dist["evening"] = 1
+        hours_dist[_hour_bucket(times[0].hour)] = 1
         return MIN_SESSION / 60, hours_dist
 
     times.sort()
@@ -60,19 +76,55 @@ def calculate_coding_time(commits: list) -> float:
 
     hours_dist = {"night": 0, "morning": 0, "daytime": 0, "evening": 0}
     for t in times:
-        h = t.hour
-        if 0 <= h < 6:
-            hours_dist["night"] += 1
-        elif 6 <= h < 12:
-            hours_dist["morning"] += 1
-        elif 12 <= h < 18:
-            hours_dist["daytime"] += 1
-        else:
-            hours_dist["evening"] += 1
+        hours_dist[_hour_bucket(t.hour)] += 1
 
     return total_secs / 3600, hours_dist
 
 
+def fold_commits(repo_state: dict, commits: list) -> int:
+    """Extend a repo's stored hours with commits newer than its last one.
+
+    Appending in time order gives the same sessions calculate_coding_time would
+    find over the full history: a gap under SESSION_GAP adds the gap, anything
+    else opens a new MIN_SESSION session. Commits at or before the stored last
+    commit are already counted (or out of order) and are skipped, which also
+    makes replays of the same delivery harmless. Returns the number folded in.
+    """
+    folded = 0
+    last = repo_state.get("last")
+    for t in sorted(t for t in map(commit_time, commits) if t is not None):
+        ts = t.timestamp()
+        if last is not None and ts <= last:
+            continue
+        if last is not None and ts - last < SESSION_GAP.total_seconds():
+            repo_state["hours"] += (ts - last) / 3600
+        else:
+            repo_state["hours"] += MIN_SESSION / 60
+        repo_state["hours_dist"][_hour_bucket(t.hour)] += 1
+        last = ts
+        folded += 1
+    repo_state["last"] = last
+    return folded
+
+
+def dedupe_commits(commits: list) -> list:
+    """Drop repeated SHAs (pages fetched concurrently can overlap when new commits
+    land mid-scan). Seen SHAs are kept as 20-byte digests rather than hex strings."""
+    seen = set()
+    unique = []
+    for c in commits:
+        try:
+            digest = bytes.fromhex(c["sha"])
+        except (KeyError, TypeError, ValueError):
+            digest = None
+        if not digest:
+            unique.append(c)
+        elif digest not in seen:
+            seen.add(digest)
+            unique.append(c)
+    return unique
+
+
 def is_valid_commit(commit: dict) -> bool:
     """Filter out merge/bot/auto commits."""
     try:
@@ -88,74 +140,241 @@ def is_valid_commit(commit: dict) -> bool:
     return not any(p in msg for p in skip)
 
 
-async def process_single_repo(service, username: str, repo: dict,
-                         since_iso: str, until_iso: str, fw_maps: dict, ignore_langs: list, sem: asyncio.Semaphore) -> dict:
-    """Process one repository: languages, commits, frameworks, throttled by semaphore."""
-    async with sem:
-        name = repo["name"]
-        owner = repo.get("owner", {}).get("login", username)
-    result = {"name": name, "langs": {}, "frameworks": set(), "hours": 0.0, "hours_dist": {"night": 0, "morning": 0, "daytime": 0, "evening": 0}}
+def stats_activity(contributors: list, punch_card: list, logins: set,
+                   since: datetime, until: datetime) -> dict:
+    """Weekly commit counts for `logins` from /stats/contributors, prorated to the period.
+
+    The punch card (repo-wide, all contributors, commit-local hours) supplies the
+    hours_dist shares and the effective number of active hours per week — the
+    perplexity of its 168 day/hour slots.
+    """
+    weekly = []
+    for entry in contributors or []:
+        login = ((entry or {}).get("author") or {}).get("login", "").lower()
+        if login not in logins:
+            continue
+        for week in entry.get("weeks", []):
+            if not week.get("c"):
+                continue
+            start = datetime.fromtimestamp(week["w"], timezone.utc)
+            overlap = min(start + WEEK, until) - max(start, since)
+            if overlap.total_seconds() > 0:
+                weekly.append(week["c"] * min(1.0, overlap / WEEK))
+
+    commits = sum(weekly)
+    hours_dist = {"night": 0, "morning": 0, "daytime": 0, "evening": 0}
+    shares = {k: 0 for k in hours_dist}
+    slots = [count for _day, _hour, count in punch_card or [] if count > 0]
+    for _day, hour, count in punch_card or []:
+        shares[_hour_bucket(hour)] += count
+    punched = sum(slots)
+    active_hours = DEFAULT_ACTIVE_HOURS
+    if punched:
+        for k in hours_dist:
+            hours_dist[k] = round(commits * shares[k] / punched)
+        active_hours = math.exp(-sum(n / punched * math.log(n / punched) for n in slots))
+    return {"weekly": weekly, "commits": commits, "hours_dist": hours_dist, "active_hours": active_hours}
+
+
+def estimate_week_hours(commits: float, hours_per_commit: float, active_hours: float) -> float:
+    """Coding hours for one week from its commit count alone.
+
+    Sparse weeks use the hours-per-commit calibrated on exactly scanned repos. Once
+    commits spread evenly over the week's active hours would sit closer together
+    than SESSION_GAP, calculate_coding_time() counts nearly all of that time, so the
+    evenly-spaced figure takes over. The result is clamped to the session model's
+    hard bounds: MIN_SESSION (one burst) to (c - 1) * SESSION_GAP + MIN_SESSION.
+
+    Error against exact scans of the synthetic benchmark fixtures: within ±5% for
+    most repos over the threshold; between -70% and +80% for repos whose mean gap
+    is close to SESSION_GAP, where a count alone cannot tell clustered sessions
+    from evenly spread commits. Summed over a whole account the error was ~1-2%.
+    """
+    if commits <= 0:
+        return 0.0
+    floor = MIN_SESSION / 60
+    gap_limit = SESSION_GAP.total_seconds() / 3600
+    ceiling = max(commits - 1, 0) * gap_limit + floor
+    estimate = commits * hours_per_commit
+    gap = active_hours / commits
+    if gap < gap_limit:
+        estimate = max(estimate, (commits - 1) * gap + floor)
+    return min(max(estimate, floor), ceiling)
+
+
+def apply_stats_estimates(repo_results: list):
+    """Fill in hours for repos scanned through the statistics API.
+
+    Calibrated on the repos paginated exactly in the same run: hours per raw
+    commit, and the share of commits is_valid_commit() keeps (stats count merge
+    and bot commits too). Falls back to STATS_HOURS_PER_COMMIT / all commits when
+    no exact repo has a valid commit to calibrate on (e.g. only merges or bots).
+    """
+    exact = [r for r in repo_results if isinstance(r, dict) and r.get("commits") and "stats" not in r]
+    commits = sum(r["commits"] for r in exact)
+    valid = sum(r["valid_commits"] for r in exact)
+    if valid:
+        ratio = sum(r["hours"] for r in exact) / commits
+        valid_share = valid / commits
+    else:
+        ratio, valid_share = STATS_HOURS_PER_COMMIT, 1.0
+
+    for r in repo_results:
+        if not isinstance(r, dict) or "stats" not in r:
+            continue
+        stats = r.pop("stats")
+        r["hours"] = sum(estimate_week_hours(c * valid_share, ratio / valid_share, stats["active_hours"])
+                         for c in stats["weekly"])
+        r["hours_dist"] = stats["hours_dist"]
+        logger.info(f"Estimated {r['name']} from stats: {stats['commits']:.0f} commits, "
+                    f"{r['hours']:.1f} hrs at {ratio:.2f} hrs/commit")
+
+
+def commit_rows(identity: Identity, commits: list) -> list:
+    """(epoch, sha key, flags) activity-store rows for the identity's commits."""
+    rows = []
+    for c in dedupe_commits(commits):
+        t = commit_time(c)
+        if t is not None and identity.matches(c):
+            rows.append((int(t.timestamp()), sha_key(c.get("sha")), VALID if is_valid_commit(c) else 0))
+    return rows
+
+
+async def sync_stored_commits(service, identity: Identity, repo: dict, owner: str, name: str,
+                              since: datetime, until: datetime) -> Optional[dict]:
+    """Activity for the period from the local store, after listing the ranges it lacks.
+
+    Returns None when a missing range is too long to list exactly, or its listing
+    failed or was cut short; the caller then lists / estimates as without a store.
+    Only ranges listed in full are recorded as covered.
+    """
+    repo_id = activity_store.repo_id(identity.login, service.repo_key(owner, name))
+    lo, hi = int(since.timestamp()), int(until.timestamp())
+    ranges = activity_store.missing(repo_id, lo, hi)
+    if (ranges == [(lo, hi)] and STATS_COMMIT_THRESHOLD
+            and repo.get("contributions", 0) > STATS_COMMIT_THRESHOLD):
+        return None  # nothing stored yet and known to be too long to list
+
+    for start, end in ranges:
+        try:
+            commits = await service.get_commits(
+                owner, name, identity.login,
+                datetime.fromtimestamp(start, timezone.utc).isoformat(),
+                datetime.fromtimestamp(end, timezone.utc).isoformat(),
+                STATS_COMMIT_THRESHOLD, strict=True,
+            )
+        except ListingIncomplete as e:
+            logger.warning(f"Not storing {owner}/{name} range: {e}")
+            return None
+        if commits is None:
+            return None
+        activity_store.append(repo_id, commit_rows(identity, commits), (start, end))
+
+    return activity_store.aggregate(repo_id, lo, hi, int(SESSION_GAP.total_seconds()), MIN_SESSION * 60)
+
+
+async def process_single_repo(service, identity: Identity, repo: dict,
+                         since_iso: str, until_iso: str, fw_maps: dict, ignore_langs: list) -> dict:
+    """Process one repository: languages, commits, frameworks."""
+    name = repo["name"]
+    owner = repo.get("owner", {}).get("login", identity.login)
+    result = {"name": name, "repo": service.repo_key(owner, name), "langs": {}, "frameworks": set(), "hours": 0.0,
+              "hours_dist": {"night": 0, "morning": 0, "daytime": 0, "evening": 0}, "last": None}
 
     try:
         if repo.get("size", 0) == 0:
             return result
 
-        # 1. Languages
-        langs = await service.get_languages(owner, name)
+        # 1. Languages — the tree listing also serves framework detection below.
+        # Both are per repo, not per user, so a service shared by several users
+        # fetches them once.
+        ref = repo.get("default_branch") or "HEAD"
+        key = result["repo"]
+        with phase("languages"):
+            langs, tree = await asyncio.gather(
+                service.once(("languages", key), lambda: service.get_languages(owner, name)),
+                service.once(("tree", key, ref), lambda: service.get_tree(owner, name, ref)),
+            )
+        langs = accounting.correct(langs, tree)
         if ignore_langs and langs:
             langs = {k: v for k, v in langs.items() if k.lower() not in ignore_langs}
         if not langs:
             return result
         result["langs"] = langs
 
-        # 2. Commits — try both username formats concurrently
-        tasks = [
-            service.get_commits(owner, name, username, since_iso, until_iso),
-        ]
-        if owner.lower() != username.lower():
-            tasks.append(service.get_commits(owner, name, owner, since_iso, until_iso))
-
-        commit_results = await asyncio.gather(*tasks, return_exceptions=True)
-        commits = []
-        for res in commit_results:
-            if isinstance(res, list):
-                commits.extend(res)
-
-        valid = [c for c in commits if is_valid_commit(c)]
-        if valid:
-            hours_calc, hours_dist = calculate_coding_time(valid)
-            result["hours"] = hours_calc
-            result["hours_dist"] = hours_dist
-
-        # 3. Frameworks
+        # 2. Commits — one author=<login> listing; GitHub matches it against every
+        # email linked to the account, so the identity needs no per-email queries.
+        # With the activity store only the ranges it hasn't seen yet are listed.
+        stored = None
+        if activity_store is not None:
+            with phase("commits"):
+                stored = await sync_stored_commits(service, identity, repo, owner, name,
+                                                   datetime.fromisoformat(since_iso),
+                                                   datetime.fromisoformat(until_iso))
+        if stored is not None:
+            result.update(stored)
+        else:
+            if STATS_COMMIT_THRESHOLD and repo.get("contributions", 0) > STATS_COMMIT_THRESHOLD:
+                commits = None  # count already known — go straight to the stats API
+            else:
+                with phase("commits"):
+                    commits = await service.get_commits(owner, name, identity.login, since_iso, until_iso,
+                                                        STATS_COMMIT_THRESHOLD)
+
+            if commits is None:
+                # Too many commits to paginate — estimate from the precomputed statistics
+                with phase("stats"):
+                    contributors, punch_card = await asyncio.gather(
+                        service.get_repo_stats(owner, name, "contributors"),
+                        service.get_repo_stats(owner, name, "punch_card"),
+                    )
+                if contributors is not None:
+                    since = datetime.fromisoformat(since_iso)
+                    until = datetime.fromisoformat(until_iso)
+                    result["stats"] = stats_activity(contributors, punch_card, identity.logins, since, until)
+                    result["last"] = until.timestamp()  # the estimate covers everything up to the scan
+                else:
+                    # Stats not ready — fall back to the (truncated) exact listing
+                    commits = await service.get_commits(owner, name, identity.login, since_iso, until_iso)
+
+            if "stats" not in result:
+                commits = [c for c in dedupe_commits(commits or []) if identity.matches(c)]
+                valid = [c for c in commits if is_valid_commit(c)]
+                result["commits"] = len(commits)
+                result["valid_commits"] = len(valid)
+                if valid:
+                    hours_calc, hours_dist = calculate_coding_time(valid)
+                    result["hours"] = hours_calc
+                    result["hours_dist"] = hours_dist
+                    times = [t for t in map(commit_time, valid) if t is not None]
+                    result["last"] = max(times).timestamp() if times else None
+
+        # 3. Frameworks — forks at the same commit share a tree SHA, and the result
+        # depends only on the tree, so it is detected once per SHA on a shared service.
         primary = repo.get("language", "")
-        result["frameworks"] = await service.detect_frameworks(
-            owner, name, primary, fw_maps
-        )
+        tree_key = (tree or {}).get("sha") or key
+        with phase("frameworks"):
+            result["frameworks"] = set(await service.once(
+                ("frameworks", tree_key),
+                lambda: service.detect_frameworks(owner, name, primary, fw_maps, ref, tree),
+            ))
     except Exception as e:
         logger.error(f"Error processing {name}: {e}")
 
     return result
 
 
-async def run_tracker(service, username: str, period_days: int,
-                fw_maps: dict, max_repos: int = 200, ignore_langs: list = None) -> dict:
-    start_time = time_mod.time()
-
-    now = datetime.now(timezone.utc)
-    since = now - timedelta(days=period_days)
-    since_iso = since.isoformat()
-    until_iso = now.isoformat()
+def repo_priority(repo: dict) -> tuple:
+    """Worker-pool ordering: most known contributions first, then most recently pushed."""
+    try:
+        pushed = datetime.strptime(repo.get("pushed_at", ""), "%Y-%m-%dT%H:%M:%SZ").timestamp()
+    except ValueError:
+        pushed = 0.0
+    return (-repo.get("contributions", 0), -pushed)
 
-    # Fetch ALL repos
-    repos = await service.get_repos(username, max_repos, include_forks=True)
-    if not repos:
-        return {
-            "langs": {}, "frameworks": {}, "total_hours": 0,
-            "repo_count": 0, "period_days": period_days, "username": username,
-            "prs": 0, "issues": 0, "busiest_time": "Daytime",
-        }
 
+def filter_repos_in_period(repos: list, since: datetime) -> list:
+    """Keep repos pushed since the start of the period (or with unknown push date)."""
     repos_in_period = []
     for r in repos:
         pushed = r.get("pushed_at", "")
@@ -170,35 +389,154 @@ async def run_tracker(service, username: str, period_days: int,
                 repos_in_period.append(r)
         else:
             repos_in_period.append(r)
+    return repos_in_period
 
-    logger.info(f"Processing {len(repos_in_period)}/{len(repos)} repos "
-                f"pushed within {period_days} days for {username}")
 
-    lang_hours = defaultdict(float)
-    fw_hours = defaultdict(float)
-    total_hours_dist = {"night": 0, "morning": 0, "daytime": 0, "evening": 0}
+async def scan_account(service, username: str, since: datetime, now: datetime, fw_maps: dict,
+                       max_repos: int, ignore_langs: list, deadline: float,
+                       on_listed: Callable[[list], None], on_result: Callable[[dict], None]) -> dict:
+    """Discover and scan one account's repos on one host.
+
+    Returns {"identity", "results", "skipped", "scanned", "prs", "issues", "host",
+    "unattributed"}; unattributed counts, on hosts without commit logins, the
+    pushed commits of repos where none matched the identity.
+    on_listed(repos) is called once the repos to scan are known, on_result(result)
+    as each one finishes.
+    """
+    since_iso = since.isoformat()
+    until_iso = now.isoformat()
+
+    # Repos the user actually committed to in the period (any owner), most commits
+    # first; fall back to listing ALL owned repos when contributions are unavailable
+    with phase("repos"):
+        discovery, identity = await asyncio.gather(
+            service.get_contributed_repos(username, since, now),
+            resolver.resolve(service, username),
+        )
+        repos = discovery[0] if discovery else []
+        if discovery is None or not discovery[1]:
+            owned = await service.get_repos(username, max_repos, include_forks=True)
+            seen = {r["full_name"].lower() for r in repos}
+            repos += filter_repos_in_period(
+                [r for r in owned if r.get("full_name", "").lower() not in seen], since)
+    repos = repos[:max_repos]
+    if not repos:
+        return {"identity": identity, "results": [], "skipped": 0, "scanned": 0, "prs": 0, "issues": 0,
+                "host": service.host, "unattributed": 0}
+
+    logger.info(f"Processing {len(repos)} {service.host} repos active since {since.date()} for {username}")
+    on_listed(repos)
+
+    async def handle(repo: dict) -> dict:
+        result = await process_single_repo(service, identity, repo, since_iso, until_iso,
+                                           fw_maps, ignore_langs)
+        on_result(result)
+        return result
+
+    # Fixed worker pool, busiest repos first; requests inside each repo are bounded
+    # by the service-wide in-flight limit. Whatever finishes before the deadline counts.
+    pool = run_prioritized(
+        repos, handle, repo_priority, MAX_WORKERS,
+        deadline=deadline, should_stop=lambda: service.rate_limited,
+    )
 
-    # Parallel processing of all repositories with a concurrency limit
-    # GitHub secondary rate limit triggers if doing too many simultaneous calls. Max 15 safe.
-    sem = asyncio.Semaphore(15)
-    repo_tasks = [
-        process_single_repo(service, username, repo, since_iso, until_iso, fw_maps, ignore_langs or [], sem)
-        for repo in repos_in_period
-    ]
-    
     # Also fetch PRs and Issues simultaneously
-    extra_tasks = [
-        service.get_user_prs(username),
-        service.get_user_issues(username)
-    ]
+    (repo_results, skipped), prs, issues = await asyncio.gather(
+        pool, service.get_user_prs(username), service.get_user_issues(username),
+    )
+    unattributed = 0
+    if not service.commit_logins:
+        # Pushed commits (from discovery) in repos where none matched the identity
+        pushed = {service.repo_key(r.get("owner", {}).get("login", ""), r["name"]): r.get("contributions", 0)
+                  for r in repos}
+        unattributed = sum(pushed.get(r["repo"], 0) for r in repo_results
+                           if isinstance(r, dict) and r.get("commits") == 0)
+    return {"identity": identity, "results": repo_results, "skipped": skipped, "scanned": len(repos),
+            "prs": prs, "issues": issues, "host": service.host, "unattributed": unattributed}
 
-    all_results = await asyncio.gather(*repo_tasks, *extra_tasks, return_exceptions=True)
-    
-    repo_results = all_results[:-2]
-    extra_results = all_results[-2:]
-    
-    prs = extra_results[0] if not isinstance(extra_results[0], Exception) else 0
-    issues = extra_results[1] if not isinstance(extra_results[1], Exception) else 0
+
+async def run_tracker(service, username: str, period_days: int,
+                fw_maps: dict, max_repos: int = 200, ignore_langs: list = None,
+                progress: Callable[[str, dict], None] = None, linked: list = ()) -> dict:
+    """Scan a user's repos and summarize them into the card payload.
+
+    linked holds (service, username) accounts on other hosts (e.g. GitLab); each
+    is scanned concurrently with the main one, with its own worker pool and
+    request budget, and merged into one card. progress(event, info), when given,
+    is called with "repos" once the repo lists are known and "repo" as each repo
+    finishes (with running totals).
+    """
+    start_time = time_mod.time()
+
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=period_days)
+    accounts = [(service, username), *linked]
+    running = {"done": 0, "hours": 0.0, "total": 0}
+
+    def on_listed(repos: list):
+        running["total"] += len(repos)
+        if progress is not None:
+            progress("repos", {"total": running["total"],
+                               "repos": [r.get("full_name") or r["name"] for r in repos]})
+
+    def on_result(result: dict):
+        if progress is None:
+            return
+        running["done"] += 1
+        running["hours"] += result["hours"]
+        progress("repo", {
+            "repo": result["repo"], "hours": round(result["hours"], 2),
+            "estimated": "stats" in result,  # hours filled in after calibration
+            "langs": list(result["langs"]), "frameworks": sorted(result["frameworks"]),
+            "done": running["done"], "total": running["total"],
+            "total_hours": round(running["hours"], 2),
+        })
+
+    async def scan(account_service, account: str) -> dict:
+        return await scan_account(account_service, account, since, now, fw_maps, max_repos, ignore_langs or [],
+                                  TRACKER_DEADLINE - (time_mod.time() - start_time), on_listed, on_result)
+
+    scans = await asyncio.gather(*[scan(s, u) for s, u in accounts], return_exceptions=True)
+    for (account_service, account), outcome in zip(accounts, scans):
+        if isinstance(outcome, Exception):
+            if account_service is service:
+                raise outcome
+            logger.error(f"Linked {account_service.host} scan for {account} failed: {outcome}")
+    scans = [s for s in scans if not isinstance(s, Exception)]
+
+    repo_results = [r for s in scans for r in s["results"]]
+    scanned = sum(s["scanned"] for s in scans)
+    if not scanned:
+        return {
+            "langs": {}, "frameworks": {}, "total_hours": 0,
+            "repo_count": 0, "period_days": period_days, "username": username,
+            "prs": 0, "issues": 0, "busiest_time": "Daytime",
+        }
+    TRACKER_REPOS.observe(scanned, "scanned")
+    apply_stats_estimates(repo_results)
+
+    data = summarize_results(username, period_days, repo_results,
+                             sum(s["prs"] for s in scans), sum(s["issues"] for s in scans), start_time)
+    data["activity"] = activity_state(scans[0]["identity"], repo_results)
+    unattributed = {s["host"]: s["unattributed"] for s in scans if s["unattributed"]}
+    if unattributed:
+        # Surfaced so a linked account that adds no hours says why
+        data["unattributed"] = unattributed
+    skipped = sum(s["skipped"] for s in scans)
+    if skipped:
+        logger.warning(f"Scan for {username} cut short: {skipped}/{scanned} repos skipped")
+        data["partial"] = True
+    TRACKER_DURATION.observe(time_mod.time() - start_time)
+    TRACKER_REPOS.observe(data["repo_count"], "active")
+    return data
+
+
+def summarize_results(username: str, period_days: int, repo_results: list,
+                      prs: int, issues: int, start_time: float) -> dict:
+    """Fold per-repo results into the card payload (hours split by language bytes)."""
+    lang_hours = defaultdict(float)
+    fw_hours = defaultdict(float)
+    total_hours_dist = {"night": 0, "morning": 0, "daytime": 0, "evening": 0}
 
     processed = 0
     for r in repo_results:
@@ -243,3 +581,180 @@ async def run_tracker(service, username: str, period_days: int,
         "issues": issues,
         "busiest_time": busiest_time,
     }
+
+
+def activity_state(identity: Identity, repo_results: list) -> dict:
+    """Per-repo hours and session state a push webhook can extend without a rescan.
+
+    run_tracker returns it under data["activity"]; callers store it apart from the
+    card payload.
+    """
+    repos = {}
+    for r in repo_results:
+        if isinstance(r, Exception) or not r["langs"]:
+            continue
+        repos[r["repo"]] = {
+            "langs": r["langs"], "frameworks": sorted(r["frameworks"]), "hours": r["hours"],
+            "hours_dist": r["hours_dist"], "last": r["last"],
+        }
+    return {"login": identity.login, "logins": sorted(identity.logins),
+            "emails": sorted(identity.emails), "repos": repos}
+
+
+def commit_author_key(commit: dict) -> str:
+    """Lowercased GitHub login of a commit's author (also read from noreply
+    addresses), or "email:<addr>" if unlinked."""
+    author = commit.get("author") or {}
+    if author.get("login"):
+        return author["login"].lower()
+    try:
+        email = commit["commit"]["author"]["email"]
+    except (KeyError, TypeError):
+        return ""
+    if not email:
+        return ""
+    return noreply_login(email) or f"email:{email.lower()}"
+
+
+async def process_org_repo(service, repo: dict, since_iso: str, until_iso: str,
+                           fw_maps: dict, ignore_langs: list) -> dict:
+    """Process one org repo once: languages, ALL commits grouped by author, frameworks.
+
+    A repo with more than STATS_COMMIT_THRESHOLD commits in the period is read from
+    the statistics API instead ("stats": per-login stats_activity()); if those are
+    not ready either, the capped listing is used and the result marked partial.
+    """
+    name = repo["name"]
+    owner = repo.get("owner", {}).get("login", "")
+    result = {"name": name, "langs": {}, "frameworks": set(), "by_author": {}}
+
+    try:
+        if repo.get("size", 0) == 0:
+            return result
+
+        ref = repo.get("default_branch") or "HEAD"
+        langs, tree = await asyncio.gather(service.get_languages(owner, name),
+                                           service.get_tree(owner, name, ref))
+        langs = accounting.correct(langs, tree)
+        if ignore_langs and langs:
+            langs = {k: v for k, v in langs.items() if k.lower() not in ignore_langs}
+        if not langs:
+            return result
+        result["langs"] = langs
+
+        # One unfiltered listing serves every member
+        commits = await service.get_commits(owner, name, None, since_iso, until_iso, STATS_COMMIT_THRESHOLD)
+        if commits is None:
+            contributors, punch_card = await asyncio.gather(
+                service.get_repo_stats(owner, name, "contributors"),
+                service.get_repo_stats(owner, name, "punch_card"),
+            )
+            if contributors is not None:
+                since = datetime.fromisoformat(since_iso)
+                until = datetime.fromisoformat(until_iso)
+                logins = {((e or {}).get("author") or {}).get("login", "").lower() for e in contributors}
+                stats = {login: stats_activity(contributors, punch_card, {login}, since, until)
+                         for login in logins if login}
+                result["stats"] = {login: st for login, st in stats.items() if st["commits"]}
+            else:
+                commits = await service.get_commits(owner, name, None, since_iso, until_iso)
+                result["partial"] = True
+
+        # All of an author's commits are kept: the raw count calibrates stats estimates
+        by_author = defaultdict(list)
+        for c in dedupe_commits(commits or []):
+            key = commit_author_key(c)
+            if key:
+                by_author[key].append(c)
+        if not by_author and not result.get("stats"):
+            return result
+        result["by_author"] = by_author
+
+        result["frameworks"] = await service.detect_frameworks(
+            owner, name, repo.get("language", ""), fw_maps, ref, tree
+        )
+    except Exception as e:
+        logger.error(f"Error processing {owner}/{name}: {e}")
+
+    return result
+
+
+async def run_org_tracker(service, org: str, period_days: int, fw_maps: dict,
+                          max_repos: int = 200, ignore_langs: list = None) -> dict:
+    """Scan an organization once and attribute commits to every member.
+
+    Each org repo is listed and paginated once (no author filter) instead of once per
+    member. Returns {login: payload}, each payload shaped like run_tracker()'s, for
+    members with activity. PR/issue counts come from one org-scoped search listing
+    each, so they only cover PRs/issues inside the org.
+    """
+    start_time = time_mod.time()
+
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=period_days)
+
+    repos, members = await asyncio.gather(
+        service.get_org_repos(org, max_repos),
+        service.get_org_members(org),
+    )
+    repos_in_period = filter_repos_in_period(repos, since)
+    logger.info(f"Org scan {org}: {len(repos_in_period)}/{len(repos)} repos, {len(members)} members")
+
+    pool = run_prioritized(
+        repos_in_period,
+        lambda repo: process_org_repo(service, repo, since.isoformat(), now.isoformat(),
+                                      fw_maps, ignore_langs or []),
+        repo_priority, MAX_WORKERS,
+        deadline=TRACKER_DEADLINE - (time_mod.time() - start_time),
+        should_stop=lambda: service.rate_limited,
+    )
+    (repo_results, skipped), prs, issues = await asyncio.gather(
+        pool,
+        service.get_org_search_counts(org, "pr", since.date().isoformat()),
+        service.get_org_search_counts(org, "issue", since.date().isoformat()),
+    )
+    partial = bool(skipped)
+    if skipped:
+        logger.warning(f"Org scan {org} cut short: {skipped}/{len(repos_in_period)} repos skipped")
+
+    # Member list may be empty (e.g. private membership) — then report every committer login
+    logins = {m["login"].lower(): m["login"] for m in members if m.get("login")}
+
+    def member(key: str) -> Optional[str]:
+        return logins.get(key) if logins else (None if key.startswith("email:") else key)
+
+    per_member = defaultdict(list)
+    unattributed = 0
+    for r in repo_results:
+        if isinstance(r, Exception):
+            logger.error(f"Future error: {r}")
+            continue
+        partial = partial or r.get("partial", False)
+        base = {"name": r["name"], "langs": r["langs"], "frameworks": r["frameworks"]}
+        for key, commits in r["by_author"].items():
+            login = member(key)
+            valid = [c for c in commits if is_valid_commit(c)]
+            if not valid:
+                continue
+            if not login:
+                unattributed += len(valid)
+                continue
+            hours, hours_dist = calculate_coding_time(valid)
+            per_member[login].append({**base, "hours": hours, "hours_dist": hours_dist,
+                                      "commits": len(commits), "valid_commits": len(valid)})
+        for key, stats in r.get("stats", {}).items():
+            login = member(key)
+            if login:
+                per_member[login].append({**base, "hours": 0.0, "stats": stats})
+
+    if unattributed:
+        logger.info(f"Org scan {org}: {unattributed} commits not attributable to a member")
+
+    payloads = {}
+    for login, results in per_member.items():
+        apply_stats_estimates(results)  # calibrated on the member's exactly listed repos
+        payloads[login] = summarize_results(login, period_days, results,
+                                            prs.get(login.lower(), 0), issues.get(login.lower(), 0), start_time)
+        if partial:
+            payloads[login]["partial"] = True
+    return payloads
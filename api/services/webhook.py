@@ -0,0 +1,63 @@
+"""GitHub push webhooks: signature check and payload -> REST-shaped commits."""
+import hashlib
+import hmac
+from datetime import datetime, timezone
+
+from services.identity import noreply_login
+
+
+def verify_signature(secret: str, body: bytes, signature: str) -> bool:
+    """Check X-Hub-Signature-256 ("sha256=<hex HMAC of the raw body>")."""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def sign(secret: str, body: bytes) -> str:
+    """X-Hub-Signature-256 value GitHub would send for body (used to replay payloads)."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _utc(timestamp: str) -> str:
+    """Push timestamps carry the committer's offset; the REST API reports UTC."""
+    try:
+        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return ""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def push_commits(payload: dict) -> list:
+    """Commits of a push to the default branch, in the REST /commits shape.
+
+    Scans only list the default branch, so pushes to other refs are ignored
+    (their commits are counted once they land on the default branch).
+    """
+    repo = payload.get("repository") or {}
+    branch = repo.get("default_branch") or repo.get("master_branch")
+    if not branch or payload.get("ref") != f"refs/heads/{branch}" or payload.get("deleted"):
+        return []
+    commits = []
+    for c in payload.get("commits") or []:
+        author = c.get("author") or {}
+        commits.append({
+            "sha": c.get("id", ""),
+            "commit": {"message": c.get("message", ""),
+                       "author": {"name": author.get("name"), "email": author.get("email"),
+                                  "date": _utc(c.get("timestamp"))}},
+            "author": {"login": author["username"]} if author.get("username") else None,
+        })
+    return commits
+
+
+def commit_logins(commits: list) -> set:
+    """Lowercased logins of the commits' authors (noreply addresses included)."""
+    logins = set()
+    for c in commits:
+        login = (c.get("author") or {}).get("login") or noreply_login(c["commit"]["author"].get("email"))
+        if login:
+            logins.add(login.lower())
+    return logins
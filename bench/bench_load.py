@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""End-to-end load test: one uvicorn worker running api/index.py against a local fake GitHub.
+
+Starts ``bench/fake_github.py`` and the app (in-memory cache, relaxed rate limits),
+then drives three scenarios over /api, /api/json and /api/code:
+
+    cold        no_cache=true — every request is a full scan
+    warm        data primed once per user — cache hits with varied themes/layouts
+    revalidate  If-None-Match with the ETag from a previous response — 304s
+
+Examples:
+    python bench/bench_load.py
+    python bench/bench_load.py --users 200 --requests 2000 --concurrency 32 --mix svg=6,json=2,code=2
+    python bench/bench_load.py --scenario warm --out after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THEMES = ["dark", "light", "radical", "tokyonight", "cyberpunk", "hacker"]
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf")]
+ENDPOINTS = {"svg": "/api", "json": "/api/json", "code": "/api/code"}
+
+
+def _start(cmd: list, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(cmd, cwd=ROOT, env={**os.environ, **env},
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def _wait_ready(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url, timeout=1.0)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def _params(kind: str, user: str, rng: random.Random) -> dict:
+    p = {"username": user}
+    if kind == "svg":
+        p["theme"] = rng.choice(THEMES)
+        p["layout"] = rng.choice(["landscape", "portrait"])
+    return p
+
+
+def _percentile(sorted_ms: list, q: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))]
+
+
+def _summarize(samples: list, wall: float) -> dict:
+    lat = sorted(ms for ms, _ in samples)
+    hist = {}
+    for ms in lat:
+        b = next(b for b in BUCKETS_MS if ms <= b)
+        key = f"<={b:g}ms" if b != float("inf") else ">5000ms"
+        hist[key] = hist.get(key, 0) + 1
+    status = {}
+    for _, code in samples:
+        status[str(code)] = status.get(str(code), 0) + 1
+    return {
+        "requests": len(lat),
+        "rps": round(len(lat) / wall, 1) if wall else 0.0,
+        "p50_ms": round(_percentile(lat, 0.50), 2),
+        "p90_ms": round(_percentile(lat, 0.90), 2),
+        "p99_ms": round(_percentile(lat, 0.99), 2),
+        "max_ms": round(lat[-1], 2) if lat else 0.0,
+        "status": status,
+        "histogram": hist,
+    }
+
+
+async def _drive(base: str, plan: list, concurrency: int) -> tuple:
+    """Run (kind, params, headers) requests with a fixed number of in-flight clients."""
+    samples = {kind: [] for kind in ENDPOINTS}
+    queue = asyncio.Queue()
+    for item in plan:
+        queue.put_nowait(item)
+
+    async def worker(client):
+        while True:
+            try:
+                kind, params, headers = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            resp = await client.get(base + ENDPOINTS[kind], params=params, headers=headers)
+            samples[kind].append(((time.perf_counter() - start) * 1000, resp.status_code))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[worker(client) for _ in range(concurrency)])
+        wall = time.perf_counter() - start
+    return samples, wall
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    users = [f"user{i:04d}" for i in range(args.users)]
+    mix = []
+    for part in args.mix.split(","):
+        kind, _, weight = part.partition("=")
+        mix += [kind.strip()] * int(weight or 1)
+
+    gh = _start([sys.executable, "bench/fake_github.py", "--port", str(args.github_port),
+                 "--repos", str(args.repos), "--commits", str(args.commits),
+                 "--latency", str(args.latency)], {})
+    app_env = {
+        "GITHUB_API_BASE": f"http://127.0.0.1:{args.github_port}",
+        "GITHUB_TOKEN": "bench",
+        "CACHE_BACKEND": "memory",
+        "UPSTASH_REDIS_REST_URL": "",
+        "STATS_POLL_DELAY": "0.01",
+        **{f"RATE_LIMIT_{name}": "100000000/60" for name in ("SVG", "JSON", "CODE")},
+    }
+    app = _start([sys.executable, "-m", "uvicorn", "index:app", "--app-dir", "api",
+                  "--port", str(args.app_port), "--workers", "1", "--log-level", "warning"], app_env)
+    base = f"http://127.0.0.1:{args.app_port}"
+    report = {"config": vars(args), "scenarios": {}}
+    try:
+        await _wait_ready(f"http://127.0.0.1:{args.github_port}/users/probe")
+        await _wait_ready(f"{base}/api/health")
+
+        scenarios = ["cold", "warm", "revalidate"] if args.scenario == "all" else [args.scenario]
+        for scenario in scenarios:
+            if scenario == "cold":
+                plan = []
+                for _ in range(args.requests):
+                    kind = rng.choice(mix)
+                    plan.append((kind, {**_params(kind, rng.choice(users), rng), "no_cache": "true"}, {}))
+            else:
+                # Prime data for every user once (not measured)
+                await _drive(base, [("json", {"username": u}, {}) for u in users], args.concurrency)
+                plan = []
+                for _ in range(args.requests):
+                    kind = rng.choice(mix)
+                    plan.append((kind, _params(kind, rng.choice(users), rng), {}))
+                if scenario == "revalidate":
+                    etags = {}
+                    async with httpx.AsyncClient(timeout=120.0) as client:
+                        for kind, params, _ in plan:
+                            key = (kind, tuple(sorted(params.items())))
+                            if key not in etags:
+                                resp = await client.get(base + ENDPOINTS[kind], params=params)
+                                etags[key] = resp.headers.get("etag", "")
+                    plan = [(kind, params, {"If-None-Match": etags[(kind, tuple(sorted(params.items())))]})
+                            for kind, params, _ in plan]
+
+            samples, wall = await _drive(base, plan, args.concurrency)
+            all_samples = [s for kind in samples for s in samples[kind]]
+            report["scenarios"][scenario] = {
+                "total": _summarize(all_samples, wall),
+                **{kind: _summarize(s, wall) for kind, s in samples.items() if s},
+            }
+    finally:
+        app.terminate()
+        gh.terminate()
+        app.wait()
+        gh.wait()
+    return report
+
+
+def _print(report: dict, baseline: dict = None):
+    print(f"{'scenario':<11} {'endpoint':<6} {'reqs':>6} {'rps':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}  status")
+    for scenario, per_kind in report["scenarios"].items():
+        for kind, s in per_kind.items():
+            line = (f"{scenario:<11} {kind:<6} {s['requests']:>6} {s['rps']:>8.1f} {s['p50_ms']:>8.2f} "
+                    f"{s['p90_ms']:>8.2f} {s['p99_ms']:>8.2f} {s['max_ms']:>8.2f}  {s['status']}")
+            old = (baseline or {}).get("scenarios", {}).get(scenario, {}).get(kind)
+            if old and old["rps"]:
+                line += f"  (rps {100 * (s['rps'] / old['rps'] - 1):+.0f}%, p99 {s['p99_ms'] - old['p99_ms']:+.2f}ms)"
+            print(line)
+        total = per_kind["total"]["histogram"]
+        print(f"{'':<11} histogram: " + "  ".join(f"{k} {v}" for k, v in total.items()))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scenario", choices=["all", "cold", "warm", "revalidate"], default="all")
+    ap.add_argument("--users", type=int, default=50)
+    ap.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--mix", default="svg=6,json=2,code=2")
+    ap.add_argument("--repos", type=int, default=10, help="fake repos per user")
+    ap.add_argument("--commits", type=int, default=500, help="fake commits per user")
+    ap.add_argument("--latency", type=float, default=0.0, help="fake GitHub latency (s)")
+    ap.add_argument("--app-port", type=int, default=9101)
+    ap.add_argument("--github-port", type=int, default=9100)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="write the JSON report here")
+    ap.add_argument("--compare", help="baseline JSON report to diff against")
+    args = ap.parse_args()
+
+    report = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    _print(report, baseline)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
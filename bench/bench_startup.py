@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark: import time and first-request latency of api/index.py.
+
+Every run is a fresh interpreter, as on a new serverless instance. Each one
+times ``import index`` and then, in order, the first:
+
+    health   GET /api/health
+    scan     GET /api/json — a full scan against a local fake GitHub
+    card     GET /api (Accept-Encoding: br) — a cache hit: first render + compression
+
+Requests are driven straight through the ASGI interface, so no HTTP client is
+loaded before the app needs one. Run it on each commit and diff the reports:
+
+    python bench/bench_startup.py --out before.json
+    python bench/bench_startup.py --runs 30 --compare before.json
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STEPS = ["import", "health", "scan", "card"]
+
+PROBE = r"""
+import asyncio, json, sys, time
+sys.path.insert(0, "api")
+start = time.perf_counter()
+import index
+timings = {"import": (time.perf_counter() - start) * 1000}
+modules = len(sys.modules)
+
+
+async def get(path, query=b"", headers=()):
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query,
+             "root_path": "", "headers": [(b"host", b"bench"), *headers],
+             "client": ("127.0.0.1", 1), "server": ("bench", 80)}
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await index.app(scope, receive, send)
+    return status[0]
+
+
+async def main():
+    steps = [("health", "/api/health", b"", ()),
+             ("scan", "/api/json", b"username=user0000", ()),
+             ("card", "/api", b"username=user0000&theme=tokyonight", ((b"accept-encoding", b"br, gzip"),))]
+    codes = {}
+    for name, path, query, headers in steps:
+        start = time.perf_counter()
+        codes[name] = await get(path, query, headers)
+        timings[name] = (time.perf_counter() - start) * 1000
+    return codes
+
+codes = asyncio.run(main())
+print(json.dumps({"timings": timings, "status": codes, "modules": modules}))
+"""
+
+
+def _start_fake_github(args) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "bench/fake_github.py", "--port", str(args.github_port),
+                             "--repos", str(args.repos), "--commits", str(args.commits)],
+                            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _wait_ready(port: int, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1.0).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"fake GitHub on port {port} did not come up")
+
+
+def _probe(args) -> dict:
+    env = {
+        **os.environ,
+        "GITHUB_API_BASE": f"http://127.0.0.1:{args.github_port}",
+        "GITHUB_TOKEN": "bench",
+        "CACHE_BACKEND": "memory",
+        "UPSTASH_REDIS_REST_URL": "",
+        "STATS_POLL_DELAY": "0.01",
+    }
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _summarize(values: list) -> dict:
+    values = sorted(values)
+    return {
+        "median_ms": round(statistics.median(values), 2),
+        "p90_ms": round(values[min(len(values) - 1, int(0.9 * len(values)))], 2),
+        "min_ms": round(values[0], 2),
+    }
+
+
+def run(args) -> dict:
+    gh = _start_fake_github(args)
+    try:
+        _wait_ready(args.github_port)
+        _probe(args)  # warm the bytecode cache; a deployed bundle ships compiled
+        runs = [_probe(args) for _ in range(args.runs)]
+    finally:
+        gh.terminate()
+        gh.wait()
+    return {
+        "config": vars(args),
+        "modules": runs[-1]["modules"],
+        "status": runs[-1]["status"],
+        "steps": {step: _summarize([r["timings"][step] for r in runs]) for step in STEPS},
+    }
+
+
+def _print(report: dict, baseline: dict = None):
+    print(f"{'step':<8} {'median ms':>10} {'p90 ms':>8} {'min ms':>8}")
+    for step, s in report["steps"].items():
+        line = f"{step:<8} {s['median_ms']:>10.2f} {s['p90_ms']:>8.2f} {s['min_ms']:>8.2f}"
+        old = (baseline or {}).get("steps", {}).get(step)
+        if old:
+            line += f"  (median {s['median_ms'] - old['median_ms']:+.2f}ms)"
+        print(line)
+    print(f"modules after import: {report['modules']}  first responses: {report['status']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=15, help="fresh interpreters to time")
+    ap.add_argument("--repos", type=int, default=5, help="fake repos for the scanned user")
+    ap.add_argument("--commits", type=int, default=200, help="fake commits for the scanned user")
+    ap.add_argument("--github-port", type=int, default=9100)
+    ap.add_argument("--out", help="write the JSON report here")
+    ap.add_argument("--compare", help="baseline JSON report to diff against")
+    args = ap.parse_args()
+
+    report = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    _print(report, baseline)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Offline benchmark for run_tracker / GitHubService against a fake GitHub.
+
+Examples:
+    python bench/bench_tracker.py                         # small, medium, large presets
+    python bench/bench_tracker.py --preset large --latency 0.05
+    python bench/bench_tracker.py --repos 50 --commits 20000 --period 3650
+    python bench/bench_tracker.py --record fixture.json --user octocat   # real API, once
+    python bench/bench_tracker.py --replay fixture.json --user octocat
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("STATS_POLL_DELAY", "0.01")  # fake stats are "ready" on the second poll
+os.environ.setdefault("TRACKER_DEADLINE", "3600")  # the in-process fake is CPU-bound on large presets
+
+import httpx
+from fake_github import PRESETS, RecordedGitHub, Stats, SyntheticGitHub, mock_transport, recording_transport
+from index import FW_MAPS
+from services.github_service import GitHubService
+from services.tracker import run_tracker
+
+
+async def _run(transport, username: str, period: int, max_repos: int) -> dict:
+    async with httpx.AsyncClient(transport=transport) as client:
+        service = GitHubService(token=os.getenv("GITHUB_TOKEN", "bench"), client=client)
+        return await run_tracker(service, username, period, FW_MAPS, max_repos)
+
+
+def bench(label: str, fixture, username: str, period: int, max_repos: int, latency: float) -> dict:
+    stats = Stats()
+    transport = mock_transport(fixture, latency, stats)
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = asyncio.run(_run(transport, username, period, max_repos))
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "label": label,
+        "wall_s": round(wall, 3),
+        "requests": stats.requests,
+        "bytes": stats.bytes,
+        "status": stats.by_status,
+        "peak_mem_mb": round(peak / 1e6, 2),
+        "total_hours": data["total_hours"],
+        "repo_count": data["repo_count"],
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--preset", choices=sorted(PRESETS), action="append")
+    ap.add_argument("--repos", type=int)
+    ap.add_argument("--commits", type=int)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds injected per upstream call")
+    ap.add_argument("--period", type=int, default=365)
+    ap.add_argument("--max-repos", type=int, default=500)
+    ap.add_argument("--user", default="bench-user")
+    ap.add_argument("--replay", help="serve a recorded fixture file instead of synthetic data")
+    ap.add_argument("--record", help="run once against the real API and save responses here")
+    ap.add_argument("--json", action="store_true", help="print results as JSON lines")
+    args = ap.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.record:
+        recorded = {}
+        asyncio.run(_run(recording_transport(recorded), args.user, args.period, args.max_repos))
+        with open(args.record, "w") as f:
+            json.dump(recorded, f)
+        print(f"Recorded {len(recorded)} responses to {args.record}")
+        return
+
+    runs = []
+    if args.replay:
+        runs.append((f"replay:{os.path.basename(args.replay)}", RecordedGitHub(args.replay)))
+    elif args.repos or args.commits:
+        repos, commits = args.repos or 10, args.commits or 1000
+        runs.append((f"{repos}r/{commits}c", SyntheticGitHub(args.user, repos, commits)))
+    else:
+        for name in args.preset or ["small", "medium", "large"]:
+            repos, commits = PRESETS[name]
+            runs.append((f"{name} ({repos}r/{commits}c)", SyntheticGitHub(args.user, repos, commits)))
+
+    if not args.json:
+        print(f"{'fixture':<24} {'wall s':>8} {'requests':>9} {'MB in':>8} {'peak MB':>8} {'hours':>9} {'repos':>6}")
+    for label, fixture in runs:
+        r = bench(label, fixture, args.user, args.period, args.max_repos, args.latency)
+        if args.json:
+            print(json.dumps(r))
+        else:
+            print(f"{r['label']:<24} {r['wall_s']:>8.3f} {r['requests']:>9} {r['bytes'] / 1e6:>8.2f} "
+                  f"{r['peak_mem_mb']:>8.2f} {r['total_hours']:>9.1f} {r['repo_count']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""Synthetic / recorded GitHub API fixtures for offline benchmarks.
+
+The fixture is a pure function of (method, path, query, body) -> (status, headers, body),
+so the same data can be served through an ``httpx.MockTransport`` (in-process)
+or over HTTP (see ``asgi_app``) without touching the real API or its rate limit.
+
+Run as a local GitHub stand-in:
+    python bench/fake_github.py --port 9100 --repos 20 --commits 2000 --latency 0.02
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+LANGS = ["TypeScript", "JavaScript", "Python", "Go", "PHP", "Java", "Rust", "Ruby"]
+MESSAGES = [
+    "fix edge case in parser", "add tests", "refactor service layer", "update deps",
+    "implement feature flag", "tweak styles", "Merge pull request #12 from x/y",
+    "wip", "improve error handling", "docs: usage", "bump version to 1.2.3",
+]
+MANIFESTS = {
+    "TypeScript": ("package.json", {"dependencies": {"react": "^18", "next": "14"}, "devDependencies": {"vite": "5"}}),
+    "JavaScript": ("package.json", {"dependencies": {"express": "^4"}, "devDependencies": {"jest": "29"}}),
+    "Python": ("requirements.txt", "fastapi==0.110\nhttpx\npytest\n"),
+    "Go": ("go.mod", "module x\n\nrequire github.com/gin-gonic/gin v1.9.1\n"),
+    "PHP": ("composer.json", {"require": {"laravel/framework": "^10"}}),
+    "Java": ("build.gradle", "plugins { id 'org.springframework.boot' }\nimplementation 'org.springframework.boot:spring-boot-starter-web'\n"),
+    "Rust": ("Cargo.toml", "[dependencies]\ntokio = \"1\"\n"),
+    "Ruby": ("Gemfile", "gem 'rails', '~> 7.0'\n"),
+}
+
+# name: (repos, total commits)
+PRESETS = {
+    "small": (10, 1_000),
+    "medium": (100, 10_000),
+    "large": (500, 100_000),
+}
+
+
+def _json(status: int, body, headers: dict = None) -> tuple:
+    return status, headers or {}, json.dumps(body).encode("utf-8")
+
+
+class SyntheticGitHub:
+    """Deterministic fake account: ``repos`` repos sharing ``commits`` commits."""
+
+    def __init__(self, username: str = "bench-user", repos: int = 10, commits: int = 1000,
+                 days: int = 300, seed: int = 42):
+        self.username = username
+        self.days = days
+        self.seed = seed
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        rng = random.Random(seed)
+        weights = [rng.paretovariate(1.2) for _ in range(repos)]
+        total_w = sum(weights)
+        self.repos = []
+        for i, w in enumerate(weights):
+            lang = rng.choice(LANGS)
+            self.repos.append({
+                "id": 1000 + i,
+                "name": f"repo-{i:03d}",
+                "full_name": f"{username}/repo-{i:03d}",
+                "owner": {"login": username},
+                "fork": i % 17 == 0,
+                "size": 100 + int(w * 50),
+                "language": lang,
+                "pushed_at": (self.now - timedelta(days=rng.randint(0, days))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "default_branch": "main",
+                "_commits": max(1, round(commits * w / total_w)),
+                "_second_lang": rng.choice(LANGS),
+            })
+        self._by_name = {r["name"]: r for r in self.repos}
+        self._stats_requested = set()
+
+    # ── fixtures ──
+    def _public_repo(self, r: dict) -> dict:
+        return {k: v for k, v in r.items() if not k.startswith("_")}
+
+    def _commit(self, r: dict, i: int) -> dict:
+        rng = random.Random(hash((self.seed, r["id"], i)))
+        span = self.days * 86400
+        # Newest first, like the real API; clustered so sessions form
+        ts = self.now - timedelta(seconds=int(i * span / r["_commits"]) + rng.randint(0, 5400))
+        sha = hashlib.sha1(f"{r['id']}:{i}".encode()).hexdigest()
+        return {
+            "sha": sha,
+            "commit": {
+                "author": {"name": self.username, "email": f"{self.username}@example.com",
+                           "date": ts.strftime("%Y-%m-%dT%H:%M:%SZ")},
+                "message": rng.choice(MESSAGES),
+            },
+            "author": {"login": self.username},
+        }
+
+    def _paged(self, items_total: int, query: dict, make) -> tuple:
+        page = int(query.get("page", 1))
+        per_page = int(query.get("per_page", 30))
+        start = (page - 1) * per_page
+        end = min(items_total, start + per_page)
+        body = [make(i) for i in range(start, end)]
+        headers = {}
+        last = max(1, -(-items_total // per_page))
+        if page < last:
+            headers["Link"] = f'<?{urlencode({**query, "page": page + 1})}>; rel="next", <?{urlencode({**query, "page": last})}>; rel="last"'
+        return _json(200, body, headers)
+
+    def _times(self, r: dict) -> list:
+        times = r.get("_times")
+        if times is None:
+            times = r["_times"] = [
+                datetime.strptime(self._commit(r, i)["commit"]["author"]["date"], "%Y-%m-%dT%H:%M:%SZ")
+                for i in range(r["_commits"])]
+        return times
+
+    def _window(self, r: dict, query: dict) -> list:
+        """Indices of the commits inside the query's since/until (the whole history without them)."""
+        if "since" not in query and "until" not in query:
+            return range(r["_commits"])
+        def bound(key, default):
+            if key not in query:
+                return default
+            return datetime.fromisoformat(query[key]).astimezone(timezone.utc).replace(tzinfo=None)
+
+        since, until = bound("since", datetime.min), bound("until", datetime.max)
+        return [i for i, t in enumerate(self._times(r)) if since <= t <= until]
+
+    def _stats(self, r: dict, kind: str) -> tuple:
+        # Like GitHub: 202 on the first request while the statistics are "computed"
+        if (r["id"], kind) not in self._stats_requested:
+            self._stats_requested.add((r["id"], kind))
+            return _json(202, {})
+        times = self._times(r)
+        if kind == "punch_card":
+            counts = {}
+            for t in times:
+                key = ((t.weekday() + 1) % 7, t.hour)
+                counts[key] = counts.get(key, 0) + 1
+            return _json(200, [[d, h, counts.get((d, h), 0)] for d in range(7) for h in range(24)])
+        weeks = {}
+        for t in times:
+            start = (t - timedelta(days=(t.weekday() + 1) % 7)).replace(hour=0, minute=0, second=0)
+            w = int(start.replace(tzinfo=timezone.utc).timestamp())
+            weeks[w] = weeks.get(w, 0) + 1
+        return _json(200, [{"author": {"login": self.username}, "total": len(times),
+                            "weeks": [{"w": w, "a": 0, "d": 0, "c": c} for w, c in sorted(weeks.items())]}])
+
+    def _contributions(self, variables: dict) -> tuple:
+        since = datetime.fromisoformat(variables["from"]).replace(tzinfo=None)
+        until = datetime.fromisoformat(variables["to"]).replace(tzinfo=None)
+        by_repo = []
+        for r in self.repos:
+            count = sum(1 for t in self._times(r) if since <= t < until)
+            if count:
+                by_repo.append({"contributions": {"totalCount": count}, "repository": {
+                    "name": r["name"], "nameWithOwner": r["full_name"], "isFork": r["fork"],
+                    "isPrivate": False, "pushedAt": r["pushed_at"], "diskUsage": r["size"],
+                    "owner": {"login": self.username}, "primaryLanguage": {"name": r["language"]},
+                    "defaultBranchRef": {"name": r["default_branch"]},
+                }})
+        by_repo.sort(key=lambda e: e["contributions"]["totalCount"], reverse=True)
+        collection = {"commitContributionsByRepository": by_repo[:100]}
+        return _json(200, {"data": {"user": {"contributionsCollection": collection}}})
+
+    def _manifest(self, r: dict) -> tuple:
+        return MANIFESTS[r["language"]]
+
+    def _files(self, r: dict) -> dict:
+        """path -> content. Every third repo is a monorepo with a second app under apps/."""
+        name, content = self._manifest(r)
+        raw = json.dumps(content) if isinstance(content, dict) else content
+        files = {"README.md": "# fake\n", name: raw, "Dockerfile": "FROM scratch\n",
+                 ".github/workflows/ci.yml": "on: push\n", "src/main.txt": "x\n"}
+        if r["id"] % 3 == 0:
+            other, other_content = MANIFESTS[r["_second_lang"]]
+            files[f"apps/web/{other}"] = json.dumps(other_content) if isinstance(other_content, dict) else other_content
+            files["node_modules/left-pad/package.json"] = json.dumps({"dependencies": {"vue": "3"}})
+        return files
+
+    def _tree(self, r: dict) -> tuple:
+        entries, dirs = [], set()
+        for path, content in self._files(r).items():
+            parts = path.split("/")
+            dirs.update("/".join(parts[:i]) for i in range(1, len(parts)))
+            entries.append({"path": path, "type": "blob", "size": len(content),
+                            "sha": hashlib.sha1(content.encode()).hexdigest()})
+        entries += [{"path": d, "type": "tree", "sha": hashlib.sha1(d.encode()).hexdigest()} for d in dirs]
+        sha = hashlib.sha1(f"{r['id']}:tree".encode()).hexdigest()
+        return _json(200, {"sha": sha, "tree": sorted(entries, key=lambda e: e["path"]), "truncated": False})
+
+    def _blob(self, r: dict, sha: str) -> tuple:
+        for content in self._files(r).values():
+            if hashlib.sha1(content.encode()).hexdigest() == sha:
+                return _json(200, {"sha": sha, "encoding": "base64",
+                                   "content": base64.b64encode(content.encode()).decode()})
+        return _json(404, {"message": "Not Found"})
+
+    def handle(self, method: str, path: str, query: dict, body: bytes = b"") -> tuple:
+        parts = [p for p in path.split("/") if p]
+        if parts == ["graphql"] and method == "POST":
+            return self._contributions(json.loads(body)["variables"])
+        if parts == ["user", "repos"] or parts == ["users", self.username, "repos"]:
+            return self._paged(len(self.repos), query, lambda i: self._public_repo(self.repos[i]))
+        if parts == ["users", self.username]:
+            return _json(200, {"login": self.username, "id": 1, "type": "User"})
+        if parts == ["search", "issues"]:
+            return _json(200, {"total_count": 7, "items": []})
+        if len(parts) >= 4 and parts[0] == "repos":
+            r = self._by_name.get(parts[2])
+            if r is None:
+                return _json(404, {"message": "Not Found"})
+            rest = parts[3:]
+            if rest == ["languages"]:
+                return _json(200, {r["language"]: r["size"] * 900, r["_second_lang"]: r["size"] * 100})
+            if rest == ["commits"]:
+                window = self._window(r, query)
+                return self._paged(len(window), query, lambda i: self._commit(r, window[i]))
+            if rest[:2] == ["git", "trees"]:
+                return self._tree(r)
+            if rest[:2] == ["git", "blobs"] and len(rest) == 3:
+                return self._blob(r, rest[2])
+            if rest in (["stats", "contributors"], ["stats", "punch_card"]):
+                return self._stats(r, rest[1])
+            if rest == ["contents"]:
+                name, _ = self._manifest(r)
+                return _json(200, [{"name": n, "type": "file"} for n in ("README.md", name, "Dockerfile")]
+                             + [{"name": ".github", "type": "dir"}, {"name": "src", "type": "dir"}])
+            if rest == ["contents", ".github"]:
+                return _json(200, [{"name": "workflows", "type": "dir"}])
+            if rest[0] == "contents":
+                name, content = self._manifest(r)
+                if "/".join(rest[1:]) != name:
+                    return _json(404, {"message": "Not Found"})
+                raw = json.dumps(content) if isinstance(content, dict) else content
+                return _json(200, {"name": name, "encoding": "base64",
+                                   "content": base64.b64encode(raw.encode()).decode()})
+        return _json(404, {"message": "Not Found"})
+
+
+class MultiUserGitHub:
+    """Any username resolves to its own SyntheticGitHub account (built on first use)."""
+
+    def __init__(self, repos: int = 10, commits: int = 1000, default_user: str = "bench-user"):
+        self.repos = repos
+        self.commits = commits
+        self.default_user = default_user
+        self._accounts = {}
+
+    def account(self, username: str) -> SyntheticGitHub:
+        acct = self._accounts.get(username)
+        if acct is None:
+            seed = int(hashlib.md5(username.encode()).hexdigest()[:8], 16)
+            acct = self._accounts[username] = SyntheticGitHub(username, self.repos, self.commits, seed=seed)
+        return acct
+
+    def handle(self, method: str, path: str, query: dict, body: bytes = b"") -> tuple:
+        parts = [p for p in path.split("/") if p]
+        user = self.default_user
+        if len(parts) >= 2 and parts[0] in ("users", "repos"):
+            user = parts[1]
+        elif parts == ["search", "issues"]:
+            for term in query.get("q", "").split():
+                if term.startswith("author:"):
+                    user = term[len("author:"):]
+        elif parts == ["graphql"] and body:
+            user = json.loads(body)["variables"].get("login", user)
+        return self.account(user).handle(method, path, query, body)
+
+
+class RecordedGitHub:
+    """Replays responses captured by ``recording_transport`` (exact method+path+query)."""
+
+    def __init__(self, path: str):
+        with open(path) as f:
+            self.responses = json.load(f)
+
+    def handle(self, method: str, path: str, query: dict, body: bytes = b"") -> tuple:
+        entry = self.responses.get(request_key(method, path, query, body))
+        if entry is None:
+            return _json(404, {"message": "Not recorded"})
+        return entry["status"], entry.get("headers", {}), entry["body"].encode("utf-8")
+
+
+def request_key(method: str, path: str, query: dict, body: bytes = b"") -> str:
+    key = f"{method} {path}?{urlencode(sorted(query.items()))}"
+    return f"{key} {hashlib.sha1(body).hexdigest()[:16]}" if body else key
+
+
+class Stats:
+    """Upstream request accounting shared by the transports."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.by_status = {}
+
+    def record(self, status: int, size: int):
+        self.requests += 1
+        self.bytes += size
+        self.by_status[status] = self.by_status.get(status, 0) + 1
+
+
+def mock_transport(fixture, latency: float = 0.0, stats: Stats = None) -> httpx.MockTransport:
+    """httpx transport serving ``fixture`` with ``latency`` seconds injected per call."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        query = dict(parse_qsl(request.url.query.decode()))
+        status, headers, body = fixture.handle(request.method, request.url.path, query, request.content)
+        if stats is not None:
+            stats.record(status, len(body))
+        return httpx.Response(status, headers={"Content-Type": "application/json", **headers}, content=body)
+
+    return httpx.MockTransport(handler)
+
+
+def recording_transport(out: dict) -> httpx.AsyncBaseTransport:
+    """Real network transport that stores every response into ``out`` for later replay."""
+    real = httpx.AsyncHTTPTransport()
+
+    class _Recorder(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            resp = await real.handle_async_request(request)
+            body = await resp.aread()
+            query = dict(parse_qsl(request.url.query.decode()))
+            headers = {k: v for k, v in resp.headers.items() if k.lower() in ("link", "content-type")}
+            out[request_key(request.method, request.url.path, query, request.content)] = {
+                "status": resp.status_code, "headers": headers, "body": body.decode("utf-8", "replace"),
+            }
+            return httpx.Response(resp.status_code, headers=resp.headers, content=body)
+
+        async def aclose(self):
+            await real.aclose()
+
+    return _Recorder()
+
+
+def asgi_app(fixture, latency: float = 0.0):
+    """Minimal ASGI app serving ``fixture`` over HTTP (for the end-to-end load test)."""
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        if latency:
+            await asyncio.sleep(latency)
+        query = dict(parse_qsl(scope.get("query_string", b"").decode()))
+        request_body = b""
+        while True:
+            message = await receive()
+            request_body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        status, headers, body = fixture.handle(scope["method"], scope["path"], query, request_body)
+        raw_headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        raw_headers += [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Serve a synthetic GitHub API locally.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9100)
+    ap.add_argument("--repos", type=int, default=10, help="repos per user")
+    ap.add_argument("--commits", type=int, default=1000, help="commits per user")
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = ap.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(asgi_app(MultiUserGitHub(args.repos, args.commits), args.latency),
+                host=args.host, port=args.port, lifespan="off", log_level="warning")
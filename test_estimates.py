@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Test script for the statistics-API hour estimates (apply_stats_estimates)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "api"))
+
+from config import STATS_HOURS_PER_COMMIT
+from services.tracker import apply_stats_estimates, estimate_week_hours
+
+STATS = {"weekly": [4, 0, 10], "commits": 14, "active_hours": 6.0,
+         "hours_dist": {"night": 0, "morning": 7, "daytime": 7, "evening": 0}}
+
+
+def stats_repo() -> dict:
+    return {"name": "big", "hours": 0.0, "stats": dict(STATS)}
+
+
+def expected(ratio: float, valid_share: float) -> float:
+    return sum(estimate_week_hours(c * valid_share, ratio / valid_share, STATS["active_hours"])
+               for c in STATS["weekly"])
+
+
+print("=" * 60)
+print("  CodeStats Estimate — Test Suite")
+print("=" * 60)
+
+# 1. Calibrated on the exactly scanned repos
+exact = {"name": "small", "commits": 20, "valid_commits": 16, "hours": 8.0}
+big = stats_repo()
+apply_stats_estimates([exact, big])
+assert "stats" not in big and big["hours_dist"] == STATS["hours_dist"]
+assert abs(big["hours"] - expected(8.0 / 20, 16 / 20)) < 1e-9
+print(f"  ✅ calibrated        {big['hours']:.2f} hrs")
+
+# 2. Exact repos hold only merge / bot commits — no valid commit to calibrate on
+merges_only = {"name": "merges", "commits": 12, "valid_commits": 0, "hours": 0.0}
+big = stats_repo()
+apply_stats_estimates([merges_only, big])
+assert abs(big["hours"] - expected(STATS_HOURS_PER_COMMIT, 1.0)) < 1e-9
+print(f"  ✅ merges-only       {big['hours']:.2f} hrs (fallback)")
+
+# 3. No exact repo at all; failed repos (exceptions) are skipped
+big = stats_repo()
+apply_stats_estimates([RuntimeError("scan failed"), big])
+assert abs(big["hours"] - expected(STATS_HOURS_PER_COMMIT, 1.0)) < 1e-9
+print(f"  ✅ stats-only        {big['hours']:.2f} hrs (fallback)")
+
+print()
+print("=" * 60)
+print("  All tests passed!")
+print("=" * 60)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Test script for manifest parsing and framework detection (services/manifests.py)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "api"))
+
+from config import (BUILD_FW, CARGO_FW, COMPOSER_FW, GEMFILE_FW, GO_MOD_FW, PACKAGE_JSON_FW,
+                    PUBSPEC_FW, REQUIREMENTS_FW)
+from services.manifests import compile_fw_maps
+
+FW_MAPS = {
+    "package_json": PACKAGE_JSON_FW, "requirements": REQUIREMENTS_FW, "composer": COMPOSER_FW,
+    "go_mod": GO_MOD_FW, "build": BUILD_FW, "cargo": CARGO_FW, "pubspec": PUBSPEC_FW,
+    "gemfile": GEMFILE_FW,
+}
+
+CASES = [
+    ("build.gradle", "plugins {\n    id 'com.android.application'\n}\n", {"Android SDK"}),
+    ("build.gradle", 'plugins { id("org.springframework.boot") version "3.2.0" }\n', {"Spring Boot"}),
+    # legacy Groovy / Kotlin DSL plugin application
+    ("build.gradle", "apply plugin: 'com.android.application'\n"
+                     "dependencies { implementation 'org.springframework.boot:spring-boot-starter' }\n",
+     {"Android SDK", "Spring Boot"}),
+    ("build.gradle", 'apply(plugin = "com.android.library")\n', {"Android SDK"}),
+    ("build.gradle", "// apply nothing here\n", set()),
+]
+
+matcher = compile_fw_maps(FW_MAPS)
+
+print("=" * 60)
+print("  CodeStats Manifest Detection — Test Suite")
+print("=" * 60)
+
+for name, content, expected in CASES:
+    found = matcher.detect(name, content)
+    assert found == expected, f"{name}: expected {expected}, got {found}\n{content}"
+    first = content.strip().splitlines()[0] if content.strip() else ""
+    print(f"  ✅ {name:<14} {first[:40]:<40} -> {sorted(found)}")
+
+print()
+print("=" * 60)
+print(f"  All tests passed! {len(CASES)} manifests checked.")
+print("=" * 60)
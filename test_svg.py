@@ -2,6 +2,7 @@
 """Test script for SVG generator — generates all layouts, themes, and responsive HTML."""
 import os
 import sys
+import time
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "api"))
 
@@ -112,6 +113,30 @@ with open(html_path, "w") as f:
     f.write(html)
 print(f"\n  ✅ responsive_test.html  ({len(html)} bytes)")
 print(f"\n  🌐 Open: file://{html_path}")
+
+# 4. Render benchmark — renders/sec per theme × layout (tracks rendering cost)
+BENCH_SECONDS = float(os.getenv("BENCH_SECONDS", "0.25"))
+print()
+print("─" * 60)
+print("  Render Benchmark (renders/sec):")
+print("─" * 60)
+total_renders, total_time = 0, 0.0
+for theme in THEMES:
+    row = []
+    for layout in ["landscape", "portrait"]:
+        n, start = 0, time.perf_counter()
+        while True:
+            generate_svg(DATA, theme, 8, True, layout)
+            n += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= BENCH_SECONDS:
+                break
+        total_renders += n
+        total_time += elapsed
+        row.append(f"{layout}: {n / elapsed:8.0f}")
+    print(f"  {theme.ljust(11)} {'   '.join(row)}")
+print(f"  {'overall'.ljust(11)} {total_renders / total_time:.0f} renders/sec")
+
 print()
 print("=" * 60)
 print(f"  All tests passed! {len(cards)} SVG cards generated.")